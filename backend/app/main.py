@@ -5,6 +5,8 @@ import logging
 import os
 from .routers import auth, resume, template, ai, share
 from .database import engine, Base
+from .utils.upload import UploadSizeLimitMiddleware, MAX_PDF_UPLOAD_SIZE, MAX_BULK_UPLOAD_SIZE
+from .utils import ai_http, ai_provider
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -24,6 +26,16 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Enforce upload size limits while request bodies are still streaming in
+# (added before CORS so rejections still carry CORS headers)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={
+        "/resume/upload-pdf": MAX_PDF_UPLOAD_SIZE,
+        "/resume/bulk-upload": MAX_BULK_UPLOAD_SIZE,
+    },
+)
+
 # Configure CORS
 # Read allowed origins from environment variable, fallback to default list
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:8000")
@@ -47,6 +59,12 @@ app.include_router(ai.router)
 app.include_router(share.router)
 
 
+@app.on_event("shutdown")
+async def close_ai_client():
+    """Close pooled connections to the AI provider."""
+    await ai_http.close_client()
+
+
 @app.get("/")
 def read_root():
     """Root endpoint with API information."""
@@ -68,7 +86,8 @@ def health_check():
         "status": "healthy",
         "environment": {
             "OPENAI_API_KEY": openai_key,
-            "AI_MODEL": os.getenv("AI_MODEL", "default:gpt-3.5-turbo"),
+            "AI_PROVIDER": ai_provider.provider.name,
+            "AI_MODEL": ai_provider.provider.model,
             "PDF_ENGINE": os.getenv("PDF_ENGINE", "default:pyppeteer")
         }
     }
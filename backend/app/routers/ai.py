@@ -1,11 +1,16 @@
-from typing import Dict, Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Body, BackgroundTasks
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Body, BackgroundTasks, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
+import json
 import logging
+import time
 
 from .. import schemas
-from ..utils import ai_generator
+from ..utils import ai_generator, ai_provider
+from ..utils.ai_cache import ai_cache
+from ..utils.ai_singleflight import single_flight
 from ..services import auth
 from ..models import User
 from app.database import get_db
@@ -13,7 +18,10 @@ from app.utils.ai_service import (
     generate_resume_summary, 
     improve_job_descriptions, 
     get_relevant_skills,
-    analyze_keywords_from_job
+    analyze_keywords_from_job,
+    stream_resume_summary,
+    stream_job_descriptions,
+    parse_job_descriptions
 )
 
 # Configure logging
@@ -82,15 +90,65 @@ class SkillsResponse(BaseModel):
     skills: List[str]
 
 
+class ImproveResumeRequest(BaseModel):
+    resume_content: Dict[str, Any]
+    job_title: Optional[str] = None
+    sections: List[str] = ["work_experience"]  # summary, work_experience, projects
+    mode: str = "auto"  # auto, packed or parallel
+
+
+class ImproveResumeResponse(BaseModel):
+    improved: Dict[str, str]
+    resume_content: Dict[str, Any]
+    mode: str
+    elapsed_ms: float
+
+
 class JobDescriptionAnalysisRequest(BaseModel):
     job_description: str
     resume_content: Dict[str, Any] = None
+    enrich: Optional[bool] = None  # Add AI extraction and tips; defaults to AI_KEYWORD_ENRICHMENT
 
 
 class JobDescriptionAnalysisResponse(BaseModel):
     keywords: List[str]
     missing_skills: List[str]
     suggestions: Dict[str, Any]
+    timings: Optional[Dict[str, float]] = None
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _sse_response(deltas: AsyncIterator[str], finish: Optional[Callable[[str], Dict[str, Any]]] = None) -> StreamingResponse:
+    """
+    Relay generated text to the client as server-sent events.
+    
+    Each piece of text is sent as a `delta` event with `{"text": ...}`. The
+    stream ends with a `done` event carrying the assembled result (by default
+    `{"content": ...}`), or an `error` event if generation fails part-way.
+    """
+    async def events():
+        parts = []
+        try:
+            async for delta in deltas:
+                parts.append(delta)
+                yield _sse_event("delta", {"text": delta})
+        except Exception as e:
+            logger.error(f"Error streaming AI response: {str(e)}")
+            yield _sse_event("error", {"detail": "Generation failed. Please try again later."})
+            return
+        text = "".join(parts).strip()
+        yield _sse_event("done", finish(text) if finish else {"content": text})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Disable proxy buffering (nginx) so events reach the client immediately
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.post("/generate-summary", response_model=SummaryResponse)
@@ -102,7 +160,7 @@ async def create_resume_summary(
     Generate a professional summary for a resume based on job title and skills.
     """
     try:
-        summary = generate_resume_summary(
+        summary = await generate_resume_summary(
             job_title=request.job_title,
             experience_years=request.experience_years,
             skills=request.skills
@@ -116,6 +174,23 @@ async def create_resume_summary(
         )
 
 
+@router.post("/generate-summary/stream")
+async def stream_summary(
+    request: SummaryRequest,
+    current_user: User = Depends(auth.get_current_active_user),
+):
+    """
+    Stream a professional summary as server-sent events while it is generated.
+    
+    Same input as /generate-summary; the final `done` event carries `{"content": ...}`.
+    """
+    return _sse_response(stream_resume_summary(
+        job_title=request.job_title,
+        experience_years=request.experience_years,
+        skills=request.skills
+    ))
+
+
 @router.post("/improve-content", response_model=schemas.GeneratedContent)
 async def improve_content(
     request: ImproveContentRequest,
@@ -123,7 +198,7 @@ async def improve_content(
 ):
     """Improve existing content to make it more professional and impactful."""
     try:
-        improved_content = ai_generator.improve_content(
+        improved_content = await ai_generator.improve_content(
             content=request.content,
             content_type=request.content_type,
             job_title=request.job_title
@@ -136,6 +211,23 @@ async def improve_content(
         )
 
 
+@router.post("/improve-content/stream")
+async def stream_improved_content(
+    request: ImproveContentRequest,
+    current_user: User = Depends(auth.get_current_active_user)
+):
+    """
+    Stream improved content as server-sent events while it is generated.
+    
+    Same input as /improve-content; the final `done` event carries `{"content": ...}`.
+    """
+    return _sse_response(ai_generator.stream_improved_content(
+        content=request.content,
+        content_type=request.content_type,
+        job_title=request.job_title
+    ))
+
+
 @router.post("/generate-job-descriptions", response_model=JobDescriptionResponse)
 async def optimize_job_descriptions(
     request: JobDescriptionRequest,
@@ -145,7 +237,7 @@ async def optimize_job_descriptions(
     Optimize and improve job descriptions for better impact and ATS compatibility.
     """
     try:
-        improved_descriptions = improve_job_descriptions(
+        improved_descriptions = await improve_job_descriptions(
             job_title=request.job_title,
             company_name=request.company_name,
             responsibilities=request.responsibilities,
@@ -160,6 +252,88 @@ async def optimize_job_descriptions(
         )
 
 
+@router.post("/generate-job-descriptions/stream")
+async def stream_optimized_job_descriptions(
+    request: JobDescriptionRequest,
+    current_user: User = Depends(auth.get_current_active_user),
+):
+    """
+    Stream improved job descriptions as server-sent events while they are generated.
+    
+    Same input as /generate-job-descriptions; the final `done` event carries
+    the parsed `{"descriptions": [...]}`.
+    """
+    return _sse_response(
+        stream_job_descriptions(
+            job_title=request.job_title,
+            company_name=request.company_name,
+            responsibilities=request.responsibilities,
+            years_experience=request.years_experience
+        ),
+        finish=lambda text: {"descriptions": parse_job_descriptions(text, request.responsibilities)}
+    )
+
+
+@router.post("/improve-resume", response_model=ImproveResumeResponse)
+async def improve_resume(
+    request: ImproveResumeRequest,
+    current_user: User = Depends(auth.get_current_active_user)
+):
+    """
+    Improve every bullet of a resume (or of the selected sections) in one batch.
+    
+    Items are identified by their path in the resume, e.g.
+    "work_experience.0.responsibilities.2". The response maps each id to its
+    improved text and also returns the resume with the improvements applied.
+    """
+    unknown = [section for section in request.sections if section not in ai_generator.BATCH_SECTIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown sections: {', '.join(unknown)}. Available sections: {', '.join(ai_generator.BATCH_SECTIONS)}"
+        )
+    if request.mode not in ai_generator.BATCH_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown mode '{request.mode}'. Available modes: {', '.join(ai_generator.BATCH_MODES)}"
+        )
+    
+    try:
+        items = ai_generator.collect_resume_items(request.resume_content, request.sections)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid resume content: {str(e)}")
+    if len(items) > ai_generator.AI_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many items to improve at once ({len(items)}); the limit is {ai_generator.AI_BATCH_MAX_ITEMS}."
+        )
+    
+    # Default the job context to the most recent job title
+    job_title = request.job_title
+    if not job_title:
+        job_title = next((
+            job["title"] for job in request.resume_content.get("work_experience") or []
+            if isinstance(job, dict) and isinstance(job.get("title"), str) and job["title"]
+        ), None)
+    
+    start = time.perf_counter()
+    try:
+        improved, mode = await ai_generator.improve_resume_items(items, job_title=job_title, mode=request.mode)
+    except Exception as e:
+        logger.error(f"Error improving resume: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to improve resume. Please try again later."
+        )
+    
+    return {
+        "improved": improved,
+        "resume_content": ai_generator.apply_resume_items(request.resume_content, improved),
+        "mode": mode,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+
+
 @router.post("/get-relevant-skills", response_model=SkillsResponse)
 async def suggest_relevant_skills(
     request: SkillsRequest,
@@ -169,7 +343,7 @@ async def suggest_relevant_skills(
     Suggest relevant skills for a specific job title and experience level.
     """
     try:
-        skills = get_relevant_skills(
+        skills = await get_relevant_skills(
             job_title=request.job_title,
             experience_level=request.experience_level
         )
@@ -186,16 +360,26 @@ async def suggest_relevant_skills(
 async def analyze_job_description(
     request: JobDescriptionAnalysisRequest,
     background_tasks: BackgroundTasks,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(auth.get_current_active_user),
 ):
     """
     Analyze a job description to extract keywords and provide suggestions.
+    
+    Keywords and skills are extracted locally, so this works without an AI
+    provider; set `enrich` (or AI_KEYWORD_ENRICHMENT) to add the AI
+    extraction and AI-written tips. Per-stage timings are returned in
+    `timings` and in the `Server-Timing` header.
     """
     try:
-        results = analyze_keywords_from_job(
+        results = await analyze_keywords_from_job(
             job_description=request.job_description,
-            resume_content=request.resume_content
+            resume_content=request.resume_content,
+            enrich=request.enrich,
+        )
+        response.headers["Server-Timing"] = ", ".join(
+            f"{stage};dur={ms:.1f}" for stage, ms in results.get("timings", {}).items()
         )
         
         # Store the analysis results if needed
@@ -211,6 +395,32 @@ async def analyze_job_description(
         )
 
 
+@router.get("/cache-stats", response_model=Dict[str, Any])
+async def get_cache_stats(
+    current_user: User = Depends(auth.get_current_active_user)
+):
+    """
+    Get AI response cache hit/miss counters per endpoint and request
+    coalescing counters.
+    
+    Counters are kept per worker process.
+    """
+    return {**ai_cache.stats(), "single_flight": single_flight.stats()}
+
+
+@router.get("/provider-stats", response_model=Dict[str, Any])
+async def get_provider_stats(
+    current_user: User = Depends(auth.get_current_active_user)
+):
+    """
+    Get AI provider availability and circuit state, with upstream request
+    counts, errors, token usage and latency histograms per endpoint.
+    
+    Counters are kept per worker process.
+    """
+    return ai_provider.stats()
+
+
 @router.post("/suggest-improvements", response_model=Dict[str, Any])
 async def suggest_improvements(
     resume_content: Dict[str, Any] = Body(...),
@@ -218,7 +428,7 @@ async def suggest_improvements(
 ):
     """Analyze a resume and suggest improvements for various sections."""
     try:
-        suggestions = ai_generator.suggest_resume_improvements(resume_content)
+        suggestions = await ai_generator.suggest_resume_improvements(resume_content)
         return suggestions
     except Exception as e:
         raise HTTPException(
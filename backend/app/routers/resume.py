@@ -1,12 +1,20 @@
+import asyncio
+import io
 import json
+import time
+import zipfile
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Response
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
 from ..database import get_db
 from ..services import auth, resume
-from ..utils import pdf, pdf_parser
+from ..utils import pdf, pdf_parser, bulk_ingest, upload, parser_runtime, match_scorer
+from ..utils.parse_cache import parse_cache
+from ..utils.parse_profile import ParseProfile, stage_histograms
+from ..utils.parse_sandbox import ParseLimitExceeded, limit_stats
+from ..utils.nlp_models import model_registry
 import logging
 
 logger = logging.getLogger(__name__)
@@ -210,6 +218,50 @@ def read_version(
     return db_version
 
 
+@router.post("/version/{version_id}/match-score", response_model=schemas.MatchScoreResponse)
+def score_version_match(
+    version_id: int,
+    request: schemas.MatchScoreRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user),
+):
+    """
+    Score how well a resume version matches a job description.
+    
+    The score is computed locally, without an AI call: the cosine similarity
+    of TF-IDF term and skill vectors for the whole resume and for each
+    section, with the terms that contribute most to the match and the
+    posting's most important terms missing from the resume. The scoring
+    time is returned in the `Server-Timing` header.
+    """
+    db_version = resume.get_resume_version(db, version_id=version_id)
+    if db_version is None:
+        raise HTTPException(status_code=404, detail="Resume version not found")
+    
+    # Check if the resume belongs to the user
+    db_resume = resume.get_resume(db, resume_id=db_version.resume_id, user_id=current_user.id)
+    if db_resume is None:
+        raise HTTPException(status_code=403, detail="Not authorized to access this resume version")
+    
+    if not request.job_description.strip():
+        raise HTTPException(status_code=400, detail="Job description is empty")
+    
+    content = db_version.content
+    if isinstance(content, str):
+        try:
+            content = json.loads(content)
+        except json.JSONDecodeError:
+            content = None
+    if not isinstance(content, dict):
+        raise HTTPException(status_code=422, detail="Resume version content is not valid resume data")
+    
+    start = time.perf_counter()
+    result = match_scorer.score_match(content, request.job_description)
+    response.headers["Server-Timing"] = f"match;dur={(time.perf_counter() - start) * 1000:.1f}"
+    return result
+
+
 @router.get("/versions/{resume_id}", response_model=List[schemas.ResumeVersionBase])
 def read_versions(
     resume_id: int,
@@ -289,12 +341,20 @@ def download_resume(
 
 @router.post("/upload-pdf", response_model=schemas.PDFExtractResponse)
 async def upload_pdf(
+    response: Response,
     file: UploadFile = File(...),
+    no_cache: bool = False,
+    debug: bool = False,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
 ):
     """
     Upload and parse a PDF resume to extract structured data.
+    
+    Pass `no_cache=true` to force a fresh parse instead of reusing a cached
+    result for an identical file. Per-stage timings are always returned in
+    the `Server-Timing` header; pass `debug=true` to also include them, with
+    page, character, line and entity counts, in the response body.
     """
     # Validate file type
     if file.content_type != "application/pdf":
@@ -303,28 +363,105 @@ async def upload_pdf(
             detail="Invalid file format. Please upload a PDF file."
         )
     
-    # Read file content
-    file_content = await file.read()
-    
-    # Check file size (limit to 5MB)
-    if len(file_content) > 5 * 1024 * 1024:  # 5MB in bytes
-        raise HTTPException(
-            status_code=400,
-            detail="File size too large. Maximum allowed size is 5MB."
+    # Read file content in chunks, enforcing the 5MB limit and PDF signature
+    # before anything is parsed
+    try:
+        file_content = await upload.read_upload(
+            file,
+            max_size=upload.MAX_PDF_UPLOAD_SIZE,
+            signature_check=upload.has_pdf_signature
         )
+    except upload.UploadRejected as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     try:
         # Import the PDF parser here to avoid circular imports
         from app.utils.pdf_parser import parse_pdf
         
-        # Parse the PDF file
-        parsed_data = parse_pdf(file_content)
+        # Parse the PDF file in a worker thread; the sandboxed parse blocks
+        # for up to PARSE_TIMEOUT_SECONDS and must not stall the event loop
+        profile = ParseProfile()
+        parsed_data = await asyncio.to_thread(parse_pdf, file_content, use_cache=not no_cache, profile=profile)
+        
+        response.headers["Server-Timing"] = profile.server_timing()
+        if debug:
+            parsed_data["debug"] = profile.to_dict()
         
         return parsed_data
     
+    except ParseLimitExceeded as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         logger.error(f"Error parsing PDF: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to parse PDF: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+
+@router.get("/parse-stats")
+def get_parse_stats(
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """
+    Get per-stage parse latency histograms, parse cache statistics and the
+    memory of the serving worker split into shared and private bytes.
+    
+    Statistics are kept per worker process, so with several workers each
+    request reports the counters of whichever worker served it.
+    """
+    return {
+        "stages": stage_histograms.snapshot(),
+        "cache": parse_cache.stats(),
+        "limits": limit_stats.snapshot(),
+        "nlp_models": model_registry.stats(),
+        "memory": parser_runtime.memory_usage(),
+    }
+
+
+@router.post("/bulk-upload")
+async def bulk_upload_pdfs(
+    file: UploadFile = File(...),
+    no_cache: bool = False,
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """
+    Upload a ZIP archive of PDF resumes and stream parsed results.
+    
+    The response is JSON Lines (one object per resume), emitted as each
+    document finishes so clients can show progress on large batches.
+    """
+    from fastapi.responses import StreamingResponse
+    
+    # Validate file type
+    if not (file.filename or "").lower().endswith(".zip"):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid file format. Please upload a ZIP archive of PDF files."
+        )
+    
+    # Read file content in chunks, enforcing the 200MB limit and ZIP signature
+    try:
+        file_content = await upload.read_upload(
+            file,
+            max_size=upload.MAX_BULK_UPLOAD_SIZE,
+            signature_check=upload.has_zip_signature
+        )
+    except upload.UploadRejected as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    file_content = bytes(file_content)
+    if not zipfile.is_zipfile(io.BytesIO(file_content)):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid ZIP archive."
+        )
+    
+    records = bulk_ingest.ingest_documents(
+        bulk_ingest.iter_pdfs_from_zip(file_content),
+        use_cache=not no_cache
+    )
+    return StreamingResponse(
+        bulk_ingest.to_json_lines(records),
+        media_type="application/x-ndjson"
+    )
@@ -202,6 +202,19 @@ class PDFExtractResponse(BaseModel):
     work_experience: List[Dict[str, Any]]
     education: List[Dict[str, Any]]
     projects: List[Dict[str, Any]]
+    debug: Optional[Dict[str, Any]] = None
+
+
+# Match score schemas
+class MatchScoreRequest(BaseModel):
+    job_description: str
+
+
+class MatchScoreResponse(BaseModel):
+    score: float  # Cosine similarity of the whole resume and the posting, as a percentage
+    sections: Dict[str, float]
+    top_terms: List[str]
+    missing_terms: List[str]
 
 
 # Update ResumeDetail to reference ResumeVersion
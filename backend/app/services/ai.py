@@ -1,12 +1,7 @@
-import os
 import json
 from typing import List, Dict, Any, Optional
-import openai
-from openai import OpenAI
 
-# Initialize OpenAI client with API key
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-client = OpenAI(api_key=OPENAI_API_KEY)
+from ..utils import ai_provider
 
 # Define section types for suggestions
 SECTION_TYPES = {
@@ -19,7 +14,7 @@ SECTION_TYPES = {
 }
 
 
-def generate_suggestions(
+async def generate_suggestions(
     resume_section: str, 
     context: Dict[str, Any], 
     max_suggestions: int = 3
@@ -35,8 +30,8 @@ def generate_suggestions(
     Returns:
         A list of suggestion strings
     """
-    if not OPENAI_API_KEY:
-        # Return default suggestions if no API key is set
+    if not ai_provider.is_available():
+        # Return default suggestions if no AI provider is configured
         return [f"Sample {SECTION_TYPES.get(resume_section, 'content')} (API key not set)"]
     
     try:
@@ -62,20 +57,15 @@ def generate_suggestions(
         Format each suggestion as a separate item in a numbered list.
         """
         
-        # Call OpenAI API
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a professional resume writing assistant."},
-                {"role": "user", "content": prompt}
-            ],
+        # Call the AI provider
+        content = await ai_provider.complete(
+            prompt,
+            system_prompt="You are a professional resume writing assistant.",
             max_tokens=500,
             temperature=0.7,
+            endpoint="section_suggestions",
         )
         
-        # Extract and process the response
-        content = response.choices[0].message.content.strip()
-        
         # Parse numbered list from content
         suggestions = []
         current_item = ""
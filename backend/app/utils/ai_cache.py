@@ -0,0 +1,195 @@
+"""
+Cache for AI completions, keyed by model, prompt, temperature and max_tokens.
+
+Completions are kept in an in-memory LRU tier with a TTL and, when
+AI_CACHE_DB is set, in a SQLite file shared by all workers on the host.
+Caching is opt-in per endpoint: callers pass an endpoint name and only the
+names listed in AI_CACHE_ENDPOINTS are cached.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Cache configuration from environment variables
+AI_CACHE_SIZE = int(os.getenv("AI_CACHE_SIZE", "1024"))
+AI_CACHE_TTL = float(os.getenv("AI_CACHE_TTL", str(24 * 60 * 60)))
+AI_CACHE_DB = os.getenv("AI_CACHE_DB", "")  # Empty disables the SQLite tier
+AI_CACHE_ENDPOINTS = {
+    name.strip()
+    for name in os.getenv("AI_CACHE_ENDPOINTS", "resume_summary,relevant_skills,keyword_analysis").split(",")
+    if name.strip()
+}
+
+# Expired rows are purged from SQLite once every this many writes
+PURGE_INTERVAL = 100
+
+
+def make_key(model: str, prompt: str, temperature: float, max_tokens: int) -> str:
+    """
+    Build the cache key for a completion request.
+
+    Args:
+        model: Model name
+        prompt: Full prompt text, including any system message
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens in the response
+
+    Returns:
+        Hex digest identifying the request
+    """
+    payload = json.dumps([model, prompt, float(temperature), int(max_tokens)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AICache:
+    """
+    Two-tier TTL cache of AI completions: an in-memory LRU per worker and
+    an optional SQLite file shared across workers.
+    """
+
+    def __init__(
+        self,
+        max_size: int = AI_CACHE_SIZE,
+        ttl: float = AI_CACHE_TTL,
+        db_path: str = AI_CACHE_DB,
+        endpoints=AI_CACHE_ENDPOINTS,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.db_path = db_path or None
+        self.endpoints = set(endpoints)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+        if self.db_path:
+            try:
+                with self._connect() as conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS ai_cache "
+                        "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Could not open AI cache database {self.db_path}: {str(e)}")
+                self.db_path = None
+
+    def enabled_for(self, endpoint: Optional[str]) -> bool:
+        """Check whether caching is enabled for an endpoint."""
+        return bool(endpoint) and endpoint in self.endpoints and self.max_size > 0
+
+    async def get(self, endpoint: str, key: str) -> Optional[str]:
+        """
+        Look up a completion, checking memory first and then SQLite.
+
+        Returns:
+            The cached completion, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._record(endpoint, "memory_hits")
+                    return entry[1]
+                del self._entries[key]
+
+        entry = await asyncio.to_thread(self._read_from_db, key, now) if self.db_path else None
+        with self._lock:
+            if entry is None:
+                self._record(endpoint, "misses")
+                return None
+            self._record(endpoint, "db_hits")
+            self._store(key, entry)
+        return entry[1]
+
+    async def set(self, endpoint: str, key: str, value: str) -> None:
+        """Store a completion in memory and, if configured, in SQLite."""
+        entry = (time.time() + self.ttl, value)
+        with self._lock:
+            self._store(key, entry)
+        if self.db_path:
+            await asyncio.to_thread(self._write_to_db, key, entry)
+
+    def after_fork(self) -> None:
+        """Give a freshly forked child its own lock and zeroed counters."""
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters per endpoint and the current memory tier size."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "persistent": self.db_path is not None,
+                "endpoints": sorted(self.endpoints),
+                "counters": {endpoint: dict(counts) for endpoint, counts in self._stats.items()},
+            }
+
+    def _record(self, endpoint: str, counter: str) -> None:
+        # Caller must hold the lock
+        counts = self._stats.setdefault(endpoint, {"memory_hits": 0, "db_hits": 0, "misses": 0})
+        counts[counter] += 1
+
+    def _store(self, key: str, entry: Tuple[float, str]) -> None:
+        # Caller must hold the lock
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection, committing and closing it afterwards."""
+        conn = sqlite3.connect(self.db_path, timeout=1.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _read_from_db(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT expires_at, value FROM ai_cache WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"AI cache read failed: {str(e)}")
+            return None
+        return (row[0], row[1]) if row else None
+
+    def _write_to_db(self, key: str, entry: Tuple[float, str]) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO ai_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, entry[1], entry[0]),
+                )
+                self._writes += 1
+                if self._writes % PURGE_INTERVAL == 0:
+                    conn.execute("DELETE FROM ai_cache WHERE expires_at <= ?", (time.time(),))
+        except sqlite3.Error as e:
+            logger.warning(f"AI cache write failed: {str(e)}")
+
+
+# Shared cache instance for AI completions
+ai_cache = AICache()
+
+# Locks and counters are per process
+os.register_at_fork(after_in_child=ai_cache.after_fork)
@@ -1,20 +1,38 @@
-import os
+import asyncio
+import copy
 import json
-import openai
-from typing import Dict, Any, List, Optional
+import logging
+import math
+import os
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+
+from . import ai_provider
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# System prompt shared by the content-writing functions
+RESUME_WRITER_PROMPT = "You are an expert resume writer who specializes in creating professional, ATS-friendly resume content."
 
-# Get OpenAI API key from environment variable
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# Whole-resume improvement: concurrent upstream calls per batch and items per batch
+AI_BATCH_CONCURRENCY = int(os.getenv("AI_BATCH_CONCURRENCY", "8"))
+AI_BATCH_MAX_ITEMS = int(os.getenv("AI_BATCH_MAX_ITEMS", "100"))
 
-# Set up the OpenAI client
-if OPENAI_API_KEY:
-    openai_client = openai.OpenAI(api_key=OPENAI_API_KEY)
-else:
-    openai_client = None
-    print("WARNING: OpenAI API key not found. AI features will be disabled.")
+# Items per packed request: enough to save round trips, few enough that the
+# response (generated token by token) stays short
+PACK_MIN_ITEMS = 4
+PACK_MAX_ITEMS = 15
 
+# Response token budget per packed item, plus JSON overhead
+PACK_TOKENS_PER_ITEM = 90
+PACK_TOKENS_OVERHEAD = 60
 
-def generate_summary(job_title: str, experience_years: int, skills: List[str]) -> str:
+# Resume sections that can be improved in a batch
+BATCH_SECTIONS = ("summary", "work_experience", "projects")
+BATCH_MODES = ("auto", "packed", "parallel")
+
+
+async def generate_summary(job_title: str, experience_years: int, skills: List[str]) -> str:
     """
     Generate a professional summary for a resume based on job title,
     years of experience, and skills.
@@ -27,7 +45,7 @@ def generate_summary(job_title: str, experience_years: int, skills: List[str]) -
     Returns:
         Generated professional summary
     """
-    if not openai_client:
+    if not ai_provider.is_available():
         return "AI summary generation is currently unavailable. Please provide your own summary."
     
     try:
@@ -42,17 +60,13 @@ def generate_summary(job_title: str, experience_years: int, skills: List[str]) -
         Focus on achievements and impact rather than just responsibilities.
         """
         
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert resume writer who specializes in creating professional, ATS-friendly resume content."},
-                {"role": "user", "content": prompt}
-            ],
+        summary = await ai_provider.complete(
+            prompt,
+            system_prompt=RESUME_WRITER_PROMPT,
             max_tokens=250,
-            temperature=0.7
+            temperature=0.7,
+            endpoint="generated_summary",
         )
-        
-        summary = response.choices[0].message.content.strip()
         return summary
     
     except Exception as e:
@@ -60,7 +74,24 @@ def generate_summary(job_title: str, experience_years: int, skills: List[str]) -
         return "An error occurred while generating the summary. Please provide your own summary."
 
 
-def improve_content(content: str, content_type: str, job_title: Optional[str] = None) -> str:
+def _improve_content_prompt(content: str, content_type: str, job_title: Optional[str] = None) -> str:
+    """Build the prompt for improve_content."""
+    job_context = f"for a {job_title} position" if job_title else ""
+    
+    # Different prompts based on content type
+    if content_type == "summary":
+        instruction = f"Rewrite the following professional summary {job_context} to be more impactful, concise, and ATS-friendly. Focus on value and achievements."
+    elif content_type == "job_description":
+        instruction = f"Rewrite the following job responsibility {job_context} to be more impactful, using strong action verbs and quantifying achievements where possible. Make it ATS-friendly."
+    elif content_type == "skill":
+        instruction = f"Rewrite the following skill description {job_context} to be more specific, professional, and ATS-friendly."
+    else:
+        instruction = f"Rewrite the following content {job_context} to be more professional, impactful, and ATS-friendly."
+    
+    return f"{instruction}\n\nOriginal: {content}\n\nImproved:"
+
+
+async def improve_content(content: str, content_type: str, job_title: Optional[str] = None) -> str:
     """
     Improve existing content by making it more professional, impactful, and ATS-friendly.
     
@@ -72,35 +103,17 @@ def improve_content(content: str, content_type: str, job_title: Optional[str] =
     Returns:
         Improved content
     """
-    if not openai_client:
-        return content  # Return original content if OpenAI is not available
+    if not ai_provider.is_available():
+        return content  # Return original content if no AI provider is configured
     
     try:
-        job_context = f"for a {job_title} position" if job_title else ""
-        
-        # Different prompts based on content type
-        if content_type == "summary":
-            instruction = f"Rewrite the following professional summary {job_context} to be more impactful, concise, and ATS-friendly. Focus on value and achievements."
-        elif content_type == "job_description":
-            instruction = f"Rewrite the following job responsibility {job_context} to be more impactful, using strong action verbs and quantifying achievements where possible. Make it ATS-friendly."
-        elif content_type == "skill":
-            instruction = f"Rewrite the following skill description {job_context} to be more specific, professional, and ATS-friendly."
-        else:
-            instruction = f"Rewrite the following content {job_context} to be more professional, impactful, and ATS-friendly."
-        
-        prompt = f"{instruction}\n\nOriginal: {content}\n\nImproved:"
-        
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert resume writer who specializes in creating professional, ATS-friendly resume content."},
-                {"role": "user", "content": prompt}
-            ],
+        improved_content = await ai_provider.complete(
+            _improve_content_prompt(content, content_type, job_title),
+            system_prompt=RESUME_WRITER_PROMPT,
             max_tokens=200,
-            temperature=0.7
+            temperature=0.7,
+            endpoint="improve_content",
         )
-        
-        improved_content = response.choices[0].message.content.strip()
         return improved_content
     
     except Exception as e:
@@ -108,7 +121,39 @@ def improve_content(content: str, content_type: str, job_title: Optional[str] =
         return content  # Return original content on error
 
 
-def generate_job_descriptions(job_title: str, company_name: str, 
+async def stream_improved_content(content: str, content_type: str, job_title: Optional[str] = None) -> AsyncIterator[str]:
+    """
+    Stream the result of improve_content as it is written.
+    
+    Yields the original content if no provider is configured or the request
+    fails before any text arrives.
+    
+    Raises:
+        ai_provider.LLMError: If the stream fails part-way through
+    """
+    if not ai_provider.is_available():
+        yield content
+        return
+    
+    started = False
+    try:
+        async for delta in ai_provider.stream(
+            _improve_content_prompt(content, content_type, job_title),
+            system_prompt=RESUME_WRITER_PROMPT,
+            max_tokens=200,
+            temperature=0.7,
+            endpoint="improve_content",
+        ):
+            started = True
+            yield delta
+    except Exception as e:
+        if started:
+            raise
+        logger.error(f"Error improving content: {str(e)}")
+        yield content
+
+
+async def generate_job_descriptions(job_title: str, company_name: str, 
                               responsibilities: List[str], 
                               years_experience: int) -> List[str]:
     """
@@ -123,8 +168,8 @@ def generate_job_descriptions(job_title: str, company_name: str,
     Returns:
         List of improved responsibility descriptions
     """
-    if not openai_client:
-        return responsibilities  # Return original content if OpenAI is not available
+    if not ai_provider.is_available():
+        return responsibilities  # Return original content if no AI provider is configured
     
     try:
         # Compile responsibilities into a string
@@ -142,18 +187,14 @@ def generate_job_descriptions(job_title: str, company_name: str,
         Each should start with a strong action verb. Make them specific and impactful.
         """
         
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert resume writer who specializes in creating professional, ATS-friendly resume content."},
-                {"role": "user", "content": prompt}
-            ],
+        improved_text = await ai_provider.complete(
+            prompt,
+            system_prompt=RESUME_WRITER_PROMPT,
             max_tokens=400,
-            temperature=0.7
+            temperature=0.7,
+            endpoint="job_descriptions",
         )
         
-        improved_text = response.choices[0].message.content.strip()
-        
         # Extract bullet points
         bullet_points = []
         for line in improved_text.split('\n'):
@@ -175,7 +216,7 @@ def generate_job_descriptions(job_title: str, company_name: str,
         return responsibilities  # Return original content on error
 
 
-def get_relevant_skills(job_title: str, industry: Optional[str] = None, 
+async def get_relevant_skills(job_title: str, industry: Optional[str] = None, 
                         experience_level: str = "mid-level") -> List[str]:
     """
     Generate a list of relevant skills for a specific job title.
@@ -188,8 +229,8 @@ def get_relevant_skills(job_title: str, industry: Optional[str] = None,
     Returns:
         List of relevant skills
     """
-    if not openai_client:
-        return []  # Return empty list if OpenAI is not available
+    if not ai_provider.is_available():
+        return []  # Return empty list if no AI provider is configured
     
     try:
         industry_context = f" in the {industry} industry" if industry else ""
@@ -201,18 +242,14 @@ def get_relevant_skills(job_title: str, industry: Optional[str] = None,
         Format each skill as a single word or short phrase.
         """
         
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert in job requirements and professional skills for various industries."},
-                {"role": "user", "content": prompt}
-            ],
+        skills_text = await ai_provider.complete(
+            prompt,
+            system_prompt="You are an expert in job requirements and professional skills for various industries.",
             max_tokens=300,
-            temperature=0.7
+            temperature=0.7,
+            endpoint="generated_skills",
         )
         
-        skills_text = response.choices[0].message.content.strip()
-        
         # Extract skills into a list
         skills = []
         for line in skills_text.split('\n'):
@@ -230,7 +267,7 @@ def get_relevant_skills(job_title: str, industry: Optional[str] = None,
         return []  # Return empty list on error
 
 
-def suggest_resume_improvements(resume_content: Dict[str, Any]) -> Dict[str, Any]:
+async def suggest_resume_improvements(resume_content: Dict[str, Any]) -> Dict[str, Any]:
     """
     Analyze a resume and suggest improvements for various sections.
     
@@ -240,7 +277,7 @@ def suggest_resume_improvements(resume_content: Dict[str, Any]) -> Dict[str, Any
     Returns:
         Dictionary with improvement suggestions
     """
-    if not openai_client:
+    if not ai_provider.is_available():
         return {"error": "AI suggestions are currently unavailable. Please try again later."}
     
     try:
@@ -273,18 +310,14 @@ def suggest_resume_improvements(resume_content: Dict[str, Any]) -> Dict[str, Any
         Be specific and practical in your suggestions, focusing on what would make this resume more competitive for a {job_title} position.
         """
         
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert resume writer who specializes in creating professional, ATS-friendly resumes."},
-                {"role": "user", "content": prompt}
-            ],
+        suggestions = await ai_provider.complete(
+            prompt,
+            system_prompt="You are an expert resume writer who specializes in creating professional, ATS-friendly resumes.",
             max_tokens=600,
-            temperature=0.7
+            temperature=0.7,
+            endpoint="resume_improvements",
         )
         
-        suggestions = response.choices[0].message.content.strip()
-        
         # Process suggestions into a structured format
         sections = ["Summary", "Work Experience", "Skills", "Education", "Overall"]
         structured_suggestions = {}
@@ -327,4 +360,189 @@ def suggest_resume_improvements(resume_content: Dict[str, Any]) -> Dict[str, Any
     
     except Exception as e:
         print(f"Error generating improvement suggestions: {str(e)}")
-        return {"error": f"An error occurred while generating suggestions: {str(e)}"} 
\ No newline at end of file
+        return {"error": f"An error occurred while generating suggestions: {str(e)}"} 
+
+
+def collect_resume_items(resume_content: Dict[str, Any], sections: List[str]) -> Dict[str, Tuple[str, str]]:
+    """
+    Collect the improvable text items of a resume.
+    
+    Args:
+        resume_content: The resume content as a dictionary
+        sections: Sections to include (see BATCH_SECTIONS)
+        
+    Returns:
+        Dictionary mapping item ids such as "work_experience.0.responsibilities.2"
+        to (text, content_type) pairs, skipping empty items
+        
+    Raises:
+        ValueError: If a selected section does not have the shape of schemas.ResumeContent
+    """
+    items = {}
+    if "summary" in sections:
+        summary = resume_content.get("summary")
+        if summary is not None and not isinstance(summary, str):
+            raise ValueError("'summary' must be a string")
+        if summary and summary.strip():
+            items["summary"] = (summary, "summary")
+    if "work_experience" in sections:
+        for i, job in enumerate(_section_entries(resume_content, "work_experience")):
+            responsibilities = job.get("responsibilities") or []
+            if not isinstance(responsibilities, list):
+                raise ValueError(f"'work_experience.{i}.responsibilities' must be a list")
+            for j, bullet in enumerate(responsibilities):
+                if isinstance(bullet, str) and bullet.strip():
+                    items[f"work_experience.{i}.responsibilities.{j}"] = (bullet, "job_description")
+    if "projects" in sections:
+        for i, project in enumerate(_section_entries(resume_content, "projects")):
+            description = project.get("description")
+            if isinstance(description, str) and description.strip():
+                items[f"projects.{i}.description"] = (description, "project")
+    return items
+
+
+def _section_entries(resume_content: Dict[str, Any], section: str) -> List[Dict[str, Any]]:
+    """Return the entries of a list section, checking that each one is an object."""
+    entries = resume_content.get(section) or []
+    if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+        raise ValueError(f"'{section}' must be a list of objects")
+    return entries
+
+
+def apply_resume_items(resume_content: Dict[str, Any], improved: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Return a copy of the resume with improved items written back by id.
+    
+    Args:
+        resume_content: The original resume content
+        improved: Improved text by item id, as from collect_resume_items
+        
+    Returns:
+        Updated copy of the resume content
+    """
+    updated = copy.deepcopy(resume_content)
+    for item_id, text in improved.items():
+        target = updated
+        *path, last = [int(part) if part.isdigit() else part for part in item_id.split(".")]
+        for part in path:
+            target = target[part]
+        target[last] = text
+    return updated
+
+
+def _parse_json_object(text: str) -> Dict[str, Any]:
+    """Parse a JSON object from a model response, ignoring code fences or text around it."""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return {}
+    try:
+        parsed = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+async def _improve_packed(items: Dict[str, Tuple[str, str]], job_title: Optional[str]) -> Dict[str, str]:
+    """
+    Improve several items in one request that returns a JSON object of ids
+    to improved text. Ids missing from the response are left out.
+    """
+    job_context = f"for a {job_title} position " if job_title else ""
+    payload = json.dumps(
+        {item_id: {"type": content_type, "text": text} for item_id, (text, content_type) in items.items()},
+        indent=2,
+        ensure_ascii=False,
+    )
+    prompt = f"""
+    Rewrite each of the following resume items {job_context}to be more impactful, concise, and ATS-friendly.
+    Use strong action verbs and quantify achievements where possible, keeping each item's meaning.
+    
+    Items (id mapped to its type and original text):
+    {payload}
+    
+    Respond only with a JSON object mapping every id to its improved text, with no other text.
+    """
+    
+    response = await ai_provider.complete(
+        prompt,
+        system_prompt=RESUME_WRITER_PROMPT,
+        max_tokens=PACK_TOKENS_OVERHEAD + PACK_TOKENS_PER_ITEM * len(items),
+        temperature=0.7,
+        endpoint="improve_resume",
+    )
+    parsed = _parse_json_object(response)
+    return {
+        item_id: parsed[item_id].strip()
+        for item_id in items
+        if isinstance(parsed.get(item_id), str) and parsed[item_id].strip()
+    }
+
+
+def _pack_size(count: int, concurrency: int) -> int:
+    """Items per packed request so the batch fits in about one round of concurrent calls."""
+    return min(PACK_MAX_ITEMS, max(PACK_MIN_ITEMS, math.ceil(count / max(1, concurrency))))
+
+
+async def improve_resume_items(
+    items: Dict[str, Tuple[str, str]],
+    job_title: Optional[str] = None,
+    mode: str = "auto",
+    concurrency: int = AI_BATCH_CONCURRENCY,
+) -> Tuple[Dict[str, str], str]:
+    """
+    Improve many resume items at once.
+    
+    "parallel" sends one improve_content request per item; "packed" groups
+    items into JSON requests of a few items each. Either way requests run
+    concurrently, at most `concurrency` at a time. "auto" sends a handful of
+    items individually and packs larger batches, so a whole resume takes
+    about as long as one short completion instead of one round trip per
+    bullet. Items a packed response leaves out are retried individually;
+    if a packed request fails altogether, its items keep their original text.
+    
+    Args:
+        items: Items to improve, as from collect_resume_items
+        job_title: Optional job title for context
+        mode: "auto", "packed" or "parallel"
+        concurrency: Maximum concurrent upstream requests
+        
+    Returns:
+        Tuple of (improved text by item id, mode used). Items that could not
+        be improved keep their original text.
+    """
+    if not items:
+        return {}, mode
+    if mode == "auto":
+        mode = "parallel" if len(items) < PACK_MIN_ITEMS else "packed"
+    if mode == "packed" and not ai_provider.is_available():
+        # Packing needs a model to answer in JSON; each item gets its fallback instead
+        mode = "parallel"
+    
+    limit = asyncio.Semaphore(max(1, concurrency))
+    
+    async def improve_one(item_id: str) -> Tuple[str, str]:
+        text, content_type = items[item_id]
+        async with limit:
+            return item_id, await improve_content(text, content_type, job_title)
+    
+    async def improve_pack(item_ids: List[str]) -> Dict[str, str]:
+        async with limit:
+            try:
+                return await _improve_packed({item_id: items[item_id] for item_id in item_ids}, job_title)
+            except Exception as e:
+                # The provider is failing; retrying each item would multiply the failed calls
+                logger.warning(f"Error improving {len(item_ids)} resume items, keeping the original text: {str(e)}")
+                return {item_id: items[item_id][0] for item_id in item_ids}
+    
+    if mode == "packed":
+        ids = list(items)
+        size = _pack_size(len(ids), concurrency)
+        packs = await asyncio.gather(*[improve_pack(ids[i:i + size]) for i in range(0, len(ids), size)])
+        improved = {item_id: text for pack in packs for item_id, text in pack.items()}
+        missing = [item_id for item_id in ids if item_id not in improved]
+    else:
+        improved = {}
+        missing = list(items)
+    
+    improved.update(await asyncio.gather(*[improve_one(item_id) for item_id in missing]))
+    return improved, mode
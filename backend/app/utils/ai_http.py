@@ -0,0 +1,61 @@
+"""
+Shared async HTTP client for calls to the AI provider.
+
+One keep-alive, connection-pooled httpx.AsyncClient is created per worker
+process on first use and reused by every AI request, so calls await the
+network instead of blocking the event loop and skip a TLS handshake per call.
+"""
+import logging
+import os
+from typing import Optional
+
+import httpx
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Pool limits and timeouts from environment variables
+AI_POOL_MAX_CONNECTIONS = int(os.getenv("AI_POOL_MAX_CONNECTIONS", "20"))
+AI_POOL_MAX_KEEPALIVE = int(os.getenv("AI_POOL_MAX_KEEPALIVE", "10"))
+AI_KEEPALIVE_EXPIRY = float(os.getenv("AI_KEEPALIVE_EXPIRY", "30"))
+AI_CONNECT_TIMEOUT = float(os.getenv("AI_CONNECT_TIMEOUT", "5"))
+AI_READ_TIMEOUT = float(os.getenv("AI_READ_TIMEOUT", "30"))
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the worker's shared AI HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=AI_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=AI_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=AI_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(AI_READ_TIMEOUT, connect=AI_CONNECT_TIMEOUT),
+        )
+        logger.info(
+            f"Created AI HTTP client pool (max {AI_POOL_MAX_CONNECTIONS} connections, "
+            f"{AI_POOL_MAX_KEEPALIVE} keep-alive)"
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client and its pooled connections (on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def after_fork() -> None:
+    """Forget a client inherited from the parent; its connections belong to the parent process."""
+    global _client
+    _client = None
+
+
+# The client is per process, so a forked child must start without one
+os.register_at_fork(after_in_child=after_fork)
@@ -0,0 +1,646 @@
+"""
+Provider layer for all AI completions.
+
+Every AI feature (utils/ai_service.py, utils/ai_generator.py and
+services/ai.py) goes through `complete()`, which applies the same backend
+selection, model, connection pool and timeouts (ai_http), concurrency limit,
+host-wide rate limit (ai_ratelimit), retries, hedging and circuit breaker
+(ai_resilience), response cache (ai_cache), request coalescing
+(ai_singleflight) and metrics.
+
+The backend is chosen with AI_PROVIDER:
+
+    openai             OpenAI chat completions API (default)
+    azure              Azure OpenAI; AI_API_ENDPOINT is the deployment's
+                       chat/completions URL including ?api-version=...
+    openai-compatible  Any server speaking the OpenAI chat API (vLLM,
+                       Ollama, LM Studio, ...) at AI_API_ENDPOINT; the API
+                       key is optional
+    mock               No upstream calls; callers use their fallbacks
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Dict, Any, List, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+from .ai_http import get_client
+from .ai_cache import ai_cache, make_key as make_cache_key
+from .ai_singleflight import single_flight
+from .ai_ratelimit import rate_limiter, estimate_tokens, RateLimitTimeout, INTERACTIVE
+from .ai_resilience import (
+    circuit_breaker,
+    backoff_delay,
+    is_transient,
+    AI_RETRY_ATTEMPTS,
+    AI_REQUEST_DEADLINE,
+    AI_HEDGE_PERCENTILE,
+    AI_HEDGE_MIN_SAMPLES,
+)
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Backend settings per provider: default endpoint, auth header and whether a key is required
+PROVIDERS: Dict[str, Dict[str, Any]] = {
+    "openai": {
+        "endpoint": "https://api.openai.com/v1/chat/completions",
+        "auth_header": "Authorization",
+        "auth_prefix": "Bearer ",
+        "requires_key": True,
+    },
+    "azure": {
+        "endpoint": None,
+        "auth_header": "api-key",
+        "auth_prefix": "",
+        "requires_key": True,
+    },
+    "openai-compatible": {
+        "endpoint": None,
+        "auth_header": "Authorization",
+        "auth_prefix": "Bearer ",
+        "requires_key": False,
+    },
+    "mock": None,
+}
+
+# Provider configuration from environment variables
+AI_PROVIDER = os.getenv("AI_PROVIDER", "openai").strip().lower()
+AI_MODEL = os.getenv("AI_MODEL", "gpt-3.5-turbo")
+AI_API_KEY = os.getenv("AI_API_KEY") or os.getenv("OPENAI_API_KEY")
+AI_API_ENDPOINT = os.getenv("AI_API_ENDPOINT", "")
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "16"))  # Upstream calls in flight per worker
+
+DEFAULT_SYSTEM_PROMPT = "You are an expert resume writer and career coach with years of experience helping people land their dream jobs."
+
+# Times a call is re-queued after the provider answers 429 Too Many Requests
+MAX_RATE_LIMITED_RETRIES = 2
+
+# Latency histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = [250, 500, 1000, 2000, 5000, 10000, 30000]
+
+# Recent latencies kept per endpoint for the hedging percentile
+RECENT_LATENCY_SAMPLES = 200
+
+
+class LLMError(Exception):
+    """Raised when a completion cannot be obtained from the provider."""
+
+    def __init__(self, kind: str, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.kind = kind
+        self.retry_after = retry_after
+
+
+class AIMetrics:
+    """Thread-safe per-endpoint counters and latency histograms of upstream AI calls."""
+
+    def __init__(self, buckets: List[float] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+        self._recent: Dict[str, deque] = {}
+
+    def _endpoint(self, endpoint: str) -> Dict[str, Any]:
+        # Caller must hold the lock
+        return self._endpoints.setdefault(endpoint, {
+            "requests": 0,
+            "errors": {},
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "retries": 0,
+            "hedges": 0,
+            "sum_ms": 0.0,
+            "buckets": [0] * (len(self.buckets) + 1),
+        })
+
+    def record_success(self, endpoint: str, ms: float, usage: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            counts = self._endpoint(endpoint)
+            counts["requests"] += 1
+            counts["sum_ms"] += ms
+            counts["buckets"][self._bucket_index(ms)] += 1
+            self._recent.setdefault(endpoint, deque(maxlen=RECENT_LATENCY_SAMPLES)).append(ms)
+            if usage:
+                counts["prompt_tokens"] += usage.get("prompt_tokens", 0) or 0
+                counts["completion_tokens"] += usage.get("completion_tokens", 0) or 0
+
+    def record_error(self, endpoint: str, kind: str) -> None:
+        with self._lock:
+            counts = self._endpoint(endpoint)
+            counts["requests"] += 1
+            counts["errors"][kind] = counts["errors"].get(kind, 0) + 1
+
+    def record(self, endpoint: str, counter: str) -> None:
+        """Increment a plain counter (retries, hedges) of an endpoint."""
+        with self._lock:
+            self._endpoint(endpoint)[counter] += 1
+
+    def latency_percentile(self, endpoint: str, percentile: float, min_samples: int) -> Optional[float]:
+        """
+        Return a percentile of the endpoint's recent successful latencies in ms,
+        or None with fewer than min_samples samples.
+        """
+        with self._lock:
+            samples = sorted(self._recent.get(endpoint, ()))
+        if not samples or len(samples) < min_samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[index]
+
+    def after_fork(self) -> None:
+        """Start a freshly forked child process with its own lock and empty counters."""
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._recent = {}
+
+    def _bucket_index(self, ms: float) -> int:
+        for i, bound in enumerate(self.buckets):
+            if ms <= bound:
+                return i
+        return len(self.buckets)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return per-endpoint counters with cumulative latency buckets."""
+        labels = [f"le_{bound}" for bound in self.buckets] + ["le_inf"]
+        with self._lock:
+            endpoints = {}
+            for name, counts in self._endpoints.items():
+                succeeded = counts["requests"] - sum(counts["errors"].values())
+                cumulative = 0
+                buckets = {}
+                for label, value in zip(labels, counts["buckets"]):
+                    cumulative += value
+                    buckets[label] = cumulative
+                endpoints[name] = {
+                    "requests": counts["requests"],
+                    "errors": dict(counts["errors"]),
+                    "prompt_tokens": counts["prompt_tokens"],
+                    "completion_tokens": counts["completion_tokens"],
+                    "retries": counts["retries"],
+                    "hedges": counts["hedges"],
+                    "mean_ms": round(counts["sum_ms"] / succeeded, 2) if succeeded else None,
+                    "buckets": buckets,
+                }
+            return endpoints
+
+
+class LLMProvider:
+    """A configured chat-completion backend reached through the shared HTTP pool."""
+
+    def __init__(
+        self,
+        name: str = AI_PROVIDER,
+        model: str = AI_MODEL,
+        api_key: Optional[str] = AI_API_KEY,
+        endpoint: str = AI_API_ENDPOINT,
+        max_concurrency: int = AI_MAX_CONCURRENCY,
+    ):
+        if name not in PROVIDERS:
+            raise ValueError(f"Unknown AI provider '{name}'. Available providers: {', '.join(PROVIDERS)}")
+        self.name = name
+        self.model = model
+        self.api_key = api_key
+        self.settings = PROVIDERS[name]
+        self.endpoint = endpoint or (self.settings or {}).get("endpoint")
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.metrics = AIMetrics()
+
+    @property
+    def available(self) -> bool:
+        """Whether upstream calls can be made; otherwise callers use their fallbacks."""
+        if self.settings is None or not self.endpoint:
+            return False
+        return bool(self.api_key) or not self.settings["requires_key"]
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers[self.settings["auth_header"]] = f"{self.settings['auth_prefix']}{self.api_key}"
+        return headers
+
+    def payload(self, system_prompt: str, prompt: str, max_tokens: int, temperature: float) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+
+    def _limit(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def request(
+        self,
+        system_prompt: str,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        endpoint: str,
+        priority: int = INTERACTIVE,
+    ) -> str:
+        """
+        Make an upstream chat completion call, retrying transient failures
+        with jittered backoff, hedging slow attempts and failing fast while
+        the circuit breaker is open (see ai_resilience).
+
+        Raises:
+            LLMError: If every attempt failed, the deadline passed or the circuit is open
+        """
+        start = time.monotonic()
+        attempts = max(1, AI_RETRY_ATTEMPTS)
+        for attempt in range(attempts):
+            self._check_circuit(endpoint)
+            try:
+                content = await self._hedged_attempt(system_prompt, prompt, max_tokens, temperature, endpoint, priority)
+            except LLMError as e:
+                self._record_failure(e)
+                await self._before_retry(e, attempt, attempts, start, endpoint)
+            else:
+                circuit_breaker.record_success()
+                return content
+
+    async def _hedged_attempt(
+        self, system_prompt: str, prompt: str, max_tokens: int, temperature: float, endpoint: str, priority: int
+    ) -> str:
+        """
+        Make one attempt, sending a second identical request if the first is
+        slower than AI_HEDGE_PERCENTILE of recent latencies. The first
+        successful answer wins and the other request is cancelled.
+        """
+        hedge_after = None
+        if AI_HEDGE_PERCENTILE:
+            hedge_after = self.metrics.latency_percentile(endpoint, AI_HEDGE_PERCENTILE, AI_HEDGE_MIN_SAMPLES)
+        if hedge_after is None:
+            return await self._attempt(system_prompt, prompt, max_tokens, temperature, endpoint, priority)
+
+        args = (system_prompt, prompt, max_tokens, temperature, endpoint, priority)
+        pending = {asyncio.ensure_future(self._attempt(*args))}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=hedge_after / 1000)
+            if not done:
+                self.metrics.record(endpoint, "hedges")
+                pending.add(asyncio.ensure_future(self._attempt(*args)))
+
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _attempt(
+        self,
+        system_prompt: str,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        endpoint: str,
+        priority: int = INTERACTIVE,
+    ) -> str:
+        """
+        Make one upstream chat completion call, within the rate limit budget.
+
+        Raises:
+            LLMError: On rate limit timeouts, HTTP and connection errors or malformed responses
+        """
+        estimate = estimate_tokens(system_prompt + prompt, max_tokens)
+        start = time.perf_counter()
+        try:
+            for attempt in range(MAX_RATE_LIMITED_RETRIES + 1):
+                await rate_limiter.acquire(estimate, priority)
+                async with self._limit():
+                    response = await get_client().post(
+                        self.endpoint,
+                        headers=self.headers(),
+                        json=self.payload(system_prompt, prompt, max_tokens, temperature),
+                    )
+                if not self._rate_limited(response, attempt):
+                    break
+                await rate_limiter.throttle(_retry_after(response))
+            response.raise_for_status()
+            result = response.json()
+
+            # Check for valid response structure
+            if 'choices' not in result or not result['choices'] or 'message' not in result['choices'][0]:
+                logger.error(f"Unexpected API response structure: {result}")
+                raise LLMError("response", "Unexpected API response structure")
+            content = (result['choices'][0]['message'].get('content') or "").strip()
+
+        except (httpx.HTTPError, json.JSONDecodeError, RateLimitTimeout, LLMError) as e:
+            raise self._failed(endpoint, e)
+
+        usage = result.get("usage")
+        if usage and usage.get("total_tokens"):
+            await rate_limiter.refund(estimate - usage["total_tokens"])
+        self.metrics.record_success(endpoint, (time.perf_counter() - start) * 1000, usage)
+        return content
+
+    async def stream_request(
+        self,
+        system_prompt: str,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        endpoint: str,
+        priority: int = INTERACTIVE,
+    ) -> AsyncIterator[str]:
+        """
+        Make a streaming upstream chat completion call, yielding text deltas.
+
+        Failures before the first delta are retried like request(); once
+        text has been sent on, a failure is raised to the caller. Streams
+        are not hedged.
+
+        Raises:
+            LLMError: If the stream failed, the deadline passed or the circuit is open
+        """
+        start = time.monotonic()
+        attempts = max(1, AI_RETRY_ATTEMPTS)
+        for attempt in range(attempts):
+            self._check_circuit(endpoint)
+            started = False
+            try:
+                async for delta in self._stream_attempt(system_prompt, prompt, max_tokens, temperature, endpoint, priority):
+                    started = True
+                    yield delta
+            except LLMError as e:
+                self._record_failure(e)
+                if started:
+                    raise
+                await self._before_retry(e, attempt, attempts, start, endpoint)
+            else:
+                circuit_breaker.record_success()
+                return
+
+    async def _stream_attempt(
+        self,
+        system_prompt: str,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        endpoint: str,
+        priority: int = INTERACTIVE,
+    ) -> AsyncIterator[str]:
+        """
+        Make one streaming upstream chat completion call, within the rate
+        limit budget, yielding text deltas as the provider's server-sent
+        events arrive.
+
+        Raises:
+            LLMError: On rate limit timeouts, HTTP and connection errors or malformed events
+        """
+        start = time.perf_counter()
+        payload = self.payload(system_prompt, prompt, max_tokens, temperature)
+        payload["stream"] = True
+        try:
+            for attempt in range(MAX_RATE_LIMITED_RETRIES + 1):
+                await rate_limiter.acquire(estimate_tokens(system_prompt + prompt, max_tokens), priority)
+                async with self._limit():
+                    async with get_client().stream("POST", self.endpoint, headers=self.headers(), json=payload) as response:
+                        if self._rate_limited(response, attempt):
+                            retry_after = _retry_after(response)
+                        else:
+                            response.raise_for_status()
+                            async for line in response.aiter_lines():
+                                if not line.startswith("data:"):
+                                    continue
+                                data = line[len("data:"):].strip()
+                                if data == "[DONE]":
+                                    break
+                                choices = json.loads(data).get("choices") or []
+                                delta = (choices[0].get("delta") or {}).get("content") if choices else None
+                                if delta:
+                                    yield delta
+                            break
+                await rate_limiter.throttle(retry_after)
+        except (httpx.HTTPError, json.JSONDecodeError, RateLimitTimeout) as e:
+            raise self._failed(endpoint, e)
+
+        self.metrics.record_success(endpoint, (time.perf_counter() - start) * 1000, None)
+
+    def _check_circuit(self, endpoint: str) -> None:
+        """Fail fast while the circuit breaker is open."""
+        if not circuit_breaker.allow():
+            self.metrics.record_error(endpoint, "circuit_open")
+            raise LLMError("circuit_open", f"AI provider '{self.name}' is unhealthy; not calling it for now")
+
+    @staticmethod
+    def _record_failure(error: LLMError) -> None:
+        # Calls that never reached the provider say nothing about its health
+        if error.kind != "rate_limited":
+            circuit_breaker.record_failure(error.kind)
+
+    async def _before_retry(self, error: LLMError, attempt: int, attempts: int, start: float, endpoint: str) -> None:
+        """
+        Wait before the next attempt, or re-raise the error when it is not
+        transient, attempts are used up or the wait would pass the deadline.
+        """
+        if not is_transient(error.kind) or attempt + 1 >= attempts:
+            raise error
+        delay = backoff_delay(attempt, error.retry_after)
+        if time.monotonic() - start + delay >= AI_REQUEST_DEADLINE:
+            raise error
+        self.metrics.record(endpoint, "retries")
+        logger.info(f"Retrying AI request for {endpoint} in {delay:.2f}s after {error.kind}")
+        await asyncio.sleep(delay)
+
+    @staticmethod
+    def _rate_limited(response: httpx.Response, attempt: int) -> bool:
+        """Whether a 429 response should be re-queued rather than treated as a failure."""
+        return response.status_code == 429 and rate_limiter.enabled and attempt < MAX_RATE_LIMITED_RETRIES
+
+    def _failed(self, endpoint: str, e: Exception) -> LLMError:
+        """Log and count a failed call, returning it as an LLMError."""
+        if isinstance(e, LLMError):
+            error = e
+        elif isinstance(e, RateLimitTimeout):
+            error = LLMError("rate_limited", str(e))
+        elif isinstance(e, httpx.TimeoutException):
+            error = LLMError("timeout", "API request timed out")
+        elif isinstance(e, httpx.HTTPStatusError):
+            status_code = e.response.status_code
+            error = LLMError(
+                f"http_{status_code}", f"HTTP error {status_code} from API: {str(e)}", _retry_after(e.response)
+            )
+            # Check if it's an authentication error
+            if status_code == 401:
+                logger.error(f"Authentication failed. Check the API key for the {self.name} provider.")
+        elif isinstance(e, httpx.ConnectError):
+            error = LLMError("connection", "Connection error when contacting API service")
+        elif isinstance(e, httpx.HTTPError):
+            error = LLMError("http", f"API request error: {str(e)}")
+        else:
+            error = LLMError("response", "Failed to parse API response as JSON")
+
+        logger.error(str(error))
+        self.metrics.record_error(endpoint, error.kind)
+        return error
+
+    def after_fork(self) -> None:
+        """Drop the semaphore bound to the parent's event loop and zero the metrics."""
+        self._semaphore = None
+        self.metrics.after_fork()
+
+    def describe(self) -> Dict[str, Any]:
+        """Return the provider's availability and circuit state, without its endpoint or configuration."""
+        return {
+            "available": self.available,
+            "circuit": circuit_breaker.stats(),
+        }
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Return the Retry-After delay of a response in seconds, if given as a number."""
+    try:
+        return float(response.headers.get("retry-after", ""))
+    except ValueError:
+        return None
+
+
+# Shared provider for this worker process
+provider = LLMProvider()
+
+# The semaphore belongs to the parent's event loop
+os.register_at_fork(after_in_child=provider.after_fork)
+
+# Log configuration info (without sensitive data)
+if not provider.available:
+    logger.warning(f"AI provider '{provider.name}' makes no upstream calls (mock, or API key or endpoint missing). AI features will use fallbacks.")
+logger.info(f"AI Provider: {provider.name}, Model: {provider.model}")
+
+
+def is_available() -> bool:
+    """Check whether the configured provider can make upstream calls."""
+    return provider.available
+
+
+async def complete(
+    prompt: str,
+    system_prompt: str = DEFAULT_SYSTEM_PROMPT,
+    max_tokens: int = 500,
+    temperature: float = 0.7,
+    endpoint: Optional[str] = None,
+    priority: int = INTERACTIVE,
+) -> str:
+    """
+    Get a chat completion from the configured provider.
+
+    Endpoints listed in AI_CACHE_ENDPOINTS are served from the response
+    cache when possible, and concurrent identical requests share one
+    upstream call.
+
+    Args:
+        prompt: User message
+        system_prompt: System message for the model
+        max_tokens: Maximum tokens in the response
+        temperature: Controls randomness (0-1)
+        endpoint: Name of the calling feature, used for caching and metrics
+        priority: Rate limiter queue priority (ai_ratelimit.INTERACTIVE or BACKGROUND)
+
+    Returns:
+        The completion text
+
+    Raises:
+        LLMError: If the provider is unavailable or the call failed
+    """
+    if not provider.available:
+        raise LLMError("unavailable", f"AI provider '{provider.name}' is not configured")
+
+    endpoint = endpoint or "default"
+    use_cache = ai_cache.enabled_for(endpoint)
+    cache_key = make_cache_key(provider.model, f"{system_prompt}\n{prompt}", temperature, max_tokens)
+    if use_cache:
+        cached = await ai_cache.get(endpoint, cache_key)
+        if cached is not None:
+            return cached
+
+    async def fetch() -> str:
+        content = await provider.request(system_prompt, prompt, max_tokens, temperature, endpoint, priority)
+        if use_cache:
+            await ai_cache.set(endpoint, cache_key, content)
+        return content
+
+    # Other workers can pick up the result from the shared cache
+    recheck = (lambda: ai_cache.get(endpoint, cache_key)) if use_cache and ai_cache.db_path else None
+    return await single_flight.run(cache_key, fetch, recheck)
+
+
+async def stream(
+    prompt: str,
+    system_prompt: str = DEFAULT_SYSTEM_PROMPT,
+    max_tokens: int = 500,
+    temperature: float = 0.7,
+    endpoint: Optional[str] = None,
+    priority: int = INTERACTIVE,
+) -> AsyncIterator[str]:
+    """
+    Stream a chat completion from the configured provider as text deltas.
+
+    Uses the same cache key as complete(): a cached completion is yielded
+    in one piece, and a fully streamed one is cached for both paths.
+    Streams are not coalesced.
+
+    Args:
+        prompt: User message
+        system_prompt: System message for the model
+        max_tokens: Maximum tokens in the response
+        temperature: Controls randomness (0-1)
+        endpoint: Name of the calling feature, used for caching and metrics
+        priority: Rate limiter queue priority (ai_ratelimit.INTERACTIVE or BACKGROUND)
+
+    Yields:
+        Pieces of the completion text in order
+
+    Raises:
+        LLMError: If the provider is unavailable or the call failed
+    """
+    if not provider.available:
+        raise LLMError("unavailable", f"AI provider '{provider.name}' is not configured")
+
+    endpoint = endpoint or "default"
+    use_cache = ai_cache.enabled_for(endpoint)
+    cache_key = make_cache_key(provider.model, f"{system_prompt}\n{prompt}", temperature, max_tokens)
+    if use_cache:
+        cached = await ai_cache.get(endpoint, cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+    parts = []
+    async for delta in provider.stream_request(system_prompt, prompt, max_tokens, temperature, endpoint, priority):
+        parts.append(delta)
+        yield delta
+
+    content = "".join(parts).strip()
+    if use_cache and content:
+        await ai_cache.set(endpoint, cache_key, content)
+
+
+def stats() -> Dict[str, Any]:
+    """Return the provider state, per-endpoint upstream call metrics and rate limiter state."""
+    return {
+        **provider.describe(),
+        "endpoints": provider.metrics.snapshot(),
+        "rate_limit": rate_limiter.stats(),
+    }
@@ -0,0 +1,321 @@
+"""
+Host-wide rate limiting of upstream AI calls.
+
+Requests-per-minute and tokens-per-minute budgets are kept as two token
+buckets in a small SQLite file, so all gunicorn workers on the host draw
+from the same budget. Every call takes one request and its estimated tokens
+(prompt size plus max_tokens) before it is sent; the estimate is corrected
+with the provider's reported usage afterwards.
+
+Calls that cannot be served yet wait in a per-worker priority queue instead
+of failing: interactive calls are dispatched before background ones, and
+background calls may not dip into a reserved share of each bucket, which
+keeps headroom for interactive traffic in the other workers too. A 429 from
+the provider pauses all workers for the Retry-After period.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Rate limits from environment variables (0 disables a budget)
+AI_RATE_LIMIT_RPM = float(os.getenv("AI_RATE_LIMIT_RPM", "0"))
+AI_RATE_LIMIT_TPM = float(os.getenv("AI_RATE_LIMIT_TPM", "0"))
+AI_RATE_LIMIT_DB = os.getenv("AI_RATE_LIMIT_DB", os.path.join(tempfile.gettempdir(), "resume-ai-ratelimit.sqlite"))
+AI_RATE_LIMIT_MAX_WAIT = float(os.getenv("AI_RATE_LIMIT_MAX_WAIT", "30"))
+AI_RATE_LIMIT_BACKGROUND_RESERVE = float(os.getenv("AI_RATE_LIMIT_BACKGROUND_RESERVE", "0.2"))
+
+# Priorities, lowest value first
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# Rough characters per token for estimating prompt size
+CHARS_PER_TOKEN = 4
+
+# Waits shorter than this (the database round trip) are not counted as queued
+MIN_COUNTED_WAIT_MS = 10
+
+# Pause applied after a 429 without a usable Retry-After header
+DEFAULT_RETRY_AFTER = 5.0
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a call waited longer than the allowed time for rate limit budget."""
+
+
+def estimate_tokens(text: str, max_tokens: int) -> int:
+    """
+    Estimate the tokens a completion will use.
+
+    Args:
+        text: Full prompt text, including the system message
+        max_tokens: Maximum tokens in the response
+
+    Returns:
+        Estimated prompt tokens plus max_tokens
+    """
+    return len(text) // CHARS_PER_TOKEN + 1 + max_tokens
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter on requests and tokens per minute, shared through
+    SQLite, with a priority queue of waiting calls in this worker.
+
+    Each bucket holds up to one minute of budget and refills continuously.
+    Without a usable database file the buckets are kept in memory and only
+    limit this worker.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = AI_RATE_LIMIT_RPM,
+        tokens_per_minute: float = AI_RATE_LIMIT_TPM,
+        db_path: str = AI_RATE_LIMIT_DB,
+        max_wait: float = AI_RATE_LIMIT_MAX_WAIT,
+        background_reserve: float = AI_RATE_LIMIT_BACKGROUND_RESERVE,
+    ):
+        self.capacities = {"requests": requests_per_minute, "tokens": tokens_per_minute}
+        self.capacities = {name: capacity for name, capacity in self.capacities.items() if capacity > 0}
+        self.max_wait = max_wait
+        self.background_reserve = background_reserve
+        self.db_path = db_path or None
+        self._memory: Dict[str, List[float]] = {}
+        self._memory_lock = threading.Lock()
+        self._reset_queue()
+
+        if self.enabled and self.db_path:
+            try:
+                with self._connect() as conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS ai_rate_limit "
+                        "(name TEXT PRIMARY KEY, level REAL NOT NULL, updated_at REAL NOT NULL, blocked_until REAL NOT NULL)"
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Could not open rate limit database {self.db_path}, limiting per worker: {str(e)}")
+                self.db_path = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.capacities)
+
+    def _reset_queue(self) -> None:
+        self._queue: List[Tuple[int, int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            name: {"granted": 0, "waited": 0, "wait_ms": 0.0, "timeouts": 0}
+            for name in PRIORITY_NAMES.values()
+        }
+        self._throttled = 0
+
+    async def acquire(self, tokens: int, priority: int = INTERACTIVE) -> None:
+        """
+        Wait until one request and `tokens` tokens are available, in priority order.
+
+        Args:
+            tokens: Estimated tokens for the call (see estimate_tokens)
+            priority: INTERACTIVE or BACKGROUND
+
+        Raises:
+            RateLimitTimeout: If the budget did not become available within max_wait
+        """
+        if not self.enabled:
+            return
+
+        start = time.perf_counter()
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._sequence), tokens, waiter))
+        self._wake()
+        try:
+            await asyncio.wait_for(waiter, timeout=self.max_wait or None)
+        except asyncio.TimeoutError:
+            self._record(priority, "timeouts")
+            raise RateLimitTimeout(f"Waited more than {self.max_wait:g}s for AI rate limit budget")
+
+        waited_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            counts = self._stats[PRIORITY_NAMES[priority]]
+            counts["granted"] += 1
+            if waited_ms >= MIN_COUNTED_WAIT_MS:
+                counts["waited"] += 1
+                counts["wait_ms"] += waited_ms
+
+    async def refund(self, tokens: int) -> None:
+        """Return unused estimated tokens (or charge extra ones, if negative) to the token bucket."""
+        if "tokens" in self.capacities and tokens:
+            await asyncio.to_thread(self._update, self._refund, tokens)
+
+    async def throttle(self, retry_after: Optional[float]) -> None:
+        """Pause all workers after the provider answered 429 Too Many Requests."""
+        if not self.enabled:
+            return
+        seconds = retry_after if retry_after and retry_after > 0 else DEFAULT_RETRY_AFTER
+        with self._lock:
+            self._throttled += 1
+        logger.warning(f"AI provider is rate limiting; pausing upstream calls for {seconds:g}s")
+        await asyncio.to_thread(self._update, self._block, time.time() + seconds)
+
+    def after_fork(self) -> None:
+        """Give a freshly forked child an empty queue, its own locks and zeroed counters."""
+        self._memory_lock = threading.Lock()
+        self._reset_queue()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the configured budgets, queue depth and per-priority wait counters."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "shared": self.db_path is not None,
+                "requests_per_minute": self.capacities.get("requests"),
+                "tokens_per_minute": self.capacities.get("tokens"),
+                "queued": sum(1 for entry in self._queue if not entry[3].done()),
+                "throttled": self._throttled,
+                "priorities": {
+                    name: {**counts, "wait_ms": round(counts["wait_ms"], 2)} for name, counts in self._stats.items()
+                },
+            }
+
+    def _record(self, priority: int, counter: str) -> None:
+        with self._lock:
+            self._stats[PRIORITY_NAMES[priority]][counter] += 1
+
+    def _wake(self) -> None:
+        """Make the dispatcher re-examine the head of the queue, starting it if needed."""
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        """Grant budget to queued calls in priority order until the queue is empty."""
+        while self._queue:
+            priority, _, tokens, waiter = self._queue[0]
+            if waiter.done():
+                # Timed out or cancelled while queued
+                heapq.heappop(self._queue)
+                continue
+
+            try:
+                wait = await asyncio.to_thread(self._update, self._take, tokens, priority)
+            except sqlite3.Error as e:
+                logger.warning(f"Rate limit database error, letting call through: {str(e)}")
+                wait = 0.0
+
+            if wait <= 0:
+                heapq.heappop(self._queue)
+                if not waiter.done():
+                    waiter.set_result(None)
+                continue
+
+            # Sleep until the budget refills, or until a new call may have jumped the queue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+
+    def _take(self, state: Dict[str, List[float]], tokens: int, priority: int) -> float:
+        """
+        Try to take one request and `tokens` tokens from refilled buckets.
+
+        Returns:
+            0 if granted, otherwise seconds until the call could be granted
+        """
+        now = time.time()
+        blocked_until = max(bucket[2] for bucket in state.values())
+        if blocked_until > now:
+            return blocked_until - now
+
+        reserve = self.background_reserve if priority == BACKGROUND else 0.0
+        need = {"requests": 1, "tokens": tokens}
+        wait = 0.0
+        for name, capacity in self.capacities.items():
+            # A call larger than the whole bucket waits for a full bucket and leaves it in debt
+            required = min(min(need[name], capacity) + reserve * capacity, capacity)
+            level = state[name][0]
+            if level < required:
+                wait = max(wait, (required - level) * 60.0 / capacity)
+        if wait:
+            return wait
+
+        for name in self.capacities:
+            state[name][0] -= need[name]
+        return 0.0
+
+    def _refund(self, state: Dict[str, List[float]], tokens: int) -> None:
+        bucket = state["tokens"]
+        bucket[0] = min(self.capacities["tokens"], bucket[0] + tokens)
+
+    def _block(self, state: Dict[str, List[float]], until: float) -> None:
+        for bucket in state.values():
+            bucket[2] = max(bucket[2], until)
+
+    def _update(self, operation, *args):
+        """Run an operation on the refilled bucket state and persist the result."""
+        with self._state() as state:
+            now = time.time()
+            for name, capacity in self.capacities.items():
+                bucket = state.setdefault(name, [capacity, now, 0.0])
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * capacity / 60.0)
+                bucket[1] = now
+            return operation(state, *args)
+
+    @contextmanager
+    def _state(self):
+        """Yield the bucket state as {name: [level, updated_at, blocked_until]}, locked for update."""
+        if not self.db_path:
+            with self._memory_lock:
+                yield self._memory
+            return
+
+        conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+        try:
+            # Take the write lock up front so concurrent workers serialize
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute("SELECT name, level, updated_at, blocked_until FROM ai_rate_limit").fetchall()
+            state = {name: [level, updated_at, blocked_until] for name, level, updated_at, blocked_until in rows}
+            try:
+                yield state
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.executemany(
+                "INSERT OR REPLACE INTO ai_rate_limit (name, level, updated_at, blocked_until) VALUES (?, ?, ?, ?)",
+                [(name, *bucket) for name, bucket in state.items()],
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection, committing and closing it afterwards."""
+        conn = sqlite3.connect(self.db_path, timeout=5.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+# Shared limiter for this worker process
+rate_limiter = RateLimiter()
+
+# The queue and dispatcher belong to the parent's event loop
+os.register_at_fork(after_in_child=rate_limiter.after_fork)
@@ -0,0 +1,165 @@
+"""
+Failure handling policy for upstream AI calls.
+
+- Transient failures (timeouts, connection errors, 5xx and 429 responses)
+  are retried a bounded number of times with exponential backoff and full
+  jitter, within an overall deadline.
+- Optionally, when an attempt is slower than a percentile of recent
+  latencies, a second (hedged) request is sent and the first answer wins.
+- A circuit breaker stops calling the provider after consecutive transient
+  failures, so requests fall back immediately instead of each waiting out
+  the timeout. After a cool-down one request is let through as a probe;
+  its success closes the circuit again.
+"""
+import logging
+import os
+import random
+import threading
+import time
+from typing import Dict, Any, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Retry, hedging and circuit breaker settings from environment variables
+AI_RETRY_ATTEMPTS = int(os.getenv("AI_RETRY_ATTEMPTS", "3"))  # Total attempts per call
+AI_RETRY_BASE_DELAY = float(os.getenv("AI_RETRY_BASE_DELAY", "0.5"))
+AI_RETRY_MAX_DELAY = float(os.getenv("AI_RETRY_MAX_DELAY", "8"))
+AI_REQUEST_DEADLINE = float(os.getenv("AI_REQUEST_DEADLINE", "45"))  # No retry starts after this many seconds
+AI_HEDGE_PERCENTILE = float(os.getenv("AI_HEDGE_PERCENTILE", "0"))  # e.g. 95; 0 disables hedging
+AI_HEDGE_MIN_SAMPLES = int(os.getenv("AI_HEDGE_MIN_SAMPLES", "20"))
+AI_BREAKER_FAILURES = int(os.getenv("AI_BREAKER_FAILURES", "5"))  # 0 disables the breaker
+AI_BREAKER_RESET_SECONDS = float(os.getenv("AI_BREAKER_RESET_SECONDS", "30"))
+
+# Error kinds (see ai_provider.LLMError) that indicate a transient upstream problem
+TRANSIENT_ERRORS = {"timeout", "connection", "http", "http_429"}
+
+
+def is_transient(kind: str) -> bool:
+    """Check whether a failed call is worth retrying and counts against the provider's health."""
+    return kind in TRANSIENT_ERRORS or kind.startswith("http_5")
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Return the delay before retry number `attempt` (starting at 0).
+
+    Uses "full jitter": a uniform random delay up to the exponential
+    backoff, so retries from many clients spread out instead of arriving
+    together. A provider's Retry-After is honoured as a minimum.
+
+    Args:
+        attempt: Number of retries already made
+        retry_after: Delay requested by the provider, if any
+
+    Returns:
+        Seconds to wait
+    """
+    delay = random.uniform(0, min(AI_RETRY_MAX_DELAY, AI_RETRY_BASE_DELAY * (2 ** attempt)))
+    if retry_after:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class CircuitBreaker:
+    """
+    Per-worker circuit breaker: closed, open after `failure_threshold`
+    consecutive transient failures, and half-open (a single probe request)
+    once `reset_seconds` have passed.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = AI_BREAKER_FAILURES, reset_seconds: float = AI_BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self.opened = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may go upstream now.
+
+        While open, calls are rejected until the cool-down has passed; then
+        one caller is admitted as the probe. Another probe is admitted if the
+        first one has not reported back within a cool-down (e.g. it was
+        cancelled).
+        """
+        if not self.failure_threshold:
+            return True
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == self.OPEN and now - self._opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and (not self._probing or now - self._probe_started >= self.reset_seconds):
+                self._probing = True
+                self._probe_started = now
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("AI provider recovered; circuit closed")
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self, kind: str) -> None:
+        """Count a failed call; only transient upstream failures can open the circuit."""
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            if not is_transient(kind):
+                # The provider answered; a client error says nothing about its health
+                self._probing = False
+                if self.state == self.HALF_OPEN:
+                    self.state = self.CLOSED
+                    self._failures = 0
+                return
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.opened += 1
+                    logger.warning(
+                        f"AI provider unhealthy after {self._failures} failures; "
+                        f"failing fast for {self.reset_seconds:g}s"
+                    )
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def after_fork(self) -> None:
+        """Start a freshly forked child process closed, with its own lock."""
+        self._lock = threading.Lock()
+        self._reset()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+# Shared breaker for this worker process
+circuit_breaker = CircuitBreaker()
+
+# Locks and counters are per process
+os.register_at_fork(after_in_child=circuit_breaker.after_fork)
@@ -1,106 +1,98 @@
 """
 AI Service for resume content generation and enhancements.
 """
-import os
+import asyncio
 import logging
-import requests
 import json
-from typing import List, Dict, Any, Optional
-from dotenv import load_dotenv
+import os
+import time
+from typing import AsyncIterator, List, Dict, Any, Optional
 
-# Load environment variables
-load_dotenv()
+from . import ai_provider, keyword_extractor, skill_taxonomy
+from .ai_provider import LLMError
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Get API keys from environment variables
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-AI_MODEL = os.getenv("AI_MODEL", "gpt-3.5-turbo")
-AI_PROVIDER = os.getenv("AI_PROVIDER", "openai")  # openai, azure, etc.
-API_ENDPOINT = os.getenv("AI_API_ENDPOINT", "https://api.openai.com/v1/chat/completions")
+SYSTEM_PROMPT = ai_provider.DEFAULT_SYSTEM_PROMPT
 
-# Log configuration info (without sensitive data)
-if not OPENAI_API_KEY:
-    logger.warning("OPENAI_API_KEY is not set in environment variables. AI features will use mock responses.")
-logger.info(f"AI Provider: {AI_PROVIDER}, Model: {AI_MODEL}")
+# Job description analysis is local; set to true to add the AI extraction and AI-written tips
+AI_KEYWORD_ENRICHMENT = os.getenv("AI_KEYWORD_ENRICHMENT", "false").lower() in ("1", "true", "yes")
 
-def make_ai_request(prompt: str, max_tokens: int = 500, temperature: float = 0.7) -> str:
+async def make_ai_request(
+    prompt: str,
+    max_tokens: int = 500,
+    temperature: float = 0.7,
+    endpoint: Optional[str] = None,
+) -> str:
     """
     Make a request to the AI service with the given prompt.
     
+    The request goes through the shared provider layer (see ai_provider),
+    which applies the configured backend, caching and request coalescing.
+    
     Args:
         prompt: The prompt to send to the AI service
         max_tokens: Maximum tokens in the response
         temperature: Controls randomness (0-1)
+        endpoint: Name of the calling feature, used to opt in to the AI
+            response cache (see ai_cache.AI_CACHE_ENDPOINTS) and for metrics
         
     Returns:
         Generated text response
     """
-    try:
-        if not OPENAI_API_KEY:
-            logger.warning("No API key found for AI service. Using mock response.")
-            return generate_mock_response(prompt)
-        
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {OPENAI_API_KEY}"
-        }
-        
-        data = {
-            "model": AI_MODEL,
-            "messages": [
-                {"role": "system", "content": "You are an expert resume writer and career coach with years of experience helping people land their dream jobs."},
-                {"role": "user", "content": prompt}
-            ],
-            "max_tokens": max_tokens,
-            "temperature": temperature
-        }
-        
-        try:
-            response = requests.post(API_ENDPOINT, headers=headers, json=data, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
-            
-            # Check for valid response structure
-            if 'choices' not in result or not result['choices'] or 'message' not in result['choices'][0]:
-                logger.error(f"Unexpected API response structure: {result}")
-                return generate_mock_response(prompt)
-                
-            return result['choices'][0]['message']['content'].strip()
-            
-        except requests.exceptions.Timeout:
-            logger.error("API request timed out")
-            return generate_mock_response(prompt)
-            
-        except requests.exceptions.HTTPError as e:
-            status_code = e.response.status_code if e.response else "unknown"
-            logger.error(f"HTTP error {status_code} from API: {str(e)}")
-            
-            # Check if it's an authentication error
-            if e.response and e.response.status_code == 401:
-                logger.error("Authentication failed. Check your OpenAI API key.")
-            
-            return generate_mock_response(prompt)
-            
-        except requests.exceptions.ConnectionError:
-            logger.error("Connection error when contacting API service")
-            return generate_mock_response(prompt)
-            
-        except json.JSONDecodeError:
-            logger.error("Failed to parse API response as JSON")
-            return generate_mock_response(prompt)
-    
-    except requests.exceptions.RequestException as e:
-        logger.error(f"API request error: {str(e)}")
-        # Fall back to mock response if API call fails
+    if not ai_provider.is_available():
+        logger.warning("No AI provider configured. Using mock response.")
         return generate_mock_response(prompt)
     
-    except Exception as e:
-        logger.error(f"Error making AI request: {str(e)}")
+    try:
+        return await ai_provider.complete(
+            prompt,
+            system_prompt=SYSTEM_PROMPT,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            endpoint=endpoint,
+        )
+    except LLMError:
+        # Fall back to mock response if API call fails (never cached)
         return generate_mock_response(prompt)
 
+async def stream_ai_request(
+    prompt: str,
+    max_tokens: int = 500,
+    temperature: float = 0.7,
+    endpoint: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """
+    Streaming counterpart of make_ai_request, yielding the response as it is generated.
+    
+    Falls back to the mock response if the request fails before any text
+    has been produced.
+    
+    Raises:
+        LLMError: If the stream fails part-way through
+    """
+    if not ai_provider.is_available():
+        logger.warning("No AI provider configured. Using mock response.")
+        yield generate_mock_response(prompt)
+        return
+    
+    started = False
+    try:
+        async for delta in ai_provider.stream(
+            prompt,
+            system_prompt=SYSTEM_PROMPT,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            endpoint=endpoint,
+        ):
+            started = True
+            yield delta
+    except LLMError:
+        if started:
+            raise
+        yield generate_mock_response(prompt)
+
 def generate_mock_response(prompt: str) -> str:
     """
     Generate a mock response for testing when API key is not available.
@@ -125,18 +117,8 @@ def generate_mock_response(prompt: str) -> str:
     else:
         return "This is a mock response for testing purposes. Please configure your API key for actual AI-generated content."
 
-def generate_resume_summary(job_title: str, experience_years: int = 3, skills: List[str] = None) -> str:
-    """
-    Generate a professional summary for a resume tailored to the job title and skills.
-    
-    Args:
-        job_title: Target job title
-        experience_years: Years of experience in the field
-        skills: List of key skills to emphasize
-        
-    Returns:
-        Generated professional summary
-    """
+def _summary_prompt(job_title: str, experience_years: int, skills: Optional[List[str]]) -> str:
+    """Build the prompt for a resume summary."""
     skills_str = ", ".join(skills) if skills else "various relevant skills"
     
     experience_level = "entry-level"
@@ -147,33 +129,37 @@ def generate_resume_summary(job_title: str, experience_years: int = 3, skills: L
     elif experience_years > 10:
         experience_level = "expert-level"
     
-    prompt = f"""
+    return f"""
     Write a professional, ATS-friendly resume summary for a {experience_level} {job_title} with {experience_years} years of experience.
     The summary should be concise (3-4 sentences), highlight skills including {skills_str}, and be written in first person.
     Focus on achievements and value-add rather than just responsibilities.
     """
-    
-    return make_ai_request(prompt, max_tokens=200, temperature=0.7)
 
-def improve_job_descriptions(job_title: str, company_name: str, responsibilities: List[str], years_experience: int = 1) -> List[str]:
+async def generate_resume_summary(job_title: str, experience_years: int = 3, skills: List[str] = None) -> str:
     """
-    Improve job descriptions to be more impactful and ATS-friendly.
+    Generate a professional summary for a resume tailored to the job title and skills.
     
     Args:
-        job_title: Job title
-        company_name: Company name
-        responsibilities: List of responsibilities to improve
-        years_experience: Years of experience in this role
+        job_title: Target job title
+        experience_years: Years of experience in the field
+        skills: List of key skills to emphasize
         
     Returns:
-        List of improved job descriptions
+        Generated professional summary
     """
-    if not responsibilities:
-        return []
-    
+    prompt = _summary_prompt(job_title, experience_years, skills)
+    return await make_ai_request(prompt, max_tokens=200, temperature=0.7, endpoint="resume_summary")
+
+def stream_resume_summary(job_title: str, experience_years: int = 3, skills: List[str] = None) -> AsyncIterator[str]:
+    """Stream the summary generated by generate_resume_summary as it is written."""
+    prompt = _summary_prompt(job_title, experience_years, skills)
+    return stream_ai_request(prompt, max_tokens=200, temperature=0.7, endpoint="resume_summary")
+
+def _job_descriptions_prompt(job_title: str, company_name: str, responsibilities: List[str], years_experience: int) -> str:
+    """Build the prompt for improving job responsibilities."""
     resp_text = "\n".join([f"- {r}" for r in responsibilities])
     
-    prompt = f"""
+    return f"""
     Improve the following job responsibilities for a {job_title} position at {company_name} with {years_experience} year(s) of experience.
     Make them more impactful, quantifiable where possible, and optimized for ATS systems.
     Start each bullet with a strong action verb, be specific about achievements, and include metrics when possible.
@@ -183,9 +169,18 @@ def improve_job_descriptions(job_title: str, company_name: str, responsibilities
     
     Please provide exactly {len(responsibilities)} improved bullets, maintaining the same general topics but making them more professional and impressive.
     """
+
+def parse_job_descriptions(response: str, responsibilities: List[str]) -> List[str]:
+    """
+    Split an improved-responsibilities response into bullets.
     
-    response = make_ai_request(prompt, max_tokens=800, temperature=0.7)
-    
+    Args:
+        response: Text returned by the AI service
+        responsibilities: The original responsibilities
+        
+    Returns:
+        At most one improved bullet per original responsibility
+    """
     # Parse the response into individual bullet points
     improved_bullets = []
     for line in response.split('\n'):
@@ -202,7 +197,40 @@ def improve_job_descriptions(job_title: str, company_name: str, responsibilities
     # Ensure we return the same number of responsibilities
     return improved_bullets[:len(responsibilities)]
 
-def get_relevant_skills(job_title: str, experience_level: str = "mid-level") -> List[str]:
+async def improve_job_descriptions(job_title: str, company_name: str, responsibilities: List[str], years_experience: int = 1) -> List[str]:
+    """
+    Improve job descriptions to be more impactful and ATS-friendly.
+    
+    Args:
+        job_title: Job title
+        company_name: Company name
+        responsibilities: List of responsibilities to improve
+        years_experience: Years of experience in this role
+        
+    Returns:
+        List of improved job descriptions
+    """
+    if not responsibilities:
+        return []
+    
+    prompt = _job_descriptions_prompt(job_title, company_name, responsibilities, years_experience)
+    response = await make_ai_request(prompt, max_tokens=800, temperature=0.7, endpoint="job_descriptions")
+    return parse_job_descriptions(response, responsibilities)
+
+async def stream_job_descriptions(job_title: str, company_name: str, responsibilities: List[str], years_experience: int = 1) -> AsyncIterator[str]:
+    """
+    Stream the raw text of improve_job_descriptions as it is written.
+    
+    The assembled text can be split into bullets with parse_job_descriptions.
+    """
+    if not responsibilities:
+        return
+    
+    prompt = _job_descriptions_prompt(job_title, company_name, responsibilities, years_experience)
+    async for delta in stream_ai_request(prompt, max_tokens=800, temperature=0.7, endpoint="job_descriptions"):
+        yield delta
+
+async def get_relevant_skills(job_title: str, experience_level: str = "mid-level") -> List[str]:
     """
     Get a list of relevant skills for a specific job title.
     
@@ -219,7 +247,7 @@ def get_relevant_skills(job_title: str, experience_level: str = "mid-level") ->
     Include only the skills as a comma-separated list, with no explanations or introduction.
     """
     
-    response = make_ai_request(prompt, max_tokens=300, temperature=0.7)
+    response = await make_ai_request(prompt, max_tokens=300, temperature=0.7, endpoint="relevant_skills")
     
     # Parse the response into a list of skills
     skills = []
@@ -235,16 +263,103 @@ def get_relevant_skills(job_title: str, experience_level: str = "mid-level") ->
     
     return skills
 
-def analyze_keywords_from_job(job_description: str, resume_content: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+async def analyze_keywords_from_job(
+    job_description: str,
+    resume_content: Optional[Dict[str, Any]] = None,
+    enrich: Optional[bool] = None,
+) -> Dict[str, Any]:
     """
     Analyze a job description to extract keywords and provide suggestions.
     
+    Keywords, skills, education and experience level are extracted locally
+    (see keyword_extractor), so the analysis works without an AI provider.
+    With enrichment on, the AI extraction adds to the local result, and the
+    improvement tips for skills already found missing locally are requested
+    concurrently with it. Skills are compared by normalized key, so "JS" on
+    the resume matches "JavaScript" in the posting.
+    
     Args:
         job_description: The job posting text
         resume_content: Optional resume content to compare against
+        enrich: Whether to add AI extraction and tips; defaults to
+            AI_KEYWORD_ENRICHMENT, and is off without an AI provider
         
     Returns:
-        Dictionary with keywords, missing skills, and suggestions
+        Dictionary with keywords, missing skills, suggestions and the
+        time spent in each stage ("timings", in milliseconds)
+    """
+    started = time.perf_counter()
+    timings: Dict[str, float] = {}
+    enrich = (AI_KEYWORD_ENRICHMENT if enrich is None else enrich) and ai_provider.is_available()
+
+    def mark(stage: str, since: float) -> float:
+        now = time.perf_counter()
+        timings[stage] = round((now - since) * 1000, 2)
+        return now
+
+    # Stage 1: extract keywords and skills locally
+    analysis = keyword_extractor.extract_job_keywords(job_description)
+    stage_start = mark("local_extract", started)
+
+    # Stage 2: compare the skills found with the resume
+    resume_keys = set()
+    if resume_content:
+        resume_keys = skill_taxonomy.skill_keys(resume_content.get("skills", []))
+    local_missing = _missing_skills(analysis, resume_keys) if resume_content else []
+    stage_start = mark("local_match", stage_start)
+
+    if enrich:
+        # Stage 3: AI extraction, with the tips for locally found gaps requested alongside it
+        tips_task = asyncio.ensure_future(_improvement_tips(local_missing)) if local_missing else None
+        try:
+            ai_analysis = await _ai_keyword_analysis(job_description)
+        except BaseException:
+            if tips_task is not None:
+                tips_task.cancel()
+            raise
+        analysis = _merge_analysis(analysis, ai_analysis)
+        stage_start = mark("enrichment", stage_start)
+    
+    result = {
+        "keywords": analysis.get("keywords", []),
+        "missing_skills": [],
+        "suggestions": {
+            "hard_skills": analysis.get("hard_skills", []),
+            "soft_skills": analysis.get("soft_skills", []),
+            "education": analysis.get("education_requirements", ""),
+            "experience_level": analysis.get("experience_level", "")
+        }
+    }
+    
+    if resume_content:
+        missing_skills = _missing_skills(analysis, resume_keys) if enrich else local_missing
+        result["missing_skills"] = missing_skills
+        
+        # Stage 4: suggestions, already in flight when the local match found gaps
+        if enrich and tips_task is not None:
+            result["suggestions"]["improvement_tips"] = await tips_task
+        elif enrich and missing_skills:
+            result["suggestions"]["improvement_tips"] = await _improvement_tips(missing_skills)
+        elif missing_skills:
+            result["suggestions"]["improvement_tips"] = _local_improvement_tips(missing_skills, analysis)
+        if "improvement_tips" in result["suggestions"]:
+            mark("suggestions", stage_start)
+    
+    mark("total", started)
+    result["timings"] = timings
+    logger.info(f"Keyword analysis timings (ms): {timings}")
+    return result
+
+async def _ai_keyword_analysis(job_description: str) -> Dict[str, Any]:
+    """
+    Ask the AI provider for keywords and skills in a job description.
+    
+    Args:
+        job_description: The job posting text
+        
+    Returns:
+        Dictionary with keywords, hard_skills, soft_skills,
+        education_requirements and experience_level
     """
     prompt = f"""
     Extract the 15 most important keywords and skills from the following job description that an ATS system would look for.
@@ -263,62 +378,114 @@ def analyze_keywords_from_job(job_description: str, resume_content: Optional[Dic
     }}
     """
     
-    response = make_ai_request(prompt, max_tokens=600, temperature=0.5)
+    response = await make_ai_request(prompt, max_tokens=600, temperature=0.5, endpoint="keyword_analysis")
     
     # Parse the JSON response
     try:
-        analysis = json.loads(response)
+        return json.loads(response)
     except json.JSONDecodeError:
         # If the response isn't valid JSON, extract what we can
         logger.warning("Could not parse AI response as JSON, using fallback extraction")
-        keywords = extract_list_items(response, "keywords")
-        hard_skills = extract_list_items(response, "hard skills")
-        soft_skills = extract_list_items(response, "soft skills")
-        
-        analysis = {
-            "keywords": keywords,
-            "hard_skills": hard_skills,
-            "soft_skills": soft_skills,
+        return {
+            "keywords": extract_list_items(response, "keywords"),
+            "hard_skills": extract_list_items(response, "hard skills"),
+            "soft_skills": extract_list_items(response, "soft skills"),
             "education_requirements": extract_text_after(response, "education requirements"),
             "experience_level": extract_text_after(response, "experience level")
         }
+
+def _merge_analysis(local: Dict[str, Any], ai_analysis: Any) -> Dict[str, Any]:
+    """
+    Add the AI extraction to the local one.
     
-    # If we have resume content, compare and provide suggestions
-    result = {
-        "keywords": analysis.get("keywords", []),
-        "missing_skills": [],
-        "suggestions": {
-            "hard_skills": analysis.get("hard_skills", []),
-            "soft_skills": analysis.get("soft_skills", []),
-            "education": analysis.get("education_requirements", ""),
-            "experience_level": analysis.get("experience_level", "")
-        }
-    }
+    Lists keep the local entries first, followed by AI entries with a new
+    skill key. The AI's education and experience level are preferred when given.
+    """
+    if not isinstance(ai_analysis, dict):
+        return local
+    merged = dict(local)
+    for field in ("keywords", "hard_skills", "soft_skills"):
+        extra = ai_analysis.get(field)
+        if isinstance(extra, list):
+            merged[field] = _unique_skills(local.get(field, []) + extra)
+    for field in ("education_requirements", "experience_level"):
+        value = ai_analysis.get(field)
+        if isinstance(value, str) and value.strip():
+            merged[field] = value.strip()
+    return merged
+
+def _unique_skills(skills: List[Any], exclude: Optional[set] = None) -> List[str]:
+    """Return the skills in order, dropping blanks and repeats by skill key, and any key in `exclude`."""
+    seen = set(exclude or ())
+    unique = []
+    for skill in skills:
+        if not isinstance(skill, str) or not skill.strip():
+            continue
+        key = skill_taxonomy.skill_key(skill)
+        if key not in seen:
+            seen.add(key)
+            unique.append(skill.strip())
+    return unique
+
+def _missing_skills(analysis: Dict[str, Any], resume_keys: set) -> List[str]:
+    """Return the job's hard and soft skills whose key is not among the resume's, in the job's order."""
+    return _unique_skills(analysis.get("hard_skills", []) + analysis.get("soft_skills", []), exclude=resume_keys)
+
+def _local_improvement_tips(missing_skills: List[str], analysis: Dict[str, Any]) -> List[str]:
+    """
+    Write suggestions for covering missing skills without the AI provider.
     
-    if resume_content:
-        # Compare skills in job vs resume
-        resume_skills = set(resume_content.get("skills", []))
-        job_skills = set(analysis.get("hard_skills", []) + analysis.get("soft_skills", []))
+    Args:
+        missing_skills: Job skills not found on the resume
+        analysis: Extracted job analysis, for the experience level
         
-        missing_skills = [skill for skill in job_skills if skill.lower() not in [s.lower() for s in resume_skills]]
-        result["missing_skills"] = missing_skills
+    Returns:
+        Up to 3 suggestions
+    """
+    soft = set(skill_taxonomy.SOFT_SKILLS)
+    hard_missing = [skill for skill in missing_skills if skill not in soft]
+    soft_missing = [skill for skill in missing_skills if skill in soft]
+    
+    tips = []
+    if hard_missing:
+        tips.append(
+            f"If you have worked with {', '.join(hard_missing[:5])}, list them in your skills section "
+            f"using the same wording as the job posting."
+        )
+        tips.append(
+            f"Add an experience bullet that shows how you used {hard_missing[0]} and the result it achieved."
+        )
+    if soft_missing:
+        tips.append(
+            f"Show {', '.join(skill.lower() for skill in soft_missing[:3])} through concrete examples in your experience "
+            f"rather than listing them as skills."
+        )
+    level = analysis.get("experience_level", "")
+    if level:
+        tips.append(f"The posting asks for a {level} candidate; lead with the experience that best matches that level.")
+    return tips[:3]
+
+async def _improvement_tips(missing_skills: List[str]) -> List[str]:
+    """
+    Ask for suggestions on covering skills that are missing from a resume.
+    
+    Args:
+        missing_skills: Job skills not found on the resume
         
-        # Add suggestions based on comparison
-        if missing_skills:
-            prompt_suggestions = f"""
+    Returns:
+        Suggestions as a list of strings
+    """
+    prompt_suggestions = f"""
             Based on the job skills {', '.join(missing_skills)} that are missing from the candidate's resume,
             provide 3 specific suggestions for how they could improve their resume.
             Format as a numbered list without any introduction.
             """
-            suggestions_response = make_ai_request(prompt_suggestions, max_tokens=300, temperature=0.7)
-            
-            # Extract suggestions as a list
-            suggestions = [line.strip() for line in suggestions_response.split('\n') if line.strip()]
-            suggestions = [s[2:].strip() if s.startswith('1.') or s.startswith('2.') or s.startswith('3.') else s for s in suggestions]
-            
-            result["suggestions"]["improvement_tips"] = suggestions
+    suggestions_response = await make_ai_request(prompt_suggestions, max_tokens=300, temperature=0.7, endpoint="keyword_suggestions")
     
-    return result
+    # Extract suggestions as a list
+    suggestions = [line.strip() for line in suggestions_response.split('\n') if line.strip()]
+    suggestions = [s[2:].strip() if s.startswith('1.') or s.startswith('2.') or s.startswith('3.') else s for s in suggestions]
+    return suggestions
 
 def extract_list_items(text: str, section_name: str) -> List[str]:
     """
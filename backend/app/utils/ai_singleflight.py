@@ -0,0 +1,179 @@
+"""
+Single-flight coalescing of identical in-flight AI requests.
+
+When many users ask for the same completion at once (a class clicking
+"suggest skills" for the same job title), only the first request calls the
+provider; the others await its result. Within a worker this is a table of
+in-flight tasks keyed by the request's cache key.
+
+Across workers, when AI_SINGLEFLIGHT_LOCK_DIR is set, the leader also holds
+an flock on a per-key lock file. A worker that finds the lock taken waits
+for it to be released and then re-reads the shared SQLite response cache
+instead of making its own call.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Coalescing settings from environment variables
+AI_SINGLEFLIGHT_LOCK_DIR = os.getenv("AI_SINGLEFLIGHT_LOCK_DIR", "")  # Empty disables cross-worker locking
+AI_SINGLEFLIGHT_WAIT = float(os.getenv("AI_SINGLEFLIGHT_WAIT", "30"))
+
+# How often a waiting worker checks whether the leader's lock was released
+LOCK_POLL_INTERVAL = 0.05
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time in this worker, and optionally
+    per host through lock files.
+    """
+
+    def __init__(self, lock_dir: str = AI_SINGLEFLIGHT_LOCK_DIR, max_wait: float = AI_SINGLEFLIGHT_WAIT):
+        self.lock_dir = lock_dir if lock_dir and fcntl is not None else None
+        self.max_wait = max_wait
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "coalesced": 0, "cross_worker_waits": 0, "cross_worker_hits": 0}
+
+        if self.lock_dir:
+            try:
+                os.makedirs(self.lock_dir, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"Could not create single-flight lock directory {self.lock_dir}: {str(e)}")
+                self.lock_dir = None
+
+    async def run(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[Any]],
+        recheck: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Any:
+        """
+        Run call() once for all concurrent callers with the same key.
+
+        The shared call runs in its own task, so a caller that disconnects
+        does not cancel it for the others.
+
+        Args:
+            key: Identity of the request, e.g. its AI cache key
+            call: Coroutine function making the upstream request
+            recheck: Optional coroutine function returning a result stored by
+                another worker (or None); enables cross-worker coalescing
+
+        Returns:
+            The result of call(), shared by every caller with the same key
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._lead(key, call, recheck))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+            self._record("leaders")
+        else:
+            self._record("coalesced")
+        return await asyncio.shield(task)
+
+    def after_fork(self) -> None:
+        """Give a freshly forked child an empty in-flight table, its own lock and zeroed counters."""
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {name: 0 for name in self._stats}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return coalescing counters and the number of calls currently in flight."""
+        with self._lock:
+            return {
+                **self._stats,
+                "in_flight": len(self._inflight),
+                "cross_worker": self.lock_dir is not None,
+            }
+
+    def _record(self, counter: str) -> None:
+        with self._lock:
+            self._stats[counter] += 1
+
+    def _finished(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark a failure as retrieved even if every caller has gone away
+        if not task.cancelled():
+            task.exception()
+
+    async def _lead(self, key: str, call: Callable[[], Awaitable[Any]], recheck) -> Any:
+        """Make the call, first deferring to another worker already making it."""
+        if not self.lock_dir or recheck is None:
+            return await call()
+
+        path = os.path.join(self.lock_dir, f"{key}.lock")
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_RDWR, 0o644)
+        except OSError as e:
+            logger.warning(f"Could not open single-flight lock {path}: {str(e)}")
+            return await call()
+
+        try:
+            if not self._try_lock(fd):
+                self._record("cross_worker_waits")
+                deadline = time.monotonic() + self.max_wait
+                while not self._try_lock(fd):
+                    if time.monotonic() >= deadline:
+                        logger.warning("Timed out waiting for another worker's AI request; calling upstream")
+                        return await call()
+                    await asyncio.sleep(LOCK_POLL_INTERVAL)
+                # The other worker has finished and stored its result
+                result = await recheck()
+                if result is not None:
+                    self._record("cross_worker_hits")
+                    return result
+
+            try:
+                return await call()
+            finally:
+                # Removing the file first means a late waiter may lock a fresh
+                # file and repeat the call, which only costs a duplicate request.
+                # The path may already belong to a newer leader's file (if ours
+                # was removed while we waited); leave that one alone.
+                if self._same_file(fd, path):
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _same_file(fd: int, path: str) -> bool:
+        """Check whether `path` still names the file open as `fd`."""
+        try:
+            on_disk = os.stat(path)
+        except OSError:
+            return False
+        held = os.fstat(fd)
+        return (on_disk.st_dev, on_disk.st_ino) == (held.st_dev, held.st_ino)
+
+    @staticmethod
+    def _try_lock(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+
+# Shared coalescing table for this worker process
+single_flight = SingleFlight()
+
+# In-flight tasks belong to the parent's event loop
+os.register_at_fork(after_in_child=single_flight.after_fork)
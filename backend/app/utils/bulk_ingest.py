@@ -0,0 +1,394 @@
+"""
+Bulk resume ingestion: parse many PDF resumes at once and stream results
+as JSON Lines.
+
+Text extraction (pdfminer) is fanned out across worker processes, and the
+spaCy NER step is batched with `nlp.pipe` in the parent process before each
+document is handed to `process_resume_text`. Documents whose header
+heuristics are confident skip NER entirely.
+
+Extraction is held to the same limits as single uploads (see
+parse_sandbox): the page cap always, and when the sandbox is enabled a
+memory cap per worker process, a CPU-time cap and a wall-clock timeout per
+document. A worker that times out or dies is replaced with its pool.
+
+Command-line usage (from the backend directory):
+
+    python -m app.utils.bulk_ingest /path/to/resumes > results.jsonl
+"""
+import argparse
+import io
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import header_heuristics, parse_sandbox, pdf_parser, pdf_text
+from .parse_cache import parse_cache
+from .parse_sandbox import ParseLimitExceeded
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Limits for archive contents
+MAX_FILE_SIZE = 5 * 1024 * 1024  # Same per-file limit as single uploads
+MAX_BULK_FILES = int(os.getenv("BULK_MAX_FILES", "1000"))
+
+# Tuning for the processing pipeline
+BULK_WORKERS = int(os.getenv("BULK_WORKERS", str(os.cpu_count() or 2)))
+BULK_NLP_BATCH_SIZE = int(os.getenv("BULK_NLP_BATCH_SIZE", "16"))
+
+
+def iter_pdfs_from_zip(zip_content: bytes) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (name, content) pairs for each PDF inside a ZIP archive.
+
+    Members that are not PDFs, exceed the per-file size limit or go beyond
+    the file-count limit are skipped with a warning.
+
+    Args:
+        zip_content: Bytes content of the ZIP archive
+    """
+    with zipfile.ZipFile(io.BytesIO(zip_content)) as archive:
+        count = 0
+        for info in archive.infolist():
+            if info.is_dir() or not info.filename.lower().endswith(".pdf"):
+                continue
+            # Skip macOS resource-fork entries
+            if "__MACOSX/" in info.filename:
+                continue
+            if info.file_size > MAX_FILE_SIZE:
+                logger.warning(f"Skipping {info.filename}: larger than {MAX_FILE_SIZE} bytes")
+                continue
+            if count >= MAX_BULK_FILES:
+                logger.warning(f"Bulk file limit of {MAX_BULK_FILES} reached, ignoring remaining files")
+                break
+            count += 1
+            yield info.filename, archive.read(info)
+
+
+def iter_pdfs_from_directory(directory: str) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (name, content) pairs for each PDF in a directory tree.
+
+    Args:
+        directory: Path of the directory to scan recursively
+    """
+    root = Path(directory)
+    for path in sorted(root.rglob("*")):
+        if not path.is_file() or path.suffix.lower() != ".pdf":
+            continue
+        if path.stat().st_size > MAX_FILE_SIZE:
+            logger.warning(f"Skipping {path}: larger than {MAX_FILE_SIZE} bytes")
+            continue
+        yield str(path.relative_to(root)), path.read_bytes()
+
+
+# Result of extracting one document: (name, text, line_styles, error, exceeded limit)
+Extraction = Tuple[str, str, Optional[list], Optional[str], Optional[str]]
+
+
+def _init_extract_worker(sandboxed: bool, pids: Any) -> None:
+    """
+    Prepare an extraction process: report its pid so the pool can be killed,
+    disable page-level parallelism, since documents already run in parallel,
+    and cap its memory when sandboxed.
+    """
+    pids.put(os.getpid())
+    pdf_text.PARALLEL_PAGE_THRESHOLD = 0
+    if sandboxed:
+        parse_sandbox.limit_memory(parse_sandbox.PARSE_MAX_MEMORY_MB)
+
+
+def _extract_worker(name: str, file_content: bytes, sandboxed: bool) -> Extraction:
+    """Extract text and line styles from one PDF in a worker process, within the parse limits."""
+    try:
+        if sandboxed:
+            parse_sandbox.limit_cpu(parse_sandbox.PARSE_MAX_CPU_SECONDS, renewable=True)
+        info = pdf_text.inspect_pdf(file_content)
+        parse_sandbox.check_page_count(info.page_count)
+        extracted = pdf_text.extract_text(file_content, info=info)
+        return name, extracted.text, extracted.line_styles, None, None
+    except ParseLimitExceeded as e:
+        return name, "", None, str(e), e.limit
+    except MemoryError:
+        return name, "", None, f"PDF parsing exceeded the {parse_sandbox.PARSE_MAX_MEMORY_MB}MB memory limit.", "memory"
+    except Exception as e:
+        return name, "", None, str(e), None
+
+
+class _ExtractionPool:
+    """
+    A process pool for document extraction whose workers can be killed.
+
+    Each worker reports its pid from the initializer, so a pool with a
+    stuck worker can be torn down without waiting for that worker.
+    """
+
+    def __init__(self, workers: int, sandboxed: bool):
+        self._pids = multiprocessing.SimpleQueue()
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_extract_worker, initargs=(sandboxed, self._pids)
+        )
+
+    def submit(self, name: str, content: bytes, sandboxed: bool) -> Future:
+        return self.executor.submit(_extract_worker, name, content, sandboxed)
+
+    def shutdown(self) -> None:
+        """Shut down a pool whose workers are idle or already gone."""
+        self.executor.shutdown(cancel_futures=True)
+        self._pids.close()
+
+    def kill(self) -> None:
+        """Kill the worker processes, which shutdown alone would wait for."""
+        pids = set()
+        while not self._pids.empty():
+            pids.add(self._pids.get())
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self._pids.close()
+
+
+def _extract_documents(documents: Iterable[Tuple[str, bytes]], workers: int, sandboxed: bool) -> Iterator[Extraction]:
+    """
+    Extract documents in worker processes, yielding each result as it finishes.
+
+    Documents are read from `documents` only as workers free up, and a
+    document's content is dropped once its result is in, so at most about
+    `workers` documents are held in memory. That also means a document's
+    deadline (PARSE_TIMEOUT_SECONDS, when sandboxed) starts about when a
+    worker picks it up. A document past its deadline is reported as timed
+    out and the pool is replaced, since its worker cannot be stopped on its
+    own; the other documents in flight are queued again. When a worker dies,
+    the documents in flight are retried one at a time, so only a document
+    that kills a worker on its own is reported.
+
+    Args:
+        documents: Iterable of (name, content) pairs
+        workers: Number of extraction processes
+        sandboxed: Whether to apply the sandbox limits
+    """
+    workers = max(1, workers)
+    timeout = parse_sandbox.PARSE_TIMEOUT_SECONDS if sandboxed else 0
+    unread = enumerate(documents)
+    retry: Deque[Tuple[int, str, bytes]] = deque()  # Documents lost with a replaced pool
+    suspects = set()  # Documents in flight when a worker died
+    in_flight: Dict[Future, Tuple[Tuple[int, str, bytes], float]] = {}
+    pool = _ExtractionPool(workers, sandboxed)
+    try:
+        while True:
+            while len(in_flight) < (1 if suspects else workers):
+                if retry:
+                    document = retry.popleft()
+                else:
+                    item = next(unread, None)
+                    if item is None:
+                        break
+                    document = (item[0], *item[1])
+                future = pool.submit(document[1], document[2], sandboxed)
+                in_flight[future] = (document, time.monotonic() + timeout)
+            if not in_flight:
+                break
+
+            wait_timeout = None
+            if timeout:
+                wait_timeout = max(0.0, min(deadline for _, deadline in in_flight.values()) - time.monotonic())
+            done, _ = wait(in_flight, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+
+            crashed = []
+            for future in done:
+                document, _ = in_flight.pop(future)
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    crashed.append(document)
+                    continue
+                suspects.discard(document[0])
+                yield result
+
+            if crashed:
+                lost = crashed + [document for document, _ in in_flight.values()]
+                in_flight.clear()
+                if len(lost) == 1:
+                    suspects.discard(lost[0][0])
+                    yield lost[0][1], "", None, "Parser process exited unexpectedly", None
+                else:
+                    suspects.update(document[0] for document in lost)
+                    retry.extendleft(reversed(lost))
+                # The executor has already terminated the remaining workers
+                pool.shutdown()
+                pool = _ExtractionPool(workers, sandboxed)
+                continue
+
+            now = time.monotonic()
+            expired = [future for future, (_, deadline) in in_flight.items() if timeout and deadline <= now]
+            if expired:
+                for future in expired:
+                    document, _ = in_flight.pop(future)
+                    suspects.discard(document[0])
+                    yield document[1], "", None, f"PDF parsing exceeded the {timeout:g}s time limit.", "timeout"
+                retry.extendleft(reversed([document for document, _ in in_flight.values()]))
+                in_flight.clear()
+                pool.kill()
+                pool = _ExtractionPool(workers, sandboxed)
+    finally:
+        if in_flight:
+            pool.kill()
+        else:
+            pool.shutdown()
+
+
+def _process_batch(batch: List[Tuple[str, str, list]]) -> Iterator[Dict[str, Any]]:
+    """
+    Run batched NER over the extracted texts that need it and build their results.
+
+    Args:
+        batch: List of (name, text, line_styles) tuples with non-empty text
+    """
+    docs: List[Any] = [None] * len(batch)
+    guesses = [header_heuristics.guess_header_fields(text) for _, text, _ in batch]
+
+    # Group documents needing NER by language so each model gets one batched pipe
+    by_language: Dict[str, List[int]] = {}
+    for i, (_, text, _) in enumerate(batch):
+        if pdf_parser.needs_ner(text, guesses=guesses[i]):
+            by_language.setdefault(pdf_parser.detect_language(text), []).append(i)
+
+    for language, indexes in by_language.items():
+        nlp = pdf_parser.get_nlp(language)
+        if nlp is None:
+            continue
+        headers = [pdf_parser.header_text(batch[i][1]) for i in indexes]
+        for i, doc in zip(indexes, nlp.pipe(headers, batch_size=len(headers))):
+            docs[i] = doc
+
+    for (name, text, line_styles), doc, header_guesses in zip(batch, docs, guesses):
+        try:
+            data = pdf_parser.process_resume_text(text, doc=doc, line_styles=line_styles, guesses=header_guesses)
+            yield {"file": name, "status": "ok", "data": data}
+        except Exception as e:
+            logger.error(f"Error processing {name}: {str(e)}")
+            yield {"file": name, "status": "error", "error": str(e)}
+
+
+def ingest_documents(
+    documents: Iterable[Tuple[str, bytes]],
+    workers: int = BULK_WORKERS,
+    batch_size: int = BULK_NLP_BATCH_SIZE,
+    use_cache: bool = True,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Parse many PDF documents, yielding one result record per document as
+    soon as it is ready.
+
+    Args:
+        documents: Iterable of (name, content) pairs
+        workers: Number of processes used for text extraction
+        batch_size: Number of documents per `nlp.pipe` batch
+        use_cache: Whether to consult and populate the parse cache
+
+    Yields:
+        Dictionaries with "file", "status" and either "data" or "error"
+    """
+    cache_version = "-".join([pdf_parser.PARSER_VERSION] + pdf_text.engine_chain())
+    sandboxed = parse_sandbox.PARSE_SANDBOX and parse_sandbox.sandbox_available()
+    cache_keys: Dict[str, str] = {}
+    cached_records: List[Dict[str, Any]] = []  # Cache hits read since the last extraction finished
+    pending: List[Tuple[str, str, list]] = []
+
+    def uncached() -> Iterator[Tuple[str, bytes]]:
+        for name, content in documents:
+            cache_key = parse_cache.make_key(content, cache_version)
+            if use_cache:
+                cached = parse_cache.get(cache_key)
+                if cached is not None:
+                    cached_records.append({"file": name, "status": "ok", "data": cached})
+                    continue
+            cache_keys[name] = cache_key
+            yield name, content
+
+    def flush() -> Iterator[Dict[str, Any]]:
+        for record in _process_batch(pending):
+            if use_cache and record["status"] == "ok":
+                parse_cache.set(cache_keys[record["file"]], record["data"])
+            yield record
+        pending.clear()
+
+    # Documents are read as extraction workers free up, not all up front
+    for name, text, line_styles, error, limit in _extract_documents(uncached(), workers, sandboxed):
+        yield from cached_records
+        cached_records.clear()
+        if sandboxed:
+            parse_sandbox.limit_stats.record_run()
+        if limit:
+            parse_sandbox.limit_stats.record_violation(limit)
+        if error:
+            logger.error(f"Error extracting text from {name}: {error}")
+            yield {"file": name, "status": "error", "error": f"Failed to parse PDF: {error}"}
+            continue
+        if not text.strip():
+            logger.warning(f"No text extracted from {name}")
+            yield {"file": name, "status": "ok", "data": pdf_parser.empty_result()}
+            continue
+
+        pending.append((name, text, line_styles))
+        if len(pending) >= batch_size:
+            yield from flush()
+
+    yield from cached_records
+    if pending:
+        yield from flush()
+
+
+def to_json_lines(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Serialize result records as JSON Lines."""
+    for record in records:
+        yield json.dumps(record) + "\n"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point for ingesting a directory of PDF resumes."""
+    parser = argparse.ArgumentParser(description="Parse a directory of PDF resumes into JSON Lines.")
+    parser.add_argument("directory", help="Directory containing PDF resumes (searched recursively)")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=BULK_WORKERS, help="Extraction processes")
+    parser.add_argument("-b", "--batch-size", type=int, default=BULK_NLP_BATCH_SIZE, help="NER batch size")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the parse cache")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        parser.error(f"Not a directory: {args.directory}")
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        records = ingest_documents(
+            iter_pdfs_from_directory(args.directory),
+            workers=args.workers,
+            batch_size=args.batch_size,
+            use_cache=not args.no_cache,
+        )
+        for line in to_json_lines(records):
+            output.write(line)
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
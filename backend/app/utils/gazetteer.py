@@ -0,0 +1,94 @@
+"""
+Bundled place-name gazetteer used to recognise locations in resume headers
+without an NER model.
+
+All lookups are lowercase. The lists favour places that commonly appear on
+resumes rather than completeness; anything missing is left to the spaCy
+fallback in pdf_parser.
+"""
+from typing import FrozenSet
+
+US_STATES = {
+    "alabama": "al", "alaska": "ak", "arizona": "az", "arkansas": "ar", "california": "ca",
+    "colorado": "co", "connecticut": "ct", "delaware": "de", "florida": "fl", "georgia": "ga",
+    "hawaii": "hi", "idaho": "id", "illinois": "il", "indiana": "in", "iowa": "ia",
+    "kansas": "ks", "kentucky": "ky", "louisiana": "la", "maine": "me", "maryland": "md",
+    "massachusetts": "ma", "michigan": "mi", "minnesota": "mn", "mississippi": "ms",
+    "missouri": "mo", "montana": "mt", "nebraska": "ne", "nevada": "nv", "new hampshire": "nh",
+    "new jersey": "nj", "new mexico": "nm", "new york": "ny", "north carolina": "nc",
+    "north dakota": "nd", "ohio": "oh", "oklahoma": "ok", "oregon": "or", "pennsylvania": "pa",
+    "rhode island": "ri", "south carolina": "sc", "south dakota": "sd", "tennessee": "tn",
+    "texas": "tx", "utah": "ut", "vermont": "vt", "virginia": "va", "washington": "wa",
+    "west virginia": "wv", "wisconsin": "wi", "wyoming": "wy", "district of columbia": "dc",
+    "puerto rico": "pr",
+}
+
+CANADIAN_PROVINCES = {
+    "alberta": "ab", "british columbia": "bc", "manitoba": "mb", "new brunswick": "nb",
+    "newfoundland and labrador": "nl", "nova scotia": "ns", "ontario": "on",
+    "prince edward island": "pe", "quebec": "qc", "saskatchewan": "sk",
+}
+
+COUNTRIES: FrozenSet[str] = frozenset({
+    "argentina", "australia", "austria", "bangladesh", "belgium", "brazil", "bulgaria",
+    "canada", "chile", "china", "colombia", "croatia", "czech republic", "czechia",
+    "denmark", "egypt", "estonia", "ethiopia", "finland", "france", "germany", "ghana",
+    "greece", "hong kong", "hungary", "iceland", "india", "indonesia", "ireland", "israel",
+    "italy", "japan", "jordan", "kenya", "latvia", "lebanon", "lithuania", "luxembourg",
+    "malaysia", "mexico", "morocco", "netherlands", "new zealand", "nigeria", "norway",
+    "pakistan", "peru", "philippines", "poland", "portugal", "qatar", "romania", "russia",
+    "rwanda", "saudi arabia", "serbia", "singapore", "slovakia", "slovenia", "south africa",
+    "south korea", "korea", "spain", "sri lanka", "sweden", "switzerland", "taiwan",
+    "tanzania", "thailand", "tunisia", "turkey", "uganda", "ukraine", "united arab emirates",
+    "uae", "united kingdom", "uk", "england", "scotland", "wales", "united states", "usa",
+    "us", "uruguay", "vietnam",
+})
+
+CITIES: FrozenSet[str] = frozenset({
+    # United States
+    "atlanta", "austin", "baltimore", "boston", "boulder", "charlotte", "chicago",
+    "cincinnati", "cleveland", "columbus", "dallas", "denver", "detroit", "houston",
+    "indianapolis", "jacksonville", "kansas city", "las vegas", "los angeles", "miami",
+    "milwaukee", "minneapolis", "nashville", "new orleans", "new york", "new york city",
+    "oakland", "orlando", "palo alto", "philadelphia", "phoenix", "pittsburgh", "portland",
+    "raleigh", "sacramento", "salt lake city", "san antonio", "san diego", "san francisco",
+    "san jose", "santa clara", "seattle", "st. louis", "tampa", "washington", "mountain view",
+    "sunnyvale", "redmond", "cambridge", "brooklyn", "ann arbor", "madison", "irvine",
+    # Canada
+    "calgary", "edmonton", "montreal", "ottawa", "toronto", "vancouver", "waterloo", "winnipeg",
+    # Europe
+    "amsterdam", "athens", "barcelona", "berlin", "brussels", "bucharest", "budapest",
+    "copenhagen", "dublin", "edinburgh", "frankfurt", "geneva", "hamburg", "helsinki",
+    "kyiv", "lisbon", "london", "lyon", "madrid", "manchester", "milan", "munich", "oslo",
+    "paris", "prague", "rome", "rotterdam", "stockholm", "tallinn", "vienna", "vilnius",
+    "warsaw", "zurich", "krakow", "porto", "belgrade", "sofia",
+    # Asia, Middle East and Africa
+    "abu dhabi", "accra", "ahmedabad", "amman", "bangalore", "bengaluru", "bangkok",
+    "beijing", "cairo", "chennai", "colombo", "delhi", "new delhi", "dhaka", "doha", "dubai",
+    "hanoi", "ho chi minh city", "hyderabad", "islamabad", "istanbul", "jakarta",
+    "johannesburg", "karachi", "kolkata", "kuala lumpur", "lagos", "lahore", "manila",
+    "mumbai", "nairobi", "noida", "gurgaon", "pune", "riyadh", "seoul", "shanghai",
+    "shenzhen", "taipei", "tel aviv", "tokyo", "cape town", "casablanca", "tunis",
+    # Oceania and Latin America
+    "auckland", "brisbane", "melbourne", "perth", "sydney", "wellington", "bogota",
+    "buenos aires", "lima", "mexico city", "montevideo", "rio de janeiro", "santiago",
+    "sao paulo",
+})
+
+# Regions that may follow a city after a comma ("Austin, TX", "Lyon, France")
+REGIONS: FrozenSet[str] = frozenset(
+    set(US_STATES) | set(US_STATES.values())
+    | set(CANADIAN_PROVINCES) | set(CANADIAN_PROVINCES.values())
+    | COUNTRIES
+)
+
+
+def is_region(value: str) -> bool:
+    """Check whether a value is a known state, province or country."""
+    return value.strip(" .").lower() in REGIONS
+
+
+def is_place(value: str) -> bool:
+    """Check whether a value on its own is a known city or country."""
+    value = value.strip(" .").lower()
+    return value in CITIES or value in COUNTRIES
@@ -0,0 +1,204 @@
+"""
+Rule-based name and location extraction from the resume header.
+
+Resumes almost always open with the candidate's name on the first line,
+followed by a contact line holding the location, email and phone. These
+heuristics use line position, capitalization and the bundled gazetteer to
+guess both fields and attach a confidence to each guess, so pdf_parser only
+needs to run spaCy NER when a guess is weak.
+"""
+import re
+from typing import Dict, List, NamedTuple
+
+from . import gazetteer
+from . import parser_patterns as patterns
+
+# Only the first few non-blank lines are considered part of the header
+HEADER_MAX_LINES = 6
+
+# Confidence of a name candidate by its line index; later lines are less likely
+NAME_LINE_CONFIDENCE = [0.95, 0.8, 0.6, 0.45, 0.35, 0.3]
+NAME_MIN_WORDS = 2
+NAME_MAX_WORDS = 4
+
+# Contact lines separate fields with bars, bullets, tabs, runs of spaces or dashes
+SEGMENT_SEPARATOR = re.compile(r"\s*(?:[|•·●▪♦◦\t]|\s{2,}|\s[-–—]\s)\s*")
+
+NAME_WORD = re.compile(r"^(?:[A-Z][a-z]*(?:['\-][A-Z]?[a-z]+)*\.?|[A-Z]{2,}(?:['\-][A-Z]+)*|[A-Z]\.)$")
+NAME_PARTICLES = {"de", "da", "del", "della", "di", "van", "von", "der", "den", "la", "le", "bin", "al", "el"}
+
+# Words that show a line is a job title or document label rather than a name
+NON_NAME_WORDS = {
+    "resume", "résumé", "curriculum", "vitae", "cv", "engineer", "developer", "manager",
+    "scientist", "specialist", "designer", "analyst", "consultant", "director", "intern",
+    "architect", "administrator", "coordinator", "associate", "lead", "senior", "junior",
+    "marketing", "product", "software", "data", "contact", "phone", "email", "address",
+    "portfolio", "linkedin", "github", "university", "college", "inc", "llc", "ltd",
+}
+
+# Words that show a line is a place or region rather than a name ("San Francisco Bay Area")
+PLACE_WORDS = {
+    "area", "bay", "city", "county", "district", "greater", "metro", "metropolitan",
+    "province", "region", "state", "valley",
+}
+
+# "City, Region" optionally followed by a postal code
+CITY_REGION_PATTERN = re.compile(
+    r"^(?P<city>[A-Z][A-Za-z.'\-]*(?:\s+[A-Za-z.'\-]+){0,3}),\s*"
+    r"(?P<region>[A-Za-z][A-Za-z.]*(?:\s+[A-Za-z.]+){0,3})"
+    r"(?:\s+[A-Z0-9]{3,6}(?:[\s\-][A-Z0-9]{3,4})?)?$"
+)
+
+# Confidence levels for location guesses
+LOCATION_KNOWN_REGION = 0.9   # "Austin, TX" with the region in the gazetteer
+LOCATION_KNOWN_PLACE = 0.8    # A bare known city or country, or a known city with an unknown region
+LOCATION_UNKNOWN_REGION = 0.3  # Looks like "City, Region" but neither part is known
+LOCATION_NOT_FOUND = 0.9      # No location, and every header segment is a name, title or contact detail
+LOCATION_UNEXPLAINED = 0.3    # No location found, but some header segment could still be one
+
+
+class Guess(NamedTuple):
+    """A heuristic field value with a confidence between 0 and 1."""
+    value: str
+    confidence: float
+
+
+def header_lines(text: str) -> List[str]:
+    """Return the first non-blank lines of the resume, before any section heading."""
+    lines = []
+    for raw_line in text.split("\n"):
+        line = raw_line.strip()
+        if not line:
+            continue
+        if lines and patterns.HEADING_PATTERN.match(line):
+            break
+        lines.append(line)
+        if len(lines) >= HEADER_MAX_LINES:
+            break
+    return lines
+
+
+def split_segments(line: str) -> List[str]:
+    """Split a header line into its separated fields."""
+    return [segment for segment in SEGMENT_SEPARATOR.split(line) if segment]
+
+
+def _is_contact_segment(segment: str) -> bool:
+    """Check whether a segment is an email, phone number or URL."""
+    return bool(
+        "@" in segment
+        or patterns.PHONE_PATTERN.search(segment)
+        or patterns.WEBSITE_PATTERN.search(segment)
+        or patterns.LINKEDIN_PATTERN.search(segment)
+    )
+
+
+def _is_title_segment(segment: str) -> bool:
+    """Check whether a segment is a job title or document label."""
+    return any(word.lower().strip(".,") in NON_NAME_WORDS for word in segment.split())
+
+
+def _names_place(words: List[str]) -> bool:
+    """
+    Check whether words include a place: a place or region word, or a known
+    multi-word place such as "San Francisco". Single known words are allowed,
+    since many first names are also places ("Jordan", "Austin").
+    """
+    lowered = [word.lower().strip(".,") for word in words]
+    if any(word in PLACE_WORDS for word in lowered):
+        return True
+    for size in range(2, len(lowered) + 1):
+        for start in range(len(lowered) - size + 1):
+            span = " ".join(lowered[start:start + size])
+            if gazetteer.is_place(span) or gazetteer.is_region(span):
+                return True
+    return False
+
+
+def _looks_like_name(candidate: str) -> bool:
+    """Check capitalization and vocabulary of a possible person name."""
+    words = candidate.split()
+    if not NAME_MIN_WORDS <= len(words) <= NAME_MAX_WORDS:
+        return False
+    if any(char.isdigit() for char in candidate) or _is_contact_segment(candidate):
+        return False
+    if patterns.HEADING_PATTERN.match(candidate) or gazetteer.is_place(candidate):
+        return False
+    if _is_title_segment(candidate) or _names_place(words):
+        return False
+    for i, word in enumerate(words):
+        if 0 < i < len(words) - 1 and word.lower() in NAME_PARTICLES:
+            continue
+        if not NAME_WORD.match(word.rstrip(",")):
+            return False
+    return True
+
+
+def guess_name(lines: List[str]) -> Guess:
+    """
+    Guess the candidate's name from the header lines.
+
+    The first segment of each line is tried in order; the confidence drops
+    the further down the header the name is found.
+    """
+    for i, line in enumerate(lines):
+        segments = split_segments(line)
+        if not segments:
+            continue
+        candidate = segments[0].strip(" ,")
+        if _looks_like_name(candidate):
+            return Guess(candidate, NAME_LINE_CONFIDENCE[min(i, len(NAME_LINE_CONFIDENCE) - 1)])
+    return Guess("", 0.0)
+
+
+def guess_location(lines: List[str], name: str = "") -> Guess:
+    """
+    Guess the candidate's location from the header lines.
+
+    "City, Region" segments whose region is a known state, province or
+    country, or whose city is a known city, are trusted; the same shape with
+    neither part known is returned with low confidence so the caller can
+    double-check it. Finding no location is only trusted when every header
+    segment is accounted for as the name, a title or a contact detail.
+    """
+    uncertain = None
+    unexplained = False
+    for line in lines:
+        for segment in split_segments(line):
+            segment = segment.strip(" ,")
+            if not segment or _is_contact_segment(segment):
+                continue
+            match = CITY_REGION_PATTERN.match(segment)
+            if match:
+                location = f"{match.group('city')}, {match.group('region')}"
+                if gazetteer.is_region(match.group("region")):
+                    return Guess(location, LOCATION_KNOWN_REGION)
+                if gazetteer.is_place(match.group("city")):
+                    return Guess(location, LOCATION_KNOWN_PLACE)
+                if uncertain is None:
+                    uncertain = Guess(location, LOCATION_UNKNOWN_REGION)
+            elif gazetteer.is_place(segment):
+                return Guess(segment, LOCATION_KNOWN_PLACE)
+            elif segment != name and not _is_title_segment(segment):
+                unexplained = True
+    if uncertain is not None:
+        return uncertain
+    return Guess("", LOCATION_UNEXPLAINED if unexplained else LOCATION_NOT_FOUND)
+
+
+def guess_header_fields(text: str) -> Dict[str, Guess]:
+    """
+    Guess the name and location from the resume text.
+
+    Args:
+        text: Full text of the resume
+
+    Returns:
+        Dictionary with "name" and "location" guesses
+    """
+    lines = header_lines(text)
+    name = guess_name(lines)
+    return {
+        "name": name,
+        "location": guess_location(lines, name.value),
+    }
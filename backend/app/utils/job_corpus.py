@@ -0,0 +1,177 @@
+"""
+Bundled background corpus of job postings used to weight job description
+keywords without a model.
+
+The postings are short, generic and spread across occupations, so words
+that appear in almost every posting ("team", "experience", "fast-paced")
+get a low inverse document frequency, and words specific to one role get a
+high one. Adding postings sharpens the weights; keep them generic rather
+than copying real listings.
+"""
+from typing import Tuple
+
+BACKGROUND_POSTINGS: Tuple[str, ...] = (
+    # Software and data
+    """Software Engineer. We are looking for a software engineer to join our product team.
+    You will design, build and maintain web applications and services, write clean and tested code,
+    take part in code reviews and work closely with product managers and designers.
+    Requirements: 3+ years of experience in software development, a degree in computer science or a
+    related field, strong problem-solving skills and good communication skills.""",
+
+    """Senior Backend Engineer. Join a fast-paced engineering team building the APIs and services
+    behind our platform. You will own services end to end, improve reliability and performance,
+    mentor other engineers and contribute to architecture decisions. You have 5+ years of experience
+    building backend systems, experience with relational databases and cloud infrastructure,
+    and you are comfortable working in an agile environment.""",
+
+    """Frontend Developer. We need a frontend developer to build responsive, accessible user
+    interfaces. You will turn designs into components, work with backend developers on APIs and
+    improve page performance. Experience with modern JavaScript frameworks, HTML and CSS is required.
+    Attention to detail and a good eye for design are a plus.""",
+
+    """Data Analyst. You will collect, clean and analyze data to help the business make decisions.
+    Build dashboards and reports, define metrics with stakeholders and present findings to leadership.
+    Requirements: bachelor's degree in a quantitative field, 2+ years of experience with SQL and
+    spreadsheets, strong analytical skills and the ability to explain results to a non-technical
+    audience.""",
+
+    """Data Scientist. Work with large datasets to build predictive models and run experiments.
+    You will partner with product and engineering teams, design A/B tests, and communicate insights
+    to stakeholders. A master's degree or PhD in statistics, computer science or a related field is
+    preferred, along with experience in machine learning and statistical analysis.""",
+
+    """DevOps Engineer. Help us automate infrastructure, deployment pipelines and monitoring.
+    You will manage cloud environments, improve system reliability, respond to incidents and work
+    with developers to ship software safely. Experience with containers, infrastructure as code and
+    continuous integration is required. On-call rotation is shared across the team.""",
+
+    """QA Engineer. Ensure the quality of our releases by writing test plans, automating regression
+    tests and reporting defects. You will work with developers and product owners throughout the
+    development cycle. Experience with test automation tools and a methodical, detail-oriented
+    approach are required.""",
+
+    """Mobile Developer. Build and maintain our iOS and Android applications used by thousands of
+    customers. Collaborate with designers and backend engineers, publish releases to the app stores
+    and monitor crash reports. 3+ years of mobile development experience required.""",
+
+    """IT Support Specialist. Provide technical support to employees, set up laptops and accounts,
+    troubleshoot hardware, software and network issues and maintain documentation. Excellent
+    customer service, patience and the ability to prioritize multiple requests are essential.
+    An associate or bachelor's degree or equivalent experience is preferred.""",
+
+    """Machine Learning Engineer. Design, train and deploy machine learning models to production.
+    You will build data pipelines, evaluate model performance and work with researchers and software
+    engineers. Experience with deep learning frameworks and cloud platforms is a plus.""",
+
+    # Product, design and project work
+    """Product Manager. Own the roadmap for a product area. Gather customer feedback, define
+    requirements, prioritize the backlog and work with engineering and design to deliver features.
+    You have 4+ years of product management experience, strong communication and stakeholder
+    management skills, and you make decisions based on data.""",
+
+    """UX Designer. Create user flows, wireframes and prototypes, run user research and usability
+    tests, and work closely with product managers and engineers. A portfolio showing your design
+    process is required. Experience with design tools and a collaborative mindset are essential.""",
+
+    """Project Manager. Plan and coordinate projects from kickoff to delivery, manage timelines,
+    budgets and risks, and keep stakeholders informed. You will run meetings, track progress and
+    remove blockers for the team. PMP certification and experience with agile methodologies
+    are a plus. Strong organizational skills required.""",
+
+    """Graphic Designer. Produce visual assets for marketing campaigns, social media, print and
+    the website. Work with the marketing team to develop concepts and maintain brand consistency.
+    Proficiency in design software, creativity and the ability to meet deadlines are required.""",
+
+    """Technical Writer. Write and maintain user guides, API documentation and release notes.
+    Work with engineers and product managers to understand features and explain them clearly.
+    Excellent writing skills and attention to detail required; a technical background is a plus.""",
+
+    # Business, sales and marketing
+    """Marketing Manager. Develop and execute marketing campaigns across digital channels,
+    manage the marketing budget and measure campaign performance. Work with sales and product teams
+    to launch new products. 5+ years of marketing experience, strong analytical and communication
+    skills, and a bachelor's degree in marketing or business are required.""",
+
+    """Sales Representative. Generate new business by prospecting, qualifying leads and closing deals.
+    Build lasting relationships with customers, meet monthly targets and keep the CRM up to date.
+    Excellent negotiation and interpersonal skills required. Previous sales experience preferred.""",
+
+    """Account Manager. Manage a portfolio of client accounts, understand their needs and grow
+    revenue through renewals and upsells. Act as the main point of contact and coordinate with
+    internal teams to resolve issues. Customer-focused, organized and self-motivated.""",
+
+    """Content Marketing Specialist. Plan and write blog posts, newsletters and social media content.
+    Optimize content for search, track engagement and work with designers on visuals. Strong writing
+    skills, creativity and 2+ years of content experience required.""",
+
+    """Business Analyst. Gather and document business requirements, map processes and translate
+    needs into specifications for the development team. Facilitate workshops with stakeholders and
+    support user acceptance testing. Strong analytical thinking and communication skills required.""",
+
+    """Customer Success Manager. Onboard new customers, drive product adoption and reduce churn.
+    Monitor account health, run regular reviews and gather feedback for the product team.
+    Empathy, problem-solving skills and clear communication are essential.""",
+
+    """Recruiter. Manage the full recruiting cycle: write job descriptions, source candidates,
+    screen applicants, schedule interviews and extend offers. Partner with hiring managers and
+    provide a great candidate experience. 2+ years of recruiting experience required.""",
+
+    # Finance, operations and administration
+    """Financial Analyst. Prepare financial models, budgets and forecasts, analyze variances and
+    support month-end reporting. Work with department heads on planning and present results to
+    management. Bachelor's degree in finance or accounting and advanced spreadsheet skills required.""",
+
+    """Accountant. Maintain the general ledger, prepare journal entries, reconcile accounts and
+    support audits and tax filings. Ensure accurate and timely financial records. A degree in
+    accounting and attention to detail are required; CPA certification is a plus.""",
+
+    """Operations Manager. Oversee daily operations, improve processes and manage a team of
+    coordinators. Track performance metrics, manage vendors and ensure compliance with policies.
+    Leadership, problem solving and 5+ years of operations experience required.""",
+
+    """Office Administrator. Manage the office, greet visitors, order supplies, coordinate travel and
+    support the team with scheduling. Strong organizational skills, professionalism and the ability
+    to handle multiple tasks in a fast-paced environment are required.""",
+
+    """Human Resources Generalist. Support employees and managers with onboarding, benefits,
+    policies and employee relations. Maintain HR records and help with performance reviews and
+    training programs. Knowledge of employment law, discretion and strong interpersonal skills.""",
+
+    """Supply Chain Analyst. Analyze inventory levels, demand forecasts and supplier performance to
+    keep products in stock at the lowest cost. Build reports, identify savings and work with
+    purchasing and logistics teams. Experience with ERP systems and spreadsheets required.""",
+
+    # Other occupations
+    """Registered Nurse. Provide patient care, administer medications, monitor patients and keep
+    accurate records. Work with physicians and the care team to plan treatment and educate patients
+    and families. Valid nursing license and BLS certification required; 1+ year of experience
+    preferred.""",
+
+    """Teacher. Plan and deliver engaging lessons, assess student progress and communicate with
+    parents. Create a positive classroom environment and collaborate with other teachers.
+    A bachelor's degree in education and a teaching certification are required.""",
+
+    """Customer Service Representative. Answer customer questions by phone, email and chat,
+    resolve complaints and process orders and returns. Document interactions and escalate issues
+    when needed. Patience, a positive attitude and clear communication are required.""",
+
+    """Warehouse Associate. Receive, pick, pack and ship orders accurately, operate equipment safely
+    and keep the warehouse clean and organized. Able to lift up to 50 pounds and work flexible
+    shifts. No previous experience required; training is provided.""",
+
+    """Electrical Engineer. Design and test electrical systems and components, prepare technical
+    drawings and specifications, and support manufacturing. Bachelor's degree in electrical
+    engineering and 3+ years of experience required. Professional engineer license is a plus.""",
+
+    """Research Scientist. Design and run experiments, analyze results and publish findings.
+    Write grant proposals, present at conferences and mentor junior researchers. PhD in a relevant
+    field and a strong publication record required.""",
+
+    """Store Manager. Lead the store team, hire and train staff, manage inventory and deliver sales
+    targets while ensuring excellent customer service. 3+ years of retail management experience,
+    leadership and decision making skills required.""",
+
+    """Paralegal. Assist attorneys with legal research, draft documents, organize case files and
+    manage deadlines. Strong writing skills, discretion and attention to detail required.
+    A paralegal certificate or related degree is preferred.""",
+)
@@ -0,0 +1,287 @@
+"""
+Local, deterministic keyword extraction from job descriptions.
+
+Keywords are found without a model, in a few milliseconds:
+
+- Hard and soft skills are matched against the shared skill vocabulary
+  (see skill_taxonomy).
+- Other candidate terms are noun-phrase chunks: runs of words between
+  punctuation and stopwords, such as "payment systems" in "build payment
+  systems for merchants".
+- Candidates are ranked by TF-IDF. Inverse document frequencies come from
+  a bundled background corpus of job postings (see job_corpus), so
+  boilerplate that every posting shares ranks below role-specific terms.
+  Vocabulary skills get an extra boost, and single lowercase words count
+  for less than names and multi-word terms.
+
+The experience level comes from seniority words in the title and from
+required years of experience.
+"""
+import logging
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import parser_patterns as patterns
+from . import skill_taxonomy
+from .job_corpus import BACKGROUND_POSTINGS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Number of keywords returned, as in the AI extraction prompt
+DEFAULT_KEYWORD_LIMIT = 15
+
+# Longest noun-phrase chunk kept, in words; longer runs keep their last words (the head noun)
+MAX_PHRASE_WORDS = 3
+
+# Score multiplier for terms in the skill vocabulary
+SKILL_BOOST = 2.0
+
+# Score multiplier for single lowercase words, which are more often verbs or
+# filler than names of tools ("Kafka", "PCI") or multi-word terms
+COMMON_WORD_WEIGHT = 0.5
+
+# Function words, common job-posting verbs and filler that end a noun-phrase chunk
+STOPWORDS = frozenset({
+    "a", "about", "above", "across", "after", "all", "also", "an", "and", "any", "are", "as", "at",
+    "be", "been", "being", "both", "but", "by", "can", "could", "do", "does", "each", "either",
+    "etc", "every", "for", "from", "had", "has", "have", "he", "her", "here", "his", "how", "i",
+    "if", "in", "into", "is", "it", "its", "just", "least", "less", "like", "may", "me", "more",
+    "most", "much", "must", "my", "no", "nor", "not", "of", "on", "one", "or", "other", "our",
+    "ours", "out", "over", "own", "per", "plus", "same", "she", "should", "so", "some", "such",
+    "than", "that", "the", "their", "them", "then", "there", "these", "they", "this", "those",
+    "through", "to", "too", "under", "up", "upon", "us", "very", "via", "was", "we", "well",
+    "were", "what", "when", "where", "which", "while", "who", "whom", "why", "will", "with",
+    "within", "without", "would", "you", "your", "yours",
+    # Verbs and filler common in postings
+    "ability", "able", "achieve", "apply", "assist", "based", "bring", "build", "building",
+    "closely", "collaborate", "contribute", "create", "day", "deliver", "develop", "developing",
+    "drive", "ensure", "excellent", "experience", "experienced", "familiarity", "good", "great",
+    "help", "ideal", "ideally", "including", "join", "keep", "know", "knowledge", "looking",
+    "maintain", "make", "manage", "need", "new", "nice", "own", "preferred", "proficiency",
+    "proficient", "proven", "related", "required", "requirement", "requirements", "responsible",
+    "role", "similar", "skill", "skills", "solid", "strong", "support", "take", "understanding",
+    "use", "using", "want", "work", "working", "year", "years",
+})
+
+# Words in a posting: letters first, keeping "C++", "C#", "Node.js", "CI/CD" and "e-commerce" whole
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9]*(?:[+#]+|(?:[./'-][A-Za-z0-9]+)+)?")
+
+# Punctuation that ends a chunk; a period only when it ends a sentence
+CLAUSE_BREAK = re.compile(r"[,;:!?()\[\]{}\"|•·*\n]|\.(?=\s|$)|\s[-–—]\s")
+
+# Seniority words, checked in the title first and in the whole posting last
+SENIOR_PATTERN = re.compile(r"\b(?:senior|sr\.?|lead|principal|staff|head of|director)\b", re.IGNORECASE)
+MID_PATTERN = re.compile(r"\b(?:mid[- ]?level|intermediate|mid[- ]senior)\b", re.IGNORECASE)
+JUNIOR_PATTERN = re.compile(r"\b(?:junior|jr\.?|entry[- ]level|graduate|intern|internship|trainee)\b", re.IGNORECASE)
+
+# Required years: "5+ years", "3-5 years", "2 to 4 years", "minimum 3 years"
+YEARS_PATTERN = re.compile(r"(?<!\d)(\d{1,2})\s*\+?\s*(?:(?:-|–|to)\s*\d{1,2}\s*\+?\s*)?years?\b", re.IGNORECASE)
+
+# Years of experience at which a posting counts as mid-level and senior
+MID_LEVEL_YEARS = 2
+SENIOR_YEARS = 5
+
+# Sentences mentioning a degree, used for the education requirements
+DEGREE_PATTERN = re.compile(
+    patterns.DEGREE_TYPE + r"|\bdegree\b|\bdiploma\b|\bcertification\b", re.IGNORECASE
+)
+SENTENCE_PATTERN = re.compile(r"[^.\n!?]+(?:\.(?!\s)[^.\n!?]*)*")
+MAX_EDUCATION_CHARS = 200
+
+
+def normalize_word(word: str) -> str:
+    """Return the comparison form of a word: lowercased, with a plural "s" removed."""
+    word = word.lower()
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def chunk_phrases(text: str) -> List[str]:
+    """
+    Split text into candidate noun phrases.
+
+    A chunk is a run of words not interrupted by punctuation, a stopword or a
+    number. Runs longer than MAX_PHRASE_WORDS keep their last words, since
+    English noun phrases end in their head noun.
+
+    Args:
+        text: Job description or other free text
+
+    Returns:
+        Chunks in order of appearance, as written
+    """
+    phrases = []
+    for clause in CLAUSE_BREAK.split(text):
+        run: List[str] = []
+        position = 0
+        for match in WORD_PATTERN.finditer(clause):
+            gap = clause[position:match.start()]
+            position = match.end()
+            word = match.group()
+            if word.lower() in STOPWORDS or any(char.isdigit() for char in gap) or len(word) == 1:
+                if run:
+                    phrases.append(" ".join(run[-MAX_PHRASE_WORDS:]))
+                run = []
+                continue
+            run.append(word)
+        if run:
+            phrases.append(" ".join(run[-MAX_PHRASE_WORDS:]))
+    return phrases
+
+
+def _phrase_key(phrase: str) -> str:
+    return " ".join(normalize_word(word) for word in phrase.split())
+
+
+def _document_frequencies(documents) -> Tuple[Counter, int]:
+    """Count the background documents each normalized word appears in."""
+    frequencies: Counter = Counter()
+    for document in documents:
+        frequencies.update({normalize_word(word) for word in WORD_PATTERN.findall(document)})
+    return frequencies, len(documents)
+
+
+# Word document frequencies of the bundled corpus, computed once at import
+DOCUMENT_FREQUENCIES, DOCUMENT_COUNT = _document_frequencies(BACKGROUND_POSTINGS)
+
+
+def idf(word: str) -> float:
+    """Return the smoothed inverse document frequency of a normalized word in the background corpus."""
+    return math.log((1 + DOCUMENT_COUNT) / (1 + DOCUMENT_FREQUENCIES.get(word, 0))) + 1
+
+
+def phrase_idf(key: str) -> float:
+    """Weight of a phrase: the mean inverse document frequency of its words."""
+    words = key.split()
+    return sum(idf(word) for word in words) / len(words)
+
+
+def rank_keywords(text: str, skills: List[str], limit: int = DEFAULT_KEYWORD_LIMIT) -> List[str]:
+    """
+    Rank the terms of a posting by TF-IDF against the background corpus.
+
+    Args:
+        text: Job description
+        skills: Vocabulary skills found in the text, boosted and listed by canonical name
+        limit: Maximum number of keywords
+
+    Returns:
+        Keywords, most important first
+    """
+    # Chunks that spell a found skill differently ("JS", "detail-oriented") count as that skill
+    skill_keys = {_phrase_key(skill_taxonomy.skill_key(skill)) for skill in skills}
+
+    counts: Counter = Counter()
+    surface: Dict[str, str] = {}
+    for phrase in chunk_phrases(text):
+        key = _phrase_key(phrase)
+        canonical = _phrase_key(skill_taxonomy.skill_key(phrase))
+        if canonical in skill_keys:
+            key = canonical
+        counts[key] += 1
+        surface.setdefault(key, phrase)
+
+    scores: Dict[str, float] = {}
+    for key, count in counts.items():
+        weight = COMMON_WORD_WEIGHT if " " not in key and surface[key].islower() else 1.0
+        scores[key] = count * phrase_idf(key) * weight
+
+    for skill in skills:
+        key = _phrase_key(skill_taxonomy.skill_key(skill))
+        mentions = max(counts.get(key, 0), 1)
+        scores[key] = mentions * phrase_idf(key) * SKILL_BOOST
+        surface[key] = skill
+
+    # Ties go to the term mentioned first
+    order = {key: position for position, key in enumerate(surface)}
+
+    keywords: List[str] = []
+    chosen: List[str] = []
+    for key in sorted(scores, key=lambda key: (-scores[key], order[key])):
+        # Skip terms that repeat part of a keyword already chosen, such as "python" after "python developer"
+        padded = f" {key} "
+        if any(f" {other} " in padded or padded in f" {other} " for other in chosen):
+            continue
+        chosen.append(key)
+        keywords.append(surface[key])
+        if len(keywords) >= limit:
+            break
+    return keywords
+
+
+def experience_level(text: str) -> str:
+    """
+    Estimate the seniority a posting asks for.
+
+    Seniority words in the title (the first line) decide first, then the
+    smallest number of required years, then seniority words anywhere.
+
+    Args:
+        text: Job description
+
+    Returns:
+        "junior", "mid-level" or "senior", or "" if the posting gives no hint
+    """
+    title = text.strip().split("\n", 1)[0]
+    level = _level_from_words(title)
+    if level:
+        return level
+
+    years = [int(match.group(1)) for match in YEARS_PATTERN.finditer(text)]
+    years = [value for value in years if value <= 30]
+    if years:
+        required = min(years)
+        if required >= SENIOR_YEARS:
+            return "senior"
+        if required >= MID_LEVEL_YEARS:
+            return "mid-level"
+        return "junior"
+
+    return _level_from_words(text)
+
+
+def _level_from_words(text: str) -> str:
+    if SENIOR_PATTERN.search(text):
+        return "senior"
+    if MID_PATTERN.search(text):
+        return "mid-level"
+    if JUNIOR_PATTERN.search(text):
+        return "junior"
+    return ""
+
+
+def education_requirements(text: str) -> str:
+    """Return the first sentence of a posting that mentions a degree or certification, or ""."""
+    for match in SENTENCE_PATTERN.finditer(text):
+        sentence = " ".join(match.group().split()).lstrip("-*•· ")
+        if DEGREE_PATTERN.search(sentence):
+            return sentence[:MAX_EDUCATION_CHARS]
+    return ""
+
+
+def extract_job_keywords(job_description: str, limit: Optional[int] = DEFAULT_KEYWORD_LIMIT) -> Dict[str, Any]:
+    """
+    Extract keywords, skills, education and experience level from a job description.
+
+    Args:
+        job_description: The job posting text
+        limit: Maximum number of keywords
+
+    Returns:
+        Dictionary with keywords, hard_skills, soft_skills,
+        education_requirements and experience_level, in the same shape as
+        the AI keyword analysis
+    """
+    hard_skills = skill_taxonomy.find_skills(job_description)
+    soft_skills = skill_taxonomy.find_soft_skills(job_description)
+    return {
+        "keywords": rank_keywords(job_description, hard_skills + soft_skills, limit or DEFAULT_KEYWORD_LIMIT),
+        "hard_skills": hard_skills,
+        "soft_skills": soft_skills,
+        "education_requirements": education_requirements(job_description),
+        "experience_level": experience_level(job_description),
+    }
@@ -0,0 +1,192 @@
+"""
+Local resume-to-job match scoring.
+
+The posting and each resume section become TF-IDF vectors over a shared
+vocabulary of terms: vocabulary skills (see skill_taxonomy), compared by
+canonical key so "JS" matches "JavaScript", and the remaining non-stopword
+words. Term weights are sublinear term frequency times the inverse
+document frequency from the bundled job posting corpus (see
+keyword_extractor), with skills boosted.
+
+All vectors of a request are built as one NumPy matrix from (row, column,
+count) triplets over the request's own vocabulary, so scoring is a few
+vectorized operations: row normalization, a matrix-vector product for the
+per-section cosine similarities and element-wise products for the terms
+that contribute to or are missing from the match.
+"""
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from . import keyword_extractor, skill_taxonomy
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Resume sections scored separately, in response order
+SECTION_NAMES = ("summary", "work_experience", "projects", "education", "skills")
+
+# Number of contributing and missing terms returned
+DEFAULT_TOP_TERMS = 10
+
+# Prefix that keeps skill terms apart from plain words in the vocabulary
+SKILL_PREFIX = "skill:"
+
+
+def section_texts(resume_content: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Collect the text of each resume section.
+
+    Args:
+        resume_content: The resume content as a dictionary (see schemas.ResumeContent)
+
+    Returns:
+        Dictionary mapping section names to their text, skipping empty sections
+    """
+    def join(*parts: Any) -> str:
+        return "\n".join(part for part in parts if isinstance(part, str) and part.strip())
+
+    texts = {
+        "summary": join(resume_content.get("summary")),
+        "work_experience": join(*(
+            join(job.get("title"), *(job.get("responsibilities") or []))
+            for job in resume_content.get("work_experience") or [] if isinstance(job, dict)
+        )),
+        "projects": join(*(
+            join(project.get("name"), project.get("description"))
+            for project in resume_content.get("projects") or [] if isinstance(project, dict)
+        )),
+        "education": join(*(
+            join(entry.get("degree"), entry.get("details"))
+            for entry in resume_content.get("education") or [] if isinstance(entry, dict)
+        )),
+        "skills": join(*(resume_content.get("skills") or [])),
+    }
+    return {name: texts[name] for name in SECTION_NAMES if texts[name]}
+
+
+def extract_terms(text: str) -> Tuple[Counter, Dict[str, str]]:
+    """
+    Count the terms of a text.
+
+    Skills found in the text count once each, under their canonical key.
+    Words that are part of a found skill, as named or as written ("k8s" for
+    Kubernetes), are not counted again as words.
+
+    Args:
+        text: Posting or resume section text
+
+    Returns:
+        Tuple of (term counts, display label by term)
+    """
+    counts: Counter = Counter()
+    labels: Dict[str, str] = {}
+    covered = set()
+    for skill, mentions in skill_taxonomy.skill_mentions(text).items():
+        key = skill_taxonomy.skill_key(skill)
+        term = SKILL_PREFIX + key
+        counts[term] = 1
+        labels[term] = skill
+        for phrase in [key] + mentions:
+            covered.update(
+                keyword_extractor.normalize_word(word) for word in keyword_extractor.WORD_PATTERN.findall(phrase)
+            )
+
+    for word in keyword_extractor.WORD_PATTERN.findall(text):
+        lowered = word.lower()
+        if len(word) == 1 or lowered in keyword_extractor.STOPWORDS:
+            continue
+        term = keyword_extractor.normalize_word(word)
+        if term in covered:
+            continue
+        counts[term] += 1
+        labels.setdefault(term, lowered)
+    return counts, labels
+
+
+def _term_weight(term: str) -> float:
+    """Inverse document frequency of a term, boosted for skills."""
+    if term.startswith(SKILL_PREFIX):
+        key = " ".join(keyword_extractor.normalize_word(word) for word in term[len(SKILL_PREFIX):].split())
+        return keyword_extractor.phrase_idf(key) * keyword_extractor.SKILL_BOOST
+    return keyword_extractor.idf(term)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length, leaving all-zero rows as they are."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def score_match(resume_content: Dict[str, Any], job_description: str, top_terms: int = DEFAULT_TOP_TERMS) -> Dict[str, Any]:
+    """
+    Score how well a resume matches a job posting.
+
+    Args:
+        resume_content: The resume content as a dictionary
+        job_description: The job posting text
+        top_terms: Number of contributing and missing terms to return
+
+    Returns:
+        Dictionary with the overall "score" and per-section "sections"
+        scores (cosine similarity as a percentage), "top_terms" that
+        contribute most to the match and "missing_terms" weighted highest
+        in the posting but absent from the resume
+    """
+    sections = section_texts(resume_content)
+    documents = [job_description] + list(sections.values())
+
+    # Assemble the term count matrix: row 0 is the posting, then one row per section
+    vocabulary: Dict[str, int] = {}
+    labels: Dict[str, str] = {}
+    rows: List[int] = []
+    columns: List[int] = []
+    values: List[int] = []
+    for row, text in enumerate(documents):
+        counts, names = extract_terms(text)
+        for term, count in counts.items():
+            rows.append(row)
+            columns.append(vocabulary.setdefault(term, len(vocabulary)))
+            values.append(count)
+        for term, name in names.items():
+            labels.setdefault(term, name)
+
+    result = {
+        "score": 0.0,
+        "sections": {name: 0.0 for name in sections},
+        "top_terms": [],
+        "missing_terms": [],
+    }
+    if not vocabulary:
+        return result
+
+    terms = list(vocabulary)
+    counts_matrix = np.zeros((len(documents), len(terms)))
+    counts_matrix[rows, columns] = values
+
+    # The whole resume is the sum of its sections
+    counts_matrix = np.vstack([counts_matrix, counts_matrix[1:].sum(axis=0)])
+
+    weights = np.array([_term_weight(term) for term in terms])
+    tf = np.log1p(counts_matrix)
+    vectors = _normalize_rows(tf * weights)
+
+    posting = vectors[0]
+    resume = vectors[-1]
+    similarities = vectors[1:] @ posting
+
+    result["score"] = round(float(similarities[-1]) * 100, 1)
+    result["sections"] = {
+        name: round(float(similarity) * 100, 1) for name, similarity in zip(sections, similarities[:-1])
+    }
+
+    contributions = resume * posting
+    top = np.argsort(-contributions, kind="stable")[:top_terms]
+    result["top_terms"] = [labels[terms[i]] for i in top if contributions[i] > 0]
+
+    missing = np.where(resume == 0, posting, 0.0)
+    top_missing = np.argsort(-missing, kind="stable")[:top_terms]
+    result["missing_terms"] = [labels[terms[i]] for i in top_missing if missing[i] > 0]
+    return result
@@ -0,0 +1,252 @@
+"""
+Language detection and per-language spaCy model management.
+
+Resume text is matched against small bundled stopword lists to guess its
+language, and NER is routed to the spaCy model installed for that language.
+Models are loaded lazily and kept in an LRU registry bounded by a memory
+budget, so supporting more languages does not mean holding every model in
+every worker.
+"""
+import gc
+import logging
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Any, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_LANGUAGE = "en"
+
+# spaCy model per language; override with NLP_MODELS="en:en_core_web_sm,de:de_core_news_sm"
+DEFAULT_MODELS = {
+    "en": "en_core_web_sm",
+    "es": "es_core_news_sm",
+    "fr": "fr_core_news_sm",
+    "de": "de_core_news_sm",
+    "pt": "pt_core_news_sm",
+    "it": "it_core_news_sm",
+    "nl": "nl_core_news_sm",
+}
+
+# Memory budget for loaded models in this worker process
+NLP_MODEL_MEMORY_MB = int(os.getenv("NLP_MODEL_MEMORY_MB", "256"))
+
+# Assumed size of a model when its resident memory cannot be measured
+DEFAULT_MODEL_SIZE_MB = 50
+
+# Detection settings: how much text to sample and how sure it must be
+DETECTION_SAMPLE_CHARS = 3000
+DETECTION_MIN_HITS = 5
+DETECTION_MIN_MARGIN = 1.5  # Best language must have this many times the runner-up's hits
+
+# Frequent function words and common resume vocabulary per language
+STOPWORDS = {
+    "en": {
+        "the", "and", "of", "to", "in", "for", "with", "on", "at", "by", "from", "as", "is",
+        "was", "are", "an", "this", "that", "my", "our", "have", "has", "will", "or",
+        "using", "years", "experience", "team", "developed", "managed",
+    },
+    "es": {
+        "de", "la", "el", "y", "los", "las", "del", "con", "por", "para", "una", "un", "se",
+        "que", "al", "como", "sus", "más", "experiencia", "desarrollo", "años", "gestión",
+        "equipo", "empresa", "proyectos",
+    },
+    "fr": {
+        "le", "la", "les", "des", "et", "du", "de", "un", "une", "pour", "avec", "dans",
+        "sur", "au", "aux", "est", "par", "expérience", "développement", "ans", "gestion",
+        "équipe", "entreprise", "projets",
+    },
+    "de": {
+        "der", "die", "das", "und", "mit", "von", "für", "den", "dem", "des", "ein", "eine",
+        "im", "zu", "auf", "bei", "als", "ist", "erfahrung", "entwicklung", "jahre",
+        "kenntnisse", "projekte", "unternehmen",
+    },
+    "pt": {
+        "de", "da", "do", "e", "em", "com", "para", "por", "os", "as", "um", "uma", "no",
+        "na", "dos", "das", "experiência", "desenvolvimento", "anos", "gestão", "equipe",
+        "empresa", "projetos",
+    },
+    "it": {
+        "di", "il", "la", "e", "con", "per", "del", "della", "dei", "le", "un", "una", "da",
+        "nel", "nella", "al", "che", "esperienza", "sviluppo", "anni", "gestione", "azienda",
+        "progetti",
+    },
+    "nl": {
+        "de", "het", "een", "en", "van", "met", "voor", "op", "te", "bij", "als", "aan",
+        "zijn", "is", "ervaring", "ontwikkeling", "jaar", "bedrijf", "projecten",
+    },
+}
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+
+def _configured_models() -> Dict[str, str]:
+    """Return the language-to-model mapping, applying the NLP_MODELS override."""
+    setting = os.getenv("NLP_MODELS", "")
+    if not setting:
+        return dict(DEFAULT_MODELS)
+    models = {}
+    for entry in setting.split(","):
+        language, _, model = entry.partition(":")
+        if language.strip() and model.strip():
+            models[language.strip()] = model.strip()
+    return models
+
+
+NLP_MODELS = _configured_models()
+
+
+def detect_language(text: str) -> Tuple[str, float]:
+    """
+    Guess the language of resume text from stopword frequencies.
+
+    Args:
+        text: Resume text; only the first DETECTION_SAMPLE_CHARS are used
+
+    Returns:
+        Tuple of (language code, confidence between 0 and 1). Falls back to
+        DEFAULT_LANGUAGE with zero confidence when the sample is too short or
+        ambiguous.
+    """
+    hits: Counter = Counter()
+    for word in WORD_PATTERN.findall(text[:DETECTION_SAMPLE_CHARS].lower()):
+        for language, stopwords in STOPWORDS.items():
+            if word in stopwords:
+                hits[language] += 1
+
+    ranked = hits.most_common(2)
+    if not ranked or ranked[0][1] < DETECTION_MIN_HITS:
+        return DEFAULT_LANGUAGE, 0.0
+    best, best_hits = ranked[0]
+    runner_up_hits = ranked[1][1] if len(ranked) > 1 else 0
+    if runner_up_hits and best_hits < runner_up_hits * DETECTION_MIN_MARGIN:
+        return DEFAULT_LANGUAGE, 0.0
+    return best, 1.0 - runner_up_hits / best_hits
+
+
+def _resident_bytes() -> int:
+    """Return the resident memory of this process, or 0 if unknown."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class ModelRegistry:
+    """
+    Lazily loaded spaCy models, evicted least recently used first once their
+    estimated memory exceeds the budget.
+
+    Each model's size is measured as the growth in resident memory while it
+    loads. The most recently used model is always kept, even if it alone
+    exceeds the budget. Memory freed by eviction returns to the allocator and
+    is reused for the next load, though not always to the operating system.
+    """
+
+    def __init__(self, models: Dict[str, str] = NLP_MODELS, memory_budget_mb: int = NLP_MODEL_MEMORY_MB):
+        self.models = models
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self._loaded: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._unavailable = set()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def model_for(self, language: str) -> str:
+        """Return the model name for a language, falling back to the default language's model."""
+        return self.models.get(language) or self.models.get(DEFAULT_LANGUAGE, DEFAULT_MODELS[DEFAULT_LANGUAGE])
+
+    def get(self, language: str = DEFAULT_LANGUAGE):
+        """
+        Return the spaCy pipeline for a language, loading it if needed.
+
+        Languages without an installed model use the default language's model.
+
+        Returns:
+            The spaCy Language object, or None if spaCy or the model is unavailable
+        """
+        name = self.model_for(language)
+        if name in self._unavailable and language != DEFAULT_LANGUAGE:
+            name = self.model_for(DEFAULT_LANGUAGE)
+
+        with self._lock:
+            if name in self._loaded:
+                self._loaded.move_to_end(name)
+                return self._loaded[name][0]
+            if name in self._unavailable:
+                return None
+
+            nlp, size = self._load(name, download=(language == DEFAULT_LANGUAGE))
+            if nlp is None:
+                self._unavailable.add(name)
+                if language != DEFAULT_LANGUAGE:
+                    logger.info(f"No spaCy model for '{language}', using the {DEFAULT_LANGUAGE} model")
+            else:
+                self._loaded[name] = (nlp, size)
+                self.loads += 1
+                self._evict()
+                return nlp
+
+        # Fall back to the default language outside the lock
+        if language != DEFAULT_LANGUAGE:
+            return self.get(DEFAULT_LANGUAGE)
+        return None
+
+    def _load(self, name: str, download: bool) -> Tuple[Any, int]:
+        """Load a model and measure its resident size. Caller must hold the lock."""
+        try:
+            import spacy
+        except ImportError:
+            logger.warning("spaCy not installed. Using header heuristics only for personal info.")
+            return None, 0
+
+        before = _resident_bytes()
+        try:
+            nlp = spacy.load(name)
+        except OSError:
+            if not download:
+                return None, 0
+            # If the default model is not installed, download it
+            import subprocess
+            subprocess.run(["python", "-m", "spacy", "download", name], check=True)
+            nlp = spacy.load(name)
+
+        size = _resident_bytes() - before
+        if size <= 0:
+            size = DEFAULT_MODEL_SIZE_MB * 1024 * 1024
+        logger.info(f"Loaded spaCy model {name} ({size / (1024 * 1024):.1f} MB)")
+        return nlp, size
+
+    def _evict(self) -> None:
+        """Drop least recently used models until within budget. Caller must hold the lock."""
+        evicted = False
+        while len(self._loaded) > 1 and sum(size for _, size in self._loaded.values()) > self.memory_budget:
+            name, _ = self._loaded.popitem(last=False)
+            self.evictions += 1
+            evicted = True
+            logger.info(f"Evicted spaCy model {name} to stay within the {self.memory_budget // (1024 * 1024)} MB budget")
+        if evicted:
+            gc.collect()
+
+    def after_fork(self) -> None:
+        """Give a freshly forked child its own lock; inherited models stay shared."""
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return loaded models with their estimated sizes and load/eviction counters."""
+        with self._lock:
+            return {
+                "loaded": {name: size for name, (_, size) in self._loaded.items()},
+                "memory_budget": self.memory_budget,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "unavailable": sorted(self._unavailable),
+            }
+
+
+# Shared registry for this worker process
+model_registry = ModelRegistry()
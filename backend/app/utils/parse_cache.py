@@ -0,0 +1,159 @@
+"""
+Cache for parsed PDF resumes, keyed by a SHA-256 hash of the uploaded bytes.
+"""
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Cache configuration from environment variables
+PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", "256"))
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR", "")  # Empty disables on-disk persistence
+
+
+class ParseCache:
+    """
+    Bounded LRU cache of parse results with optional on-disk persistence.
+
+    Entries are keyed by the SHA-256 of the file content combined with the
+    parser version, so bumping the parser version invalidates old results.
+    """
+
+    def __init__(self, max_size: int = PARSE_CACHE_SIZE, cache_dir: str = PARSE_CACHE_DIR):
+        self.max_size = max_size
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.cache_dir:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"Could not create parse cache directory {self.cache_dir}: {str(e)}")
+                self.cache_dir = None
+
+    @staticmethod
+    def make_key(file_content: bytes, version: str) -> str:
+        """
+        Build the cache key for a file.
+
+        Args:
+            file_content: Bytes content of the uploaded PDF file
+            version: Parser version the result was produced with
+
+        Returns:
+            Hex digest identifying the file and parser version
+        """
+        digest = hashlib.sha256(file_content).hexdigest()
+        return f"{version}-{digest}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a parse result, checking memory first and then disk.
+
+        Returns:
+            A copy of the cached result, or None on a miss
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(result)
+
+        result = self._read_from_disk(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, result)
+        return copy.deepcopy(result)
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        Store a parse result in memory and, if configured, on disk.
+        """
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._store(key, result)
+        self._write_to_disk(key, result)
+
+    def clear(self) -> None:
+        """Drop all in-memory entries (on-disk entries are left in place)."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def after_fork(self) -> None:
+        """
+        Replace the lock in a freshly forked child process.
+
+        A lock held by another thread at fork time would otherwise stay
+        locked forever in the child. Inherited entries are kept.
+        """
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "persistent": self.cache_dir is not None,
+            }
+
+    def _store(self, key: str, result: Dict[str, Any]) -> None:
+        # Caller must hold the lock
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _read_from_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.cache_dir:
+            return None
+        path = self._path_for(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable parse cache entry {path}: {str(e)}")
+            return None
+
+    def _write_to_disk(self, key: str, result: Dict[str, Any]) -> None:
+        if not self.cache_dir:
+            return
+        path = self._path_for(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(result, f)
+            # Atomic rename so concurrent workers never read a partial file
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist parse cache entry {path}: {str(e)}")
+
+
+# Shared cache instance used by the PDF parser
+parse_cache = ParseCache()
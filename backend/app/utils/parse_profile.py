@@ -0,0 +1,131 @@
+"""
+Per-stage profiling for PDF resume parsing.
+
+A ParseProfile records how long each parser stage took, plus counts such as
+pages, characters, lines and entities. Finished profiles are aggregated into
+per-stage latency histograms so the slowest stage can be identified.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List
+
+# Histogram bucket upper bounds in milliseconds
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class ParseProfile:
+    """Stage timings and counts collected while parsing one document."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.cache_hit = False
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block and add it to the named stage."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed_ms
+
+    def count(self, name: str, value: int) -> None:
+        """Record a count such as pages or characters."""
+        self.counts[name] = value
+
+    def merge(self, other: "ParseProfile") -> None:
+        """Add the stages and counts of a profile recorded elsewhere, e.g. in a child process."""
+        for name, ms in other.stages.items():
+            self.stages[name] = self.stages.get(name, 0.0) + ms
+        self.counts.update(other.counts)
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the profile as a JSON-serializable dictionary."""
+        return {
+            "total_ms": round(self.total_ms, 2),
+            "cache_hit": self.cache_hit,
+            "stages_ms": {name: round(ms, 2) for name, ms in self.stages.items()},
+            "counts": dict(self.counts),
+        }
+
+    def server_timing(self) -> str:
+        """Format stage timings as a Server-Timing header value."""
+        entries = [f"{name};dur={ms:.1f}" for name, ms in self.stages.items()]
+        entries.append(f"total;dur={self.total_ms:.1f}")
+        return ", ".join(entries)
+
+
+class StageHistograms:
+    """Thread-safe per-stage latency histograms for this worker process."""
+
+    def __init__(self, buckets: List[float] = HISTOGRAM_BUCKETS_MS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self._documents = 0
+        self._cache_hits = 0
+
+    def record(self, profile: ParseProfile) -> None:
+        """Add every stage of a finished profile to the histograms."""
+        stages = dict(profile.stages)
+        stages["total"] = profile.total_ms
+        with self._lock:
+            self._documents += 1
+            if profile.cache_hit:
+                self._cache_hits += 1
+            for name, ms in stages.items():
+                histogram = self._stages.setdefault(name, {
+                    "count": 0,
+                    "sum_ms": 0.0,
+                    "buckets": [0] * (len(self.buckets) + 1),
+                })
+                histogram["count"] += 1
+                histogram["sum_ms"] += ms
+                histogram["buckets"][self._bucket_index(ms)] += 1
+
+    def after_fork(self) -> None:
+        """Start a freshly forked child process with its own lock and empty histograms."""
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._documents = 0
+        self._cache_hits = 0
+
+    def _bucket_index(self, ms: float) -> int:
+        for i, bound in enumerate(self.buckets):
+            if ms <= bound:
+                return i
+        return len(self.buckets)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the histograms with cumulative bucket counts, Prometheus style."""
+        labels = [f"le_{bound}" for bound in self.buckets] + ["le_inf"]
+        with self._lock:
+            stages = {}
+            for name, histogram in self._stages.items():
+                cumulative = 0
+                buckets = {}
+                for label, value in zip(labels, histogram["buckets"]):
+                    cumulative += value
+                    buckets[label] = cumulative
+                stages[name] = {
+                    "count": histogram["count"],
+                    "mean_ms": round(histogram["sum_ms"] / histogram["count"], 2),
+                    "buckets": buckets,
+                }
+            return {
+                "documents": self._documents,
+                "cache_hits": self._cache_hits,
+                "stages": stages,
+            }
+
+
+# Shared histograms for this worker process
+stage_histograms = StageHistograms()
@@ -0,0 +1,353 @@
+"""
+Resource-limited execution of PDF text extraction in a child process.
+
+A crafted PDF can make pdfminer allocate gigabytes or loop for minutes. Text
+extraction is therefore run in a forked child with a memory cap (RLIMIT_AS,
+on top of what the child inherits), a CPU-time cap (RLIMIT_CPU) and a
+wall-clock timeout enforced by the parent. The child leads its own process
+group, so any helper processes it starts are killed with it; page ranges
+of long documents are laid out in such helpers (see map_limited). Bulk
+ingestion applies the same limits to its long-lived extraction processes
+(see bulk_ingest).
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Sandbox limits from environment variables (0 disables a limit)
+PARSE_SANDBOX = os.getenv("PARSE_SANDBOX", "1") != "0"
+PARSE_MAX_MEMORY_MB = int(os.getenv("PARSE_MAX_MEMORY_MB", "512"))
+PARSE_MAX_CPU_SECONDS = int(os.getenv("PARSE_MAX_CPU_SECONDS", "20"))
+PARSE_TIMEOUT_SECONDS = float(os.getenv("PARSE_TIMEOUT_SECONDS", "30"))
+PARSE_MAX_PAGES = int(os.getenv("PARSE_MAX_PAGES", "30"))
+
+# Limits that can be exceeded, as reported in metrics
+LIMITS = ("memory", "cpu", "timeout", "pages")
+
+# (memory MB, CPU seconds) of the sandbox this process runs in, if any
+_sandbox_limits: Optional[Tuple[int, int]] = None
+
+
+class ParseLimitExceeded(Exception):
+    """Raised when parsing a document exceeds one of the resource limits."""
+
+    def __init__(self, limit: str, message: str):
+        super().__init__(message)
+        self.limit = limit
+
+
+class LimitStats:
+    """Thread-safe counters of sandboxed runs and limit violations for this worker process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.violations = {limit: 0 for limit in LIMITS}
+
+    def record_run(self) -> None:
+        with self._lock:
+            self.runs += 1
+
+    def record_violation(self, limit: str) -> None:
+        with self._lock:
+            self.violations[limit] = self.violations.get(limit, 0) + 1
+
+    def after_fork(self) -> None:
+        """Start a freshly forked child process with its own lock and zeroed counters."""
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.violations = {limit: 0 for limit in LIMITS}
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"sandboxed_runs": self.runs, "violations": dict(self.violations)}
+
+
+# Shared counters for this worker process
+limit_stats = LimitStats()
+
+
+def check_page_count(pages: int) -> None:
+    """
+    Enforce the page-count cap.
+
+    Raises:
+        ParseLimitExceeded: If the document has more than PARSE_MAX_PAGES pages
+    """
+    if PARSE_MAX_PAGES and pages > PARSE_MAX_PAGES:
+        raise ParseLimitExceeded(
+            "pages", f"PDF has {pages} pages; at most {PARSE_MAX_PAGES} pages can be parsed."
+        )
+
+
+def sandbox_available() -> bool:
+    """Check whether this platform can run the sandbox (fork and rlimits)."""
+    return resource is not None and "fork" in multiprocessing.get_all_start_methods()
+
+
+def in_sandbox() -> bool:
+    """Check whether the current process is a sandbox child or one of its helpers."""
+    return _sandbox_limits is not None
+
+
+def _address_space_bytes() -> int:
+    """Return the current virtual memory size of this process, or 0 if unknown."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def limit_memory(max_memory_mb: int) -> None:
+    """
+    Let the current process allocate at most max_memory_mb more address
+    space (RLIMIT_AS); allocations beyond it raise MemoryError.
+
+    A forked process inherits its parent's address space (NLP model
+    included), so the cap is added on top of it rather than applied
+    absolutely.
+    """
+    if not max_memory_mb:
+        return
+    current = _address_space_bytes()
+    if current:
+        limit = current + max_memory_mb * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError) as e:
+            logger.warning(f"Could not set parse memory limit: {str(e)}")
+
+
+def limit_cpu(max_cpu_seconds: int, renewable: bool = False) -> None:
+    """
+    Let the current process use at most max_cpu_seconds more CPU time
+    (RLIMIT_CPU).
+
+    By default SIGXCPU at the limit terminates the process. With
+    renewable=True, for long-lived processes that parse one document after
+    another, the hard limit is left as it is so the next call can move the
+    soft limit again, and SIGXCPU raises ParseLimitExceeded in the main
+    thread instead.
+    """
+    if not max_cpu_seconds:
+        return
+
+    def cpu_limit_exceeded(signum, frame):
+        raise ParseLimitExceeded("cpu", f"PDF parsing exceeded the {max_cpu_seconds}s CPU time limit.")
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + max_cpu_seconds
+    try:
+        if renewable:
+            hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+            if hard != resource.RLIM_INFINITY:
+                soft = min(soft, hard)
+            signal.signal(signal.SIGXCPU, cpu_limit_exceeded)
+        else:
+            hard = soft + 1
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError) as e:
+        logger.warning(f"Could not set parse CPU limit: {str(e)}")
+
+
+def _remaining_cpu_seconds() -> int:
+    """Return the CPU seconds left under this process's RLIMIT_CPU, or 0 if it is unlimited."""
+    soft = resource.getrlimit(resource.RLIMIT_CPU)[0]
+    if soft == resource.RLIM_INFINITY:
+        return 0
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return max(1, soft - int(usage.ru_utime + usage.ru_stime))
+
+
+def _child_main(
+    conn,
+    func: Callable,
+    args: tuple,
+    max_memory_mb: int,
+    max_cpu_seconds: int,
+    cpu_share: Optional[int] = None,
+) -> None:
+    """
+    Entry point of a sandbox child: apply limits, run func and send back the outcome.
+
+    Helpers started by map_limited pass their cpu_share instead; they stay
+    in the sandbox's process group and keep its memory cap.
+    """
+    global _sandbox_limits
+    if cpu_share is None:
+        os.setpgid(0, 0)
+        limit_memory(max_memory_mb)
+        limit_cpu(max_cpu_seconds)
+        _sandbox_limits = (max_memory_mb, max_cpu_seconds)
+    else:
+        limit_cpu(cpu_share)
+    try:
+        try:
+            conn.send(("ok", func(*args)))
+        except ParseLimitExceeded as e:
+            conn.send(("limit", e.limit, str(e)))
+        except MemoryError:
+            conn.send(("limit", "memory", f"PDF parsing exceeded the {max_memory_mb}MB memory limit."))
+        except Exception as e:
+            conn.send(("error", str(e)))
+    finally:
+        conn.close()
+
+
+def _kill_process_group(process) -> None:
+    """Kill the child and any helper processes in its process group."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    if process.is_alive():
+        process.kill()
+
+
+def run_limited(
+    func: Callable,
+    *args,
+    max_memory_mb: int = PARSE_MAX_MEMORY_MB,
+    max_cpu_seconds: int = PARSE_MAX_CPU_SECONDS,
+    timeout: float = PARSE_TIMEOUT_SECONDS,
+) -> Any:
+    """
+    Run func(*args) in a forked child process under resource limits.
+
+    The function and its arguments are inherited by the forked child; only
+    the return value is sent back through a pipe, so it must be picklable.
+
+    Args:
+        func: Function to run
+        *args: Arguments for func
+        max_memory_mb: Extra address space the child may allocate
+        max_cpu_seconds: CPU time the child may use
+        timeout: Wall-clock seconds to wait for a result
+
+    Returns:
+        The return value of func
+
+    Raises:
+        ParseLimitExceeded: If a limit was exceeded
+        Exception: If func raised any other exception in the child
+    """
+    ctx = multiprocessing.get_context("fork")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    process = ctx.Process(
+        target=_child_main,
+        args=(child_conn, func, args, max_memory_mb, max_cpu_seconds),
+    )
+    limit_stats.record_run()
+    process.start()
+    child_conn.close()
+
+    message: Optional[tuple] = None
+    timed_out = False
+    try:
+        if parent_conn.poll(timeout or None):
+            try:
+                message = parent_conn.recv()
+            except EOFError:
+                # The child died without reporting, e.g. killed by a signal
+                message = None
+        else:
+            timed_out = True
+    finally:
+        _kill_process_group(process)
+        process.join()
+        parent_conn.close()
+
+    if timed_out:
+        raise ParseLimitExceeded("timeout", f"PDF parsing exceeded the {timeout:g}s time limit.")
+    return _outcome(message, process, max_memory_mb, max_cpu_seconds)
+
+
+def _outcome(message: Optional[tuple], process, max_memory_mb: int, max_cpu_seconds: int) -> Any:
+    """Return the value a finished child sent back, or raise what it reported or died of."""
+    if message is None:
+        exitcode = process.exitcode
+        if exitcode == -signal.SIGXCPU:
+            raise ParseLimitExceeded("cpu", f"PDF parsing exceeded the {max_cpu_seconds}s CPU time limit.")
+        if exitcode == -signal.SIGKILL:
+            raise ParseLimitExceeded("memory", f"PDF parsing exceeded the {max_memory_mb}MB memory limit.")
+        raise Exception(f"Parser process exited unexpectedly with code {exitcode}")
+
+    if message[0] == "ok":
+        return message[1]
+    if message[0] == "limit":
+        raise ParseLimitExceeded(message[1], message[2])
+    raise Exception(message[1])
+
+
+def map_limited(func: Callable, arg_tuples: List[tuple]) -> List[Any]:
+    """
+    Run func over several argument tuples at once from inside a sandbox
+    child, each call in a helper process forked from it.
+
+    The helpers stay in the sandbox's process group, so the parent's timeout
+    kills them with the child, and they keep its memory cap. RLIMIT_CPU
+    only counts a process's own time, so the CPU time the child has left is
+    split between the helpers instead of each starting a fresh budget.
+
+    Args:
+        func: Function to run
+        arg_tuples: Arguments for each call
+
+    Returns:
+        The return values, in the order of arg_tuples
+
+    Raises:
+        ParseLimitExceeded: If a helper exceeded a limit
+        Exception: If func raised any other exception in a helper
+    """
+    max_memory_mb, max_cpu_seconds = _sandbox_limits or (PARSE_MAX_MEMORY_MB, PARSE_MAX_CPU_SECONDS)
+    remaining = _remaining_cpu_seconds()
+    cpu_share = -(-remaining // len(arg_tuples)) if remaining else 0  # Ceiling division
+
+    ctx = multiprocessing.get_context("fork")
+    helpers = []
+    try:
+        for args in arg_tuples:
+            parent_conn, child_conn = ctx.Pipe(duplex=False)
+            process = ctx.Process(
+                target=_child_main,
+                args=(child_conn, func, args, max_memory_mb, max_cpu_seconds, cpu_share),
+            )
+            process.start()
+            child_conn.close()
+            helpers.append((process, parent_conn))
+
+        results: List[Any] = [None] * len(helpers)
+        pending = {conn: i for i, (_, conn) in enumerate(helpers)}
+        while pending:
+            for conn in wait(list(pending)):
+                i = pending.pop(conn)
+                process = helpers[i][0]
+                try:
+                    message = conn.recv()
+                except EOFError:
+                    # The helper died without reporting, e.g. killed by a signal
+                    message = None
+                    process.join()
+                results[i] = _outcome(message, process, max_memory_mb, max_cpu_seconds)
+        return results
+    finally:
+        # Stop the other helpers as soon as one fails
+        for process, conn in helpers:
+            if process.is_alive():
+                process.kill()
+            process.join()
+            conn.close()
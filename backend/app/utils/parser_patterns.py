@@ -0,0 +1,155 @@
+"""
+Precompiled regular expressions shared by the resume parser.
+
+Every pattern the parser applies per line is compiled once here at import
+time. Date and degree grammars are built from shared fragments so job and
+education headers recognise the same date formats and degree names.
+"""
+import re
+from typing import List, Match, Optional, Tuple
+
+# ---------------------------------------------------------------------------
+# Grammar fragments
+# ---------------------------------------------------------------------------
+
+MONTH = (
+    r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?"
+    r"|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\.?(?![A-Za-z])"
+)
+YEAR = r"(?:19|20)\d{2}"
+PRESENT = r"(?:Present|Current|Now)"
+RANGE_SEPARATOR = r"\s*(?:-|–|—|\bto\b)\s*"
+
+# A single point in time: "Jan 2020", "January", "2020"
+DATE_POINT = rf"(?:{MONTH}\s*{YEAR}|{MONTH}|{YEAR})"
+
+DEGREE_TYPES = [
+    "Bachelor", "Master", "PhD", "Doctorate", "BS", "BA", "MS", "MA", "MBA",
+    "B.S.", "M.S.", "B.A.", "M.A.",
+]
+
+DEGREE_FIELDS = [
+    "Science", "Arts", "Business", "Engineering", "Fine Arts", "Education", "Computer Science",
+    "Information Technology", "Mathematics", "Physics", "Chemistry", "Biology", "Psychology",
+    "Sociology", "Economics", "Finance", "Marketing", "Management", "Communications", "Journalism",
+    "Law", "Medicine", "Nursing", "Philosophy", "Political Science", "History", "English",
+    "Literature", "Languages", "Architecture", "Design", "Music", "Theater", "Film", "Health",
+    "Public Health", "Public Administration", "Social Work", "Criminal Justice", "Human Resources",
+    "International Relations", "Liberal Arts", "General Studies", "Applied Science", "Technology",
+    "Information Systems",
+]
+
+
+def _alternation(terms: List[str]) -> str:
+    """Build a regex alternation, longest terms first so they win ties."""
+    return "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+
+
+DEGREE_TYPE = rf"(?<!\w)(?:{_alternation(DEGREE_TYPES)})(?!\w)"
+DEGREE_FIELD = rf"(?:{_alternation(DEGREE_FIELDS)})(?!\w)"
+
+# ---------------------------------------------------------------------------
+# Compiled patterns
+# ---------------------------------------------------------------------------
+
+# Section headings: keyword alternatives per section, combined into a single
+# anchored pattern whose named group identifies the section
+SECTION_KEYWORDS = {
+    "summary": ["summary", "profile", "objective", "about me"],
+    "experience": ["experience", "employment", "work history", "career history", "professional background"],
+    "education": ["education", "academic background", "academics", "qualifications"],
+    "skills": ["skills", "expertise", "competencies", "proficiencies", "technologies"],
+    "projects": ["projects", "portfolio", "case studies", "initiatives"],
+}
+
+# Up to three qualifier words before the keyword ("Professional", "Key
+# Marketing") and two after ("& Tools"), with optional icons and a colon
+HEADING_PATTERN = re.compile(
+    r"^\W*(?:[A-Za-z&/]+\s+){0,3}?(?:"
+    + "|".join(
+        rf"(?P<{section}>{_alternation(keywords)})"
+        for section, keywords in SECTION_KEYWORDS.items()
+    )
+    + r")\b(?:\s+[A-Za-z&/]+){0,2}\s*:?$",
+    re.IGNORECASE,
+)
+
+# Dates
+YEAR_PATTERN = re.compile(rf"\b{YEAR}\b")
+DATE_RANGE_PATTERN = re.compile(
+    rf"\b(?P<start>{DATE_POINT}){RANGE_SEPARATOR}(?P<end>{DATE_POINT}|{PRESENT})\b",
+    re.IGNORECASE,
+)
+YEAR_OR_PRESENT_PATTERN = re.compile(rf"\b(?:{YEAR}|{PRESENT})\b", re.IGNORECASE)
+
+# Degrees
+DEGREE_KEYWORD_PATTERN = re.compile(DEGREE_TYPE, re.IGNORECASE)
+DEGREE_PATTERN = re.compile(
+    rf"{DEGREE_TYPE}(?:(?:\s+of|\s+in)?\s+{DEGREE_FIELD})?",
+    re.IGNORECASE,
+)
+
+# Contact details
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+\.[\w.-]+')
+PHONE_PATTERN = re.compile(r'(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+LINKEDIN_PATTERN = re.compile(r'(?:linkedin\.com/in/|linkedin\.com/profile/view\?id=)[\w-]+')
+WEBSITE_PATTERN = re.compile(r'(?:https?://)?(?:www\.)?[\w.-]+\.[a-zA-Z]{2,}(?:/\S*)?')
+
+# Header field separators
+JOB_HEADER_SEPARATOR = re.compile(r'\s*[,|]\s*')
+EDUCATION_HEADER_SEPARATOR = re.compile(r'[,|]|\s-\s|\s–\s')
+
+
+def term_pattern(term: str) -> "re.Pattern":
+    """
+    Compile a case-insensitive pattern that matches a vocabulary term as a
+    whole word. Lookarounds are used instead of \\b so terms ending in
+    punctuation such as "C++" or "C#" still match.
+    """
+    return re.compile(r'(?<!\w)' + re.escape(term) + r'(?!\w)', re.IGNORECASE)
+
+
+# ---------------------------------------------------------------------------
+# Reusable matchers
+# ---------------------------------------------------------------------------
+
+def find_date_range(line: str) -> Optional[Match]:
+    """
+    Find a date range such as "Jan 2020 - Present" or "2014 to 2018".
+
+    Returns:
+        Match object with "start" and "end" groups, or None
+    """
+    return DATE_RANGE_PATTERN.search(line)
+
+
+def find_dates(line: str) -> Tuple[str, str, str]:
+    """
+    Find the start and end dates mentioned in a header line.
+
+    A full range is preferred; otherwise the first two standalone years are
+    used, and a single year is treated as the end date.
+
+    Returns:
+        (start_date, end_date, remainder) where remainder is the line with
+        the matched dates removed
+    """
+    range_match = find_date_range(line)
+    if range_match:
+        remainder = line[:range_match.start()] + line[range_match.end():]
+        return range_match.group("start"), range_match.group("end"), remainder.strip()
+
+    points = [m.group(0) for m in YEAR_OR_PRESENT_PATTERN.finditer(line)]
+    if not points:
+        return "", "", line
+    remainder = YEAR_OR_PRESENT_PATTERN.sub("", line).strip()
+    if len(points) >= 2:
+        return points[0], points[1], remainder
+    return "", points[0], remainder
+
+
+def find_degree(line: str) -> Optional[Match]:
+    """
+    Find a degree such as "BS Computer Science" or "Master of Arts".
+    """
+    return DEGREE_PATTERN.search(line)
@@ -0,0 +1,189 @@
+"""
+Process lifecycle hooks for the resume parser under a pre-forking server.
+
+With gunicorn's `preload_app`, `preload()` runs once in the master: it loads
+the spaCy model, imports the parser modules (compiling their regex tables and
+skill vocabulary) and freezes the resulting objects out of the garbage
+collector, so workers inherit them copy-on-write instead of each holding a
+private copy. `after_fork()` then gives every child fresh locks and counters.
+
+Memory usage of the workers can be inspected with:
+
+    python -m app.utils.parser_runtime <gunicorn master pid>
+"""
+import argparse
+import gc
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from . import pdf_parser, pdf_text
+from .parse_cache import parse_cache
+from .parse_sandbox import limit_stats
+from .nlp_models import model_registry
+from .parse_profile import stage_histograms
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Text run through the NER pipeline once so lazily built tables exist before fork
+WARM_UP_TEXT = "Jane Doe\nSan Francisco, CA | jane.doe@example.com | (555) 123-4567\n"
+
+# smaps_rollup fields reported by memory_usage, in kB
+SMAPS_FIELDS = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Shared_Clean": "shared_clean",
+    "Shared_Dirty": "shared_dirty",
+    "Private_Clean": "private_clean",
+    "Private_Dirty": "private_dirty",
+}
+
+_preloaded = False
+
+
+def preload() -> None:
+    """
+    Load the default-language NER model and parser state in the current (master) process and
+    freeze it out of the garbage collector.
+
+    Freezing keeps the collector from writing to the headers of these
+    long-lived objects in the workers, which would otherwise un-share
+    their pages one by one.
+    """
+    global _preloaded
+    if _preloaded:
+        return
+
+    # Imported for their module-level tables (regexes, gazetteer, pdfminer setup)
+    from . import bulk_ingest, header_heuristics  # noqa: F401
+
+    nlp = pdf_parser.get_nlp()
+    if nlp is not None:
+        nlp(WARM_UP_TEXT)
+    pdf_parser.process_resume_text(WARM_UP_TEXT)
+
+    gc.collect()
+    gc.freeze()
+    _preloaded = True
+    logger.info(f"Parser state preloaded in process {os.getpid()}: {format_memory(memory_usage())}")
+
+
+def after_fork() -> None:
+    """
+    Reset per-process parser state in a freshly forked child.
+
+    Locks are replaced, since one held by another thread at fork time would
+    never be released in the child, counters start from zero so each
+    worker reports only its own traffic, and the parent's page extraction
+    pool is dropped.
+    """
+    parse_cache.after_fork()
+    stage_histograms.after_fork()
+    limit_stats.after_fork()
+    model_registry.after_fork()
+    pdf_text.after_fork()
+
+
+# Also covers processes forked outside gunicorn, e.g. bulk ingestion pools
+os.register_at_fork(after_in_child=after_fork)
+
+
+def memory_usage(pid: Optional[int] = None) -> Dict[str, int]:
+    """
+    Return the memory of a process split into shared and private bytes.
+
+    Args:
+        pid: Process to inspect; defaults to the current process
+
+    Returns:
+        Dictionary of byte counts (rss, pss, shared, private and their
+        clean/dirty parts), or an empty dictionary where /proc is unavailable
+    """
+    path = Path("/proc") / (str(pid) if pid else "self") / "smaps_rollup"
+    usage = {name: 0 for name in SMAPS_FIELDS.values()}
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                field, _, value = line.partition(":")
+                if field in SMAPS_FIELDS:
+                    usage[SMAPS_FIELDS[field]] = int(value.split()[0]) * 1024
+    except OSError:
+        return {}
+    usage["shared"] = usage["shared_clean"] + usage["shared_dirty"]
+    usage["private"] = usage["private_clean"] + usage["private_dirty"]
+    return usage
+
+
+def child_pids(parent_pid: int) -> List[int]:
+    """Return the pids of the direct children of a process."""
+    children = []
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name is parenthesized and may itself contain spaces
+        fields = stat.rsplit(")", 1)[1].split()
+        if int(fields[1]) == parent_pid:
+            children.append(int(entry.name))
+    return sorted(children)
+
+
+def worker_memory_report(master_pid: int) -> Dict[str, Any]:
+    """
+    Report shared and private memory for a master process and its workers.
+
+    Args:
+        master_pid: Pid of the gunicorn master
+
+    Returns:
+        Dictionary with the master's usage, per-worker usage and totals
+    """
+    workers = {pid: memory_usage(pid) for pid in child_pids(master_pid)}
+    workers = {pid: usage for pid, usage in workers.items() if usage}
+    return {
+        "master": memory_usage(master_pid),
+        "workers": workers,
+        "total_private": sum(usage["private"] for usage in workers.values()),
+        "total_pss": sum(usage["pss"] for usage in workers.values()),
+    }
+
+
+def format_memory(usage: Dict[str, int]) -> str:
+    """Format a memory_usage result as a short human-readable string."""
+    if not usage:
+        return "memory usage unavailable"
+    mib = 1024 * 1024
+    return (
+        f"rss {usage['rss'] / mib:.1f} MiB, "
+        f"shared {usage['shared'] / mib:.1f} MiB, "
+        f"private {usage['private'] / mib:.1f} MiB, "
+        f"pss {usage['pss'] / mib:.1f} MiB"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point printing the memory report for a gunicorn master."""
+    parser = argparse.ArgumentParser(description="Show shared vs private memory of gunicorn workers.")
+    parser.add_argument("master_pid", type=int, help="Pid of the gunicorn master process")
+    args = parser.parse_args(argv)
+
+    report = worker_memory_report(args.master_pid)
+    if not report["master"]:
+        parser.error(f"Cannot read memory usage of process {args.master_pid}")
+
+    print(f"master {args.master_pid}: {format_memory(report['master'])}")
+    for pid, usage in report["workers"].items():
+        print(f"worker {pid}: {format_memory(usage)}")
+    mib = 1024 * 1024
+    print(f"workers total private {report['total_private'] / mib:.1f} MiB, total pss {report['total_pss'] / mib:.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
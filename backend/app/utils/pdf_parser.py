@@ -2,135 +2,145 @@
 PDF parser utility for extracting resume content from uploaded PDF files.
 """
 import io
+import os
 import re
 import logging
+import statistics
 from pathlib import Path
-from tempfile import NamedTemporaryFile
-from typing import Dict, List, Any
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
 
-import PyPDF2
-import spacy
-from pdfminer.high_level import extract_text
-from pdfminer.layout import LAParams
-
-# Load spaCy NER model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    # If model is not installed, download it
-    import subprocess
-    subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"], check=True)
-    nlp = spacy.load("en_core_web_sm")
+from .parse_cache import parse_cache
+from .parse_profile import ParseProfile, stage_histograms
+from . import parser_patterns as patterns
+from . import header_heuristics
+from . import nlp_models
+from . import parse_sandbox
+from .parse_sandbox import ParseLimitExceeded
+from . import pdf_text
+from .pdf_text import LineStyle
+from .skill_taxonomy import SKILL_PATTERNS
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Define regex patterns for different resume sections
-SECTION_PATTERNS = {
-    "summary": re.compile(r"(?i)(summary|profile|objective|about me)"),
-    "experience": re.compile(r"(?i)(experience|work|employment|career|professional background)"),
-    "education": re.compile(r"(?i)(education|academic|degree|qualification)"),
-    "skills": re.compile(r"(?i)(skills|expertise|technical skills|competencies|proficiencies)"),
-    "projects": re.compile(r"(?i)(projects|personal projects|portfolio|case studies)")
-}
+# Bump whenever extraction logic changes so cached parse results are invalidated
+PARSER_VERSION = "6"
+
+# When to run spaCy NER for the name and location:
+#   auto   - only when the header heuristics are not confident (default)
+#   always - every document, as before the heuristic fast path
+#   never  - never; spaCy is not loaded at all (low-memory deployments)
+PERSONAL_INFO_NER = os.getenv("PERSONAL_INFO_NER", "auto")
+PERSONAL_INFO_MIN_CONFIDENCE = float(os.getenv("PERSONAL_INFO_MIN_CONFIDENCE", "0.6"))
 
-# Common list of skills for matching
-COMMON_SKILLS = [
-    # Programming Languages
-    "Python", "Java", "JavaScript", "C++", "C#", "Ruby", "PHP", "Swift", "Kotlin", "Go", "Rust", 
-    "TypeScript", "Scala", "Perl", "R", "MATLAB", "SQL", "HTML", "CSS", "Shell", "Bash",
-    
-    # Frameworks & Libraries
-    "React", "Angular", "Vue.js", "Django", "Flask", "Spring", "Express.js", "Node.js", "Ruby on Rails",
-    "ASP.NET", "Laravel", "TensorFlow", "PyTorch", "Keras", "Pandas", "NumPy", "Scikit-learn",
-    "jQuery", "Bootstrap", "Tailwind CSS", "Redux", "Next.js", "FastAPI",
-    
-    # Databases
-    "MySQL", "PostgreSQL", "MongoDB", "Oracle", "SQL Server", "SQLite", "Redis", "Cassandra",
-    "DynamoDB", "Firebase", "Neo4j", "MariaDB", "Elasticsearch",
-    
-    # Cloud & DevOps
-    "AWS", "Azure", "Google Cloud", "Docker", "Kubernetes", "Jenkins", "GitLab CI", "GitHub Actions",
-    "Terraform", "Ansible", "Puppet", "Chef", "Nginx", "Apache", "Serverless", "CloudFormation",
-    
-    # Data Science & AI
-    "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "Data Analysis", "Data Visualization",
-    "Big Data", "Hadoop", "Spark", "Data Mining", "Statistical Analysis", "Reinforcement Learning",
-    
-    # Design & UI/UX
-    "Figma", "Adobe XD", "Sketch", "Photoshop", "Illustrator", "InDesign", "UI Design", "UX Design",
-    "Wireframing", "Prototyping", "User Research", "A/B Testing",
-    
-    # Project Management & Methodologies
-    "Agile", "Scrum", "Kanban", "Jira", "Trello", "Confluence", "Asana", "Project Management",
-    "SDLC", "Waterfall", "Lean", "Six Sigma",
-    
-    # Testing & QA
-    "Unit Testing", "Integration Testing", "End-to-End Testing", "Test Automation", "Selenium",
-    "JUnit", "Jest", "Cypress", "Mocha", "Chai", "TestNG", "Quality Assurance",
-    
-    # Marketing Skills
-    "SEO", "SEM", "Social Media Marketing", "Content Marketing", "Email Marketing", "Google Analytics",
-    "Facebook Ads", "Google Ads", "Marketing Automation", "CRM", "Salesforce", "HubSpot",
-    
-    # Finance & Business
-    "Financial Analysis", "Budgeting", "Forecasting", "Excel", "PowerPoint", "Data Entry",
-    "Accounting", "QuickBooks", "SAP", "ERP", "Business Intelligence", "Tableau", "Power BI"
-]
+# Section heading heuristics
+HEADING_MAX_LENGTH = 40  # Headings are short lines
+HEADING_MAX_WORDS = 5
+HEADING_SIZE_RATIO = 1.1  # Font size relative to body text that marks a heading
 
-def parse_pdf(file_content: bytes) -> Dict[str, Any]:
+def parse_pdf(
+    file_content: bytes,
+    use_cache: bool = True,
+    engine: Optional[str] = None,
+    profile: Optional[ParseProfile] = None,
+) -> Dict[str, Any]:
     """
     Parse a PDF file and extract structured resume information.
     
+    Results are cached by a SHA-256 of the file content, the parser version
+    and the text engines used, so repeat uploads of the same file skip
+    extraction entirely. Text extraction, the step a crafted PDF can blow
+    up, runs in a resource-limited child process when the sandbox is
+    enabled (see parse_sandbox). The extracted text is processed in this
+    process, so NER uses the models already loaded here.
+    
     Args:
         file_content: Bytes content of the uploaded PDF file
+        use_cache: Whether to read from and write to the parse cache
+        engine: Text extraction engine to try first (see pdf_text.ENGINES);
+            defaults to the PDF_TEXT_ENGINE setting
+        profile: Optional ParseProfile that receives per-stage timings and
+            counts; every parse is also added to the stage histograms
         
     Returns:
         Dictionary containing structured resume information
+        
+    Raises:
+        ParseLimitExceeded: If the PDF exceeds a page, memory, CPU or time limit
     """
+    if profile is None:
+        profile = ParseProfile()
+    
     try:
-        # Use a temporary file to handle the PDF
-        with NamedTemporaryFile(suffix=".pdf", delete=True) as temp_file:
-            # Write content to temp file
-            temp_file.write(file_content)
-            temp_file.flush()
-            
-            # Extract text using pdfminer for better text extraction
-            text = extract_text(temp_file.name, laparams=LAParams())
-            
-            # Also use PyPDF2 as a fallback for metadata
-            pdf_reader = PyPDF2.PdfReader(temp_file.name)
-            
-            # Check if text extraction was successful
-            if not text.strip():
-                logger.warning("No text extracted from PDF")
-                return {
-                    "personal_info": {},
-                    "summary": "",
-                    "skills": [],
-                    "work_experience": [],
-                    "education": [],
-                    "projects": []
-                }
-            
-            # Process the extracted text
-            return process_resume_text(text)
+        version = "-".join([PARSER_VERSION] + pdf_text.engine_chain(engine))
+        if use_cache:
+            with profile.stage("cache_lookup"):
+                cache_key = parse_cache.make_key(file_content, version)
+                cached = parse_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Returning cached parse result")
+                profile.cache_hit = True
+                return cached
+        
+        if parse_sandbox.PARSE_SANDBOX and parse_sandbox.sandbox_available():
+            extracted, child_profile = parse_sandbox.run_limited(_extract_profiled, file_content, engine)
+            profile.merge(child_profile)
+        else:
+            extracted = _extract(file_content, engine, profile)
+        result = _process_extracted(extracted, profile)
+        
+        if use_cache:
+            parse_cache.set(cache_key, result)
+        return result
+    except ParseLimitExceeded as e:
+        logger.warning(f"PDF rejected by parse limits ({e.limit}): {str(e)}")
+        parse_sandbox.limit_stats.record_violation(e.limit)
+        raise
+    finally:
+        stage_histograms.record(profile)
+
+def _extract_profiled(file_content: bytes, engine: Optional[str]) -> Tuple[pdf_text.ExtractedText, ParseProfile]:
+    """Extract text, returning it with its own profile (used in the sandbox child)."""
+    profile = ParseProfile()
+    return _extract(file_content, engine, profile), profile
+
+def _extract(file_content: bytes, engine: Optional[str], profile: ParseProfile) -> pdf_text.ExtractedText:
+    """
+    Check the page cap and extract text and line styles from a PDF.
+    """
+    try:
+        info = pdf_text.inspect_pdf(file_content)
+        parse_sandbox.check_page_count(info.page_count)
+        
+        with profile.stage("extract"):
+            extracted = pdf_text.extract_text(file_content, engine, info=info)
+        profile.count("pages", extracted.page_count)
+        profile.count("characters", len(extracted.text))
+        return extracted
+    except ParseLimitExceeded:
+        raise
     except Exception as e:
         logger.error(f"Error parsing PDF: {str(e)}")
         raise Exception(f"Failed to parse PDF: {str(e)}")
 
-def process_resume_text(text: str) -> Dict[str, Any]:
+def _process_extracted(extracted: pdf_text.ExtractedText, profile: ParseProfile) -> Dict[str, Any]:
     """
-    Process extracted text and organize into structured resume sections.
-    
-    Args:
-        text: Extracted text from PDF
-        
-    Returns:
-        Dictionary containing structured resume information
+    Run resume processing on extracted PDF text.
     """
-    # Initialize result structure
-    result = {
+    # Check if text extraction was successful
+    if not extracted.text.strip():
+        logger.warning("No text extracted from PDF")
+        return empty_result()
+    
+    try:
+        return process_resume_text(extracted.text, line_styles=extracted.line_styles, profile=profile)
+    except Exception as e:
+        logger.error(f"Error parsing PDF: {str(e)}")
+        raise Exception(f"Failed to parse PDF: {str(e)}")
+
+def empty_result() -> Dict[str, Any]:
+    """Return the result structure for a resume with no extractable content."""
+    return {
         "personal_info": {},
         "summary": "",
         "skills": [],
@@ -138,76 +148,249 @@ def process_resume_text(text: str) -> Dict[str, Any]:
         "education": [],
         "projects": []
     }
+
+def process_resume_text(
+    text: str,
+    doc=None,
+    line_styles: Optional[List[LineStyle]] = None,
+    profile: Optional[ParseProfile] = None,
+    guesses: Optional[Dict[str, header_heuristics.Guess]] = None,
+) -> Dict[str, Any]:
+    """
+    Process extracted text and organize into structured resume sections.
     
-    # Split text into lines and clean up
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    
-    # Extract personal information using NER
-    result["personal_info"] = extract_personal_info(text)
+    Args:
+        text: Extracted text from PDF
+        doc: Optional precomputed spaCy doc for the resume header, e.g. from
+            a batched `nlp.pipe` run over many resumes
+        line_styles: Optional font metrics for each non-blank line, used to
+            recognise section headings
+        profile: Optional ParseProfile that receives per-stage timings
+        guesses: Optional precomputed `header_heuristics.guess_header_fields(text)`
+        
+    Returns:
+        Dictionary containing structured resume information
+    """
+    if profile is None:
+        profile = ParseProfile()
     
-    # Identify sections in the resume
-    sections = identify_sections(lines)
+    # Initialize result structure
+    result = empty_result()
+    
+    # Build the shared document model (lines, offsets, sections, line features)
+    document = build_document(text, line_styles=line_styles, profile=profile)
+    profile.count("lines", len(document.lines))
+    profile.count("sections", len(document.sections))
+    
+    # Extract personal information, running NER only if the header heuristics need it
+    if guesses is None:
+        guesses = header_heuristics.guess_header_fields(text)
+    if doc is None and needs_ner(text, guesses=guesses):
+        nlp = get_nlp(detect_language(text))
+        if nlp is not None:
+            with profile.stage("ner"):
+                doc = nlp(header_text(text))
+    if doc is not None:
+        profile.count("entities", len(doc.ents))
+    with profile.stage("personal_info"):
+        result["personal_info"] = extract_personal_info(text, doc=doc, guesses=guesses)
     
     # Extract summary
-    if "summary" in sections:
-        start, end = sections["summary"]
-        summary_text = " ".join(lines[start:end])
-        # Clean up the summary (remove section title)
-        summary_text = re.sub(SECTION_PATTERNS["summary"], "", summary_text).strip()
-        result["summary"] = summary_text
+    if document.has_section("summary"):
+        result["summary"] = " ".join(line.text for line in document.section_lines("summary"))
     
     # Extract skills
-    result["skills"] = extract_skills(text, sections)
+    with profile.stage("skills"):
+        result["skills"] = extract_skills(document)
     
     # Extract work experience
-    if "experience" in sections:
-        result["work_experience"] = extract_work_experience(lines, sections["experience"])
+    if document.has_section("experience"):
+        with profile.stage("experience"):
+            result["work_experience"] = extract_work_experience(document)
     
     # Extract education
-    if "education" in sections:
-        result["education"] = extract_education(lines, sections["education"])
+    if document.has_section("education"):
+        with profile.stage("education"):
+            result["education"] = extract_education(document)
     
     # Extract projects
-    if "projects" in sections:
-        result["projects"] = extract_projects(lines, sections["projects"])
+    if document.has_section("projects"):
+        with profile.stage("projects"):
+            result["projects"] = extract_projects(document)
     
     return result
 
-def identify_sections(lines: List[str]) -> Dict[str, tuple]:
+class DocumentLine(NamedTuple):
+    """A non-empty, stripped line of resume text with precomputed features."""
+    text: str
+    start: int  # Character offset of the stripped line in the full text
+    end: int
+    year: str  # First year found on the line, or ""
+    has_degree: bool
+    font_size: float = 0.0  # 0.0 when no layout information is available
+    bold: bool = False
+
+class ResumeDocument:
+    """
+    Preprocessed view of a resume's text shared by all extractors.
+    
+    Lines are split, stripped and annotated once, and sections are stored
+    as line ranges that map back to exact character spans of the text.
+    """
+    
+    def __init__(self, text: str, lines: List[DocumentLine], sections: Dict[str, Tuple[int, int]]):
+        self.text = text
+        self.lines = lines
+        self.sections = sections
+    
+    def has_section(self, name: str) -> bool:
+        return name in self.sections
+    
+    def section_lines(self, name: str, include_heading: bool = False) -> List[DocumentLine]:
+        """
+        Return the lines of a section, skipping the heading line by default.
+        """
+        if name not in self.sections:
+            return []
+        start, end = self.sections[name]
+        if not include_heading:
+            start += 1
+        return self.lines[start:end]
+    
+    def section_text(self, name: str) -> str:
+        """
+        Return the raw text spanned by a section, including its heading.
+        """
+        lines = self.section_lines(name, include_heading=True)
+        if not lines:
+            return ""
+        return self.text[lines[0].start:lines[-1].end]
+
+def build_document(
+    text: str,
+    line_styles: Optional[List[LineStyle]] = None,
+    profile: Optional[ParseProfile] = None,
+) -> ResumeDocument:
+    """
+    Split resume text into annotated lines and identify its sections.
+    
+    Args:
+        text: Extracted text from PDF
+        line_styles: Optional font metrics for each non-blank line
+        profile: Optional ParseProfile that receives "lines" and
+            "sectioning" stage timings
+        
+    Returns:
+        ResumeDocument shared by the section extractors
+    """
+    if profile is None:
+        profile = ParseProfile()
+    
+    with profile.stage("lines"):
+        lines = _build_lines(text, line_styles)
+    
+    with profile.stage("sectioning"):
+        sections = identify_sections(lines)
+    return ResumeDocument(text, lines, sections)
+
+def _build_lines(text: str, line_styles: Optional[List[LineStyle]]) -> List[DocumentLine]:
+    """Split text into non-blank DocumentLines with offsets and line features."""
+    raw_lines = text.split('\n')
+    if line_styles is not None and len(line_styles) != sum(1 for line in raw_lines if line.strip()):
+        logger.warning("Layout styles do not align with text lines; ignoring font metrics")
+        line_styles = None
+    
+    lines = []
+    offset = 0
+    for raw_line in raw_lines:
+        stripped = raw_line.strip()
+        if stripped:
+            start = offset + len(raw_line) - len(raw_line.lstrip())
+            year_match = patterns.YEAR_PATTERN.search(stripped)
+            style = line_styles[len(lines)] if line_styles else LineStyle(0.0, False)
+            lines.append(DocumentLine(
+                text=stripped,
+                start=start,
+                end=start + len(stripped),
+                year=year_match.group(0) if year_match else "",
+                has_degree=patterns.DEGREE_KEYWORD_PATTERN.search(stripped) is not None,
+                font_size=style.font_size,
+                bold=style.bold,
+            ))
+        offset += len(raw_line) + 1  # Account for the newline
+    
+    return lines
+
+def identify_sections(lines: List[DocumentLine]) -> Dict[str, tuple]:
     """
     Identify different sections in the resume and their line ranges.
     
+    Headings are found in a single pass: a line must be short, title-cased
+    and fully match the combined heading pattern. When font metrics are
+    available it must also stand out from body text (larger, bold or all
+    caps). The first heading of each section wins, so later lines that
+    merely mention "experience" or "skills" cannot move a section.
+    
     Args:
-        lines: List of text lines from the resume
+        lines: Annotated lines from the document model
         
     Returns:
         Dictionary mapping section names to (start_line, end_line) tuples
     """
-    sections = {}
-    section_starts = []
+    sizes = [line.font_size for line in lines if line.font_size > 0]
+    body_size = statistics.median(sizes) if sizes else 0.0
     
-    # Identify the start of each section
+    section_starts = []
+    seen = set()
     for i, line in enumerate(lines):
-        for section, pattern in SECTION_PATTERNS.items():
-            if pattern.search(line):
-                section_starts.append((i, section))
-    
-    # Sort by line number
-    section_starts.sort()
+        section = _heading_section(line, body_size)
+        if section and section not in seen:
+            seen.add(section)
+            section_starts.append((i, section))
     
     # Define section ranges
+    sections = {}
     for i, (start, section) in enumerate(section_starts):
         end = section_starts[i+1][0] if i < len(section_starts) - 1 else len(lines)
         sections[section] = (start, end)
     
     return sections
 
-def extract_personal_info(text: str) -> Dict[str, str]:
+def _heading_section(line: DocumentLine, body_size: float) -> Optional[str]:
+    """Return the section a line is the heading of, or None."""
+    text = line.text
+    # Cheap checks first; most lines are rejected before any regex runs
+    if len(text) > HEADING_MAX_LENGTH or len(text.split()) > HEADING_MAX_WORDS or line.year:
+        return None
+    
+    words = [word for word in re.findall(r"[A-Za-z]+", text) if word.lower() not in ("and", "of")]
+    if not words or not all(word[0].isupper() for word in words):
+        return None
+    
+    match = patterns.HEADING_PATTERN.match(text)
+    if not match:
+        return None
+    
+    if body_size and line.font_size:
+        stands_out = line.font_size >= body_size * HEADING_SIZE_RATIO or line.bold or text.isupper()
+        if not stands_out:
+            return None
+    
+    return match.lastgroup
+
+def extract_personal_info(
+    text: str,
+    doc=None,
+    guesses: Optional[Dict[str, header_heuristics.Guess]] = None,
+) -> Dict[str, str]:
     """
-    Extract personal information from resume text using NER and patterns.
+    Extract personal information from resume text using header heuristics,
+    regex patterns and, when a heuristic guess is weak, spaCy NER.
     
     Args:
         text: Full text of the resume
+        doc: Optional precomputed spaCy doc for `header_text(text)`
+        guesses: Optional precomputed `header_heuristics.guess_header_fields(text)`
         
     Returns:
         Dictionary containing personal information
@@ -221,94 +404,148 @@ def extract_personal_info(text: str) -> Dict[str, str]:
         "website": ""
     }
     
-    # Use spaCy for named entity recognition
-    doc = nlp(text[:1000])  # Process just the first part where personal info usually appears
-    
-    # Extract name (assuming the first PERSON entity might be the resume owner)
-    for ent in doc.ents:
-        if ent.label_ == "PERSON" and not personal_info["name"]:
-            personal_info["name"] = ent.text
+    # Guess name and location from the header layout first
+    if guesses is None:
+        guesses = header_heuristics.guess_header_fields(text)
+    for field, guess in guesses.items():
+        personal_info[field] = guess.value
+    
+    # Fall back to spaCy named entity recognition for weak guesses only
+    weak_fields = _weak_guesses(guesses)
+    if weak_fields and doc is None:
+        nlp = get_nlp(detect_language(text))
+        if nlp is not None:
+            doc = nlp(header_text(text))
+    if weak_fields and doc is not None:
+        ner_info = _ner_personal_info(doc)
+        for field in weak_fields:
+            if ner_info[field]:
+                personal_info[field] = ner_info[field]
     
     # Extract email using regex
-    email_pattern = re.compile(r'[\w.+-]+@[\w-]+\.[\w.-]+')
-    email_match = email_pattern.search(text)
+    email_match = patterns.EMAIL_PATTERN.search(text)
     if email_match:
         personal_info["email"] = email_match.group(0)
     
     # Extract phone using regex
-    phone_pattern = re.compile(r'(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
-    phone_match = phone_pattern.search(text)
+    phone_match = patterns.PHONE_PATTERN.search(text)
     if phone_match:
         personal_info["phone"] = phone_match.group(0)
     
-    # Extract location (look for cities or addresses)
-    for ent in doc.ents:
-        if ent.label_ in ["GPE", "LOC"] and not personal_info["location"]:
-            personal_info["location"] = ent.text
-    
     # Look for LinkedIn and website URLs
-    linkedin_pattern = re.compile(r'(?:linkedin\.com/in/|linkedin\.com/profile/view\?id=)[\w-]+')
-    linkedin_match = linkedin_pattern.search(text)
+    linkedin_match = patterns.LINKEDIN_PATTERN.search(text)
     if linkedin_match:
         personal_info["linkedin"] = linkedin_match.group(0)
     
     # General website (non-LinkedIn)
-    website_pattern = re.compile(r'(?:https?://)?(?:www\.)?[\w.-]+\.[a-zA-Z]{2,}(?:/\S*)?')
-    for match in website_pattern.finditer(text):
+    for match in patterns.WEBSITE_PATTERN.finditer(text):
         url = match.group(0)
         if "linkedin" not in url and not personal_info["website"]:
             personal_info["website"] = url
     
     return personal_info
 
-def extract_skills(text: str, sections: Dict[str, tuple]) -> List[str]:
+def _ner_personal_info(doc) -> Dict[str, str]:
+    """Extract the name and location from a spaCy doc of the resume header."""
+    info = {"name": "", "location": ""}
+    for ent in doc.ents:
+        # Assume the first person entity is the resume owner (PER in non-English models)
+        if ent.label_ in ["PERSON", "PER"] and not info["name"]:
+            info["name"] = ent.text
+        # Look for cities or addresses
+        if ent.label_ in ["GPE", "LOC"] and not info["location"]:
+            info["location"] = ent.text
+    return info
+
+def get_nlp(language: str = nlp_models.DEFAULT_LANGUAGE):
+    """
+    Return the spaCy NER model for a language, loading it on first use.
+    
+    Languages without an installed model use the English model. Returns
+    None when NER is disabled with PERSONAL_INFO_NER=never or spaCy is not
+    installed, in which case only the header heuristics are used.
+    """
+    if PERSONAL_INFO_NER == "never":
+        return None
+    return nlp_models.model_registry.get(language)
+
+def detect_language(text: str) -> str:
+    """Detect the language of resume text, used to pick the NER model."""
+    language, confidence = nlp_models.detect_language(text)
+    logger.debug(f"Detected resume language {language} (confidence {confidence:.2f})")
+    return language
+
+def _weak_guesses(guesses: Dict[str, header_heuristics.Guess]) -> List[str]:
+    """Return the fields whose heuristic guess needs confirming with NER."""
+    if PERSONAL_INFO_NER == "never":
+        return []
+    if PERSONAL_INFO_NER == "always":
+        return list(guesses)
+    return [field for field, guess in guesses.items() if guess.confidence < PERSONAL_INFO_MIN_CONFIDENCE]
+
+def needs_ner(text: str, guesses: Optional[Dict[str, header_heuristics.Guess]] = None) -> bool:
+    """
+    Check whether personal info extraction for this text will use spaCy NER.
+    
+    Batch callers use this to run `nlp.pipe` only over documents whose
+    header heuristics are not confident; they can pass the same `guesses`
+    on to process_resume_text so the heuristics run once per document.
+    """
+    if guesses is None:
+        guesses = header_heuristics.guess_header_fields(text)
+    return bool(_weak_guesses(guesses))
+
+def header_text(text: str) -> str:
+    """
+    Return the leading part of the resume where personal info usually appears.
+    
+    This is the span run through spaCy NER; batch callers should pass the
+    same span to `nlp.pipe` so results match single-document parsing.
+    """
+    return text[:1000]
+
+def extract_skills(document: ResumeDocument) -> List[str]:
     """
     Extract skills from the resume text.
     
     Args:
-        text: Full text of the resume
-        sections: Dictionary mapping section names to line ranges
+        document: Preprocessed resume document
         
     Returns:
         List of identified skills
     """
+    text = document.text
     skills = []
     
     # Look for skills in the skills section if it exists
-    if "skills" in sections:
-        start, end = sections["skills"]
-        skills_text = text[start:end]
+    if document.has_section("skills"):
+        skills_text = document.section_text("skills")
         
         # Look for common skills in the skills section
-        for skill in COMMON_SKILLS:
-            # Use word boundaries to avoid partial matches
-            skill_pattern = re.compile(r'\b' + re.escape(skill) + r'\b', re.IGNORECASE)
+        for skill, skill_pattern in SKILL_PATTERNS:
             if skill_pattern.search(skills_text):
                 skills.append(skill)
     
     # If no skills found in the skills section or if no skills section exists,
     # look for skills throughout the document
     if not skills:
-        for skill in COMMON_SKILLS:
-            skill_pattern = re.compile(r'\b' + re.escape(skill) + r'\b', re.IGNORECASE)
+        for skill, skill_pattern in SKILL_PATTERNS:
             if skill_pattern.search(text):
                 skills.append(skill)
     
     return skills[:30]  # Limit to top 30 skills to prevent overwhelming results
 
-def extract_work_experience(lines: List[str], section_range: tuple) -> List[Dict[str, str]]:
+def extract_work_experience(document: ResumeDocument) -> List[Dict[str, str]]:
     """
     Extract work experience entries from the resume.
     
     Args:
-        lines: List of text lines from the resume
-        section_range: (start_line, end_line) tuple for the experience section
+        document: Preprocessed resume document
         
     Returns:
         List of work experience entries
     """
-    start, end = section_range
-    experience_lines = lines[start+1:end]  # Skip the section heading
+    experience_lines = document.section_lines("experience")
     
     experiences = []
     current_exp = {}
@@ -316,13 +553,13 @@ def extract_work_experience(lines: List[str], section_range: tuple) -> List[Dict
     
     # Simple heuristic: look for lines that might indicate a new job entry
     # This is a simplified approach; a more robust solution would use more patterns
-    for line in experience_lines:
+    for doc_line in experience_lines:
+        line = doc_line.text
         # Check if this line might be a new job entry start
         # Usually contains company name and possibly dates
-        date_pattern = re.compile(r'\b(19|20)\d{2}\b')  # Years like 1999 or 2020
         
         # If we find a line with a year and it's not too long (likely a header, not description)
-        if date_pattern.search(line) and len(line) < 100:
+        if doc_line.year and len(line) < 100:
             # If we were already building an experience entry, save it
             if current_exp:
                 current_exp["description"] = " ".join(exp_text)
@@ -361,29 +598,12 @@ def parse_job_header(header_line: str) -> Dict[str, str]:
         "end_date": ""
     }
     
-    # Extract dates
-    date_pattern = re.compile(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)(\s+\d{4})?\s*(-|–|to)\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)?\s*(\d{4}|Present|Current|Now)?|\b(19|20)\d{2}\s*(-|–|to)\s*(19|20)\d{2}|Present|Current|Now\b', re.IGNORECASE)
-    
-    date_match = date_pattern.search(header_line)
-    if date_match:
-        # Extract the full date string
-        date_str = date_match.group(0)
-        
-        # Split by common separators
-        date_parts = re.split(r'\s*(-|–|to)\s*', date_str)
-        
-        if len(date_parts) >= 2:
-            result["start_date"] = date_parts[0].strip()
-            result["end_date"] = date_parts[-1].strip()
-        
-        # Remove the date part from the header to simplify company/position extraction
-        header_no_date = header_line.replace(date_str, "").strip()
-    else:
-        header_no_date = header_line
+    # Extract dates and remove them to simplify company/position extraction
+    result["start_date"], result["end_date"], header_no_date = patterns.find_dates(header_line)
     
     # Try to identify company vs position
     # This is a simplified approach - a more robust solution would use ML or more patterns
-    parts = [p.strip() for p in re.split(r'\s*[,|]\s*', header_no_date) if p.strip()]
+    parts = [p.strip() for p in patterns.JOB_HEADER_SEPARATOR.split(header_no_date) if p.strip()]
     
     if len(parts) >= 2:
         result["company"] = parts[0]
@@ -394,31 +614,28 @@ def parse_job_header(header_line: str) -> Dict[str, str]:
     
     return result
 
-def extract_education(lines: List[str], section_range: tuple) -> List[Dict[str, str]]:
+def extract_education(document: ResumeDocument) -> List[Dict[str, str]]:
     """
     Extract education entries from the resume.
     
     Args:
-        lines: List of text lines from the resume
-        section_range: (start_line, end_line) tuple for the education section
+        document: Preprocessed resume document
         
     Returns:
         List of education entries
     """
-    start, end = section_range
-    education_lines = lines[start+1:end]  # Skip the section heading
+    education_lines = document.section_lines("education")
     
     educations = []
     current_edu = {}
     edu_text = []
     
     # Similar approach to work experience extraction
-    for line in education_lines:
-        date_pattern = re.compile(r'\b(19|20)\d{2}\b')  # Years like 1999 or 2020
-        degree_pattern = re.compile(r'\b(bachelor|master|phd|doctorate|bs|ba|ms|ma|phd|mba|b\.s\.|m\.s\.|b\.a\.|m\.a\.)\b', re.IGNORECASE)
+    for doc_line in education_lines:
+        line = doc_line.text
         
         # If we find a line with a year or degree and it's not too long
-        if (date_pattern.search(line) or degree_pattern.search(line)) and len(line) < 100:
+        if (doc_line.year or doc_line.has_degree) and len(line) < 100:
             # If we were already building an education entry, save it
             if current_edu:
                 current_edu["description"] = " ".join(edu_text)
@@ -458,26 +675,16 @@ def parse_education_header(header_line: str) -> Dict[str, str]:
     }
     
     # Extract dates
-    date_pattern = re.compile(r'\b(19|20)\d{2}\s*(-|–|to)\s*(19|20)\d{2}|Present|Current|Now\b|\b(19|20)\d{2}\b', re.IGNORECASE)
-    
-    date_matches = list(date_pattern.finditer(header_line))
-    if len(date_matches) >= 2:
-        result["start_date"] = date_matches[0].group(0)
-        result["end_date"] = date_matches[1].group(0)
-    elif len(date_matches) == 1:
-        # If only one date, assume it's the end date
-        result["end_date"] = date_matches[0].group(0)
+    result["start_date"], result["end_date"], _ = patterns.find_dates(header_line)
     
     # Try to identify degree
-    degree_pattern = re.compile(r'\b(Bachelor|Master|PhD|Doctorate|BS|BA|MS|MA|PhD|MBA|B\.S\.|M\.S\.|B\.A\.|M\.A\.)(\s+of|\s+in)?\s+(Science|Arts|Business|Engineering|Fine Arts|Education|Computer Science|Information Technology|Mathematics|Physics|Chemistry|Biology|Psychology|Sociology|Economics|Finance|Marketing|Management|Communications|Journalism|Law|Medicine|Nursing|Philosophy|Political Science|History|English|Literature|Languages|Architecture|Design|Music|Theater|Film|Health|Public Health|Public Administration|Social Work|Criminal Justice|Human Resources|International Relations|Liberal Arts|General Studies|Applied Science|Technology|Information Systems)?\b', re.IGNORECASE)
-    
-    degree_match = degree_pattern.search(header_line)
+    degree_match = patterns.find_degree(header_line)
     if degree_match:
         result["degree"] = degree_match.group(0)
     
     # Extract institution (simplified approach)
     # Assume the institution is at the beginning or after the degree
-    parts = [p.strip() for p in re.split(r'[,|-]', header_line) if p.strip()]
+    parts = [p.strip() for p in patterns.EDUCATION_HEADER_SEPARATOR.split(header_line) if p.strip()]
     
     if parts:
         # If we have a degree match, check if it's in the first part
@@ -491,25 +698,24 @@ def parse_education_header(header_line: str) -> Dict[str, str]:
     
     return result
 
-def extract_projects(lines: List[str], section_range: tuple) -> List[Dict[str, str]]:
+def extract_projects(document: ResumeDocument) -> List[Dict[str, str]]:
     """
     Extract project entries from the resume.
     
     Args:
-        lines: List of text lines from the resume
-        section_range: (start_line, end_line) tuple for the projects section
+        document: Preprocessed resume document
         
     Returns:
         List of project entries
     """
-    start, end = section_range
-    project_lines = lines[start+1:end]  # Skip the section heading
+    project_lines = document.section_lines("projects")
     
     projects = []
     current_project = {}
     project_text = []
     
-    for line in project_lines:
+    for doc_line in project_lines:
+        line = doc_line.text
         # Simplistic approach to identify new project entries
         # Look for short lines that might be project titles
         if len(line) < 50 and not line.startswith(" ") and not line.startswith("\t"):
@@ -524,12 +730,10 @@ def extract_projects(lines: List[str], section_range: tuple) -> List[Dict[str, s
             current_project = {"name": line, "date": "", "description": ""}
             
             # Look for a date in the project title
-            date_pattern = re.compile(r'\b(19|20)\d{2}\b')
-            date_match = date_pattern.search(line)
-            if date_match:
-                current_project["date"] = date_match.group(0)
+            if doc_line.year:
+                current_project["date"] = doc_line.year
                 # Remove the date from the name
-                current_project["name"] = line.replace(date_match.group(0), "").strip()
+                current_project["name"] = line.replace(doc_line.year, "").strip()
         else:
             # This is likely part of the project description
             project_text.append(line)
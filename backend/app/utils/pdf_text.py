@@ -0,0 +1,327 @@
+"""
+Text extraction engines for PDF resumes.
+
+Several backends are available, from the full pdfminer layout analysis to
+plain text-layer readers. A configurable primary engine is tried first, and
+a fallback engine is used automatically when it yields too little text.
+PDFs without a text layer (scanned images) are detected up front and skip
+layout analysis entirely. Long documents are laid out in page ranges across
+worker processes and reassembled in page order.
+"""
+import io
+import logging
+import os
+import statistics
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import pdfplumber
+import PyPDF2
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LAParams, LTChar, LTTextContainer, LTTextLine
+
+from . import parse_sandbox
+from .parse_sandbox import ParseLimitExceeded
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Engine selection from environment variables
+PDF_TEXT_ENGINE = os.getenv("PDF_TEXT_ENGINE", "pdfminer-fast")
+PDF_TEXT_FALLBACK = os.getenv("PDF_TEXT_FALLBACK", "pdfminer-full")  # Empty disables the fallback
+MIN_CHARS_PER_PAGE = int(os.getenv("PDF_MIN_CHARS_PER_PAGE", "100"))
+
+# Parallel page extraction for long PDFs
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("PDF_PARALLEL_PAGE_THRESHOLD", "8"))  # 0 disables it
+PAGE_WORKERS = int(os.getenv("PDF_PAGE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Font names containing these markers are treated as bold
+BOLD_FONT_MARKERS = ("bold", "black", "heavy", "semibold", "demi")
+
+# Full layout analysis: pdfminer defaults
+FULL_LAPARAMS = LAParams()
+
+# Fast layout analysis: skip the advanced box-ordering pass and vertical text
+# detection, which dominate pdfminer's layout cost on text-heavy pages
+FAST_LAPARAMS = LAParams(boxes_flow=None, detect_vertical=False, all_texts=False)
+
+
+class LineStyle(NamedTuple):
+    """Font metrics of a text line taken from the PDF layout."""
+    font_size: float
+    bold: bool
+
+
+class ExtractedText(NamedTuple):
+    """Output of a text extraction engine."""
+    text: str
+    line_styles: Optional[List[LineStyle]]  # None when the engine has no font metrics
+    page_count: int
+    engine: str
+
+
+class PdfInfo(NamedTuple):
+    """Facts about a PDF read from its page tree before any text extraction."""
+    page_count: int  # 0 when the page tree cannot be read
+    has_text_layer: bool
+
+
+# Process pool for page-range extraction, created on first use and shared by
+# the threads parsing uploads; the lock guards its creation and replacement
+_page_pool: Optional[ProcessPoolExecutor] = None
+_page_pool_lock = threading.Lock()
+
+
+def _extract_with_pdfminer(file_content: bytes, laparams: LAParams, engine: str, total_pages: int) -> ExtractedText:
+    """
+    Extract text and per-line font metrics in one pdfminer layout pass.
+
+    The text matches pdfminer's `extract_text` output (lines joined with
+    newlines, pages separated by form feeds). Styles are returned for every
+    non-blank line, in order, so they align with the document model's lines.
+    Documents with at least PARALLEL_PAGE_THRESHOLD pages (total_pages, as
+    counted by inspect_pdf) are split into page ranges that are laid out in
+    parallel.
+    """
+    if 0 < PARALLEL_PAGE_THRESHOLD <= total_pages and PAGE_WORKERS > 1:
+        try:
+            return _extract_pages_parallel(file_content, laparams, engine, total_pages)
+        except ParseLimitExceeded:
+            raise
+        except Exception as e:
+            logger.warning(f"Parallel page extraction failed, extracting sequentially: {str(e)}")
+
+    text, line_styles, pages = _layout_pages(file_content, laparams)
+    return ExtractedText(text, line_styles, pages, engine)
+
+
+def _layout_pages(
+    file_content: bytes,
+    laparams: LAParams,
+    page_numbers: Optional[range] = None,
+) -> Tuple[str, List[LineStyle], int]:
+    """
+    Lay out the given pages (all pages by default) and return their text,
+    line styles and the number of pages processed.
+    """
+    parts = []
+    line_styles = []
+    page_count = 0
+    for page_layout in extract_pages(io.BytesIO(file_content), laparams=laparams, page_numbers=page_numbers):
+        page_count += 1
+        for element in page_layout:
+            if not isinstance(element, LTTextContainer):
+                continue
+            for text_line in element:
+                if not isinstance(text_line, LTTextLine):
+                    continue
+                line_text = text_line.get_text()
+                parts.append(line_text)
+                if line_text.strip():
+                    line_styles.append(_line_style(text_line))
+        parts.append("\f")
+    return "".join(parts), line_styles, page_count
+
+
+def _extract_pages_parallel(file_content: bytes, laparams: LAParams, engine: str, total_pages: int) -> ExtractedText:
+    """Lay out contiguous page ranges in worker processes and join them in page order."""
+    workers = min(PAGE_WORKERS, total_pages)
+    per_worker = -(-total_pages // workers)  # Ceiling division
+    ranges = [range(first, min(first + per_worker, total_pages)) for first in range(0, total_pages, per_worker)]
+
+    if parse_sandbox.in_sandbox():
+        # A pool started in the short-lived sandbox child would be thrown
+        # away with it; forked helpers stay under the sandbox's limits
+        results = parse_sandbox.map_limited(_layout_pages, [(file_content, laparams, pages) for pages in ranges])
+    else:
+        pool = _get_page_pool()
+        try:
+            futures = [pool.submit(_layout_pages, file_content, laparams, pages) for pages in ranges]
+            results = [future.result() for future in futures]
+        except BrokenProcessPool:
+            # A broken pool cannot be reused; start a fresh one next time
+            _discard_page_pool(pool)
+            raise
+
+    logger.info(f"Extracted {total_pages} pages in {len(ranges)} parallel ranges")
+    return ExtractedText(
+        "".join(text for text, _, _ in results),
+        [style for _, styles, _ in results for style in styles],
+        sum(pages for _, _, pages in results),
+        engine,
+    )
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    """Return the shared page pool, creating it on first use."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(max_workers=PAGE_WORKERS)
+        return _page_pool
+
+
+def _discard_page_pool(pool: ProcessPoolExecutor) -> None:
+    """Shut down a broken page pool, unless another thread has already replaced it."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is pool:
+            _page_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def after_fork() -> None:
+    """Forget a page pool inherited from the parent; it belongs to the parent process."""
+    global _page_pool, _page_pool_lock
+    _page_pool = None
+    _page_pool_lock = threading.Lock()
+
+
+def _line_style(text_line: LTTextLine) -> LineStyle:
+    """Summarize the characters of a layout line into a LineStyle."""
+    chars = [obj for obj in text_line if isinstance(obj, LTChar) and obj.get_text().strip()]
+    if not chars:
+        return LineStyle(font_size=0.0, bold=False)
+    bold_chars = sum(
+        1 for char in chars
+        if any(marker in char.fontname.lower() for marker in BOLD_FONT_MARKERS)
+    )
+    return LineStyle(
+        font_size=statistics.median(char.size for char in chars),
+        bold=bold_chars * 2 > len(chars),
+    )
+
+
+def extract_pdfminer_full(file_content: bytes, total_pages: int) -> ExtractedText:
+    """Extract text with pdfminer's full default layout analysis."""
+    return _extract_with_pdfminer(file_content, FULL_LAPARAMS, "pdfminer-full", total_pages)
+
+
+def extract_pdfminer_fast(file_content: bytes, total_pages: int) -> ExtractedText:
+    """Extract text with pdfminer using the tuned fast layout parameters."""
+    return _extract_with_pdfminer(file_content, FAST_LAPARAMS, "pdfminer-fast", total_pages)
+
+
+def extract_pdfplumber(file_content: bytes, total_pages: int) -> ExtractedText:
+    """Extract text with pdfplumber (no font metrics)."""
+    with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+        pages = [page.extract_text() or "" for page in pdf.pages]
+    return ExtractedText("\n\f".join(pages), None, len(pages), "pdfplumber")
+
+
+def extract_pypdf2(file_content: bytes, total_pages: int) -> ExtractedText:
+    """Extract text straight from the text layer with PyPDF2 (no font metrics)."""
+    reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+    pages = [page.extract_text() or "" for page in reader.pages]
+    return ExtractedText("\n\f".join(pages), None, len(pages), "pypdf2")
+
+
+# Available engines by name; each takes the PDF bytes and its page count from inspect_pdf
+ENGINES: Dict[str, Callable[[bytes, int], ExtractedText]] = {
+    "pdfminer-full": extract_pdfminer_full,
+    "pdfminer-fast": extract_pdfminer_fast,
+    "pdfplumber": extract_pdfplumber,
+    "pypdf2": extract_pypdf2,
+}
+
+
+def _has_fonts(resources) -> bool:
+    """Check a resource dictionary, and any form XObjects in it, for fonts."""
+    if resources is None:
+        return False
+    resources = resources.get_object()
+    if "/Font" in resources:
+        return True
+    xobjects = resources.get("/XObject")
+    if xobjects is None:
+        return False
+    for xobject in xobjects.get_object().values():
+        xobject = xobject.get_object()
+        if xobject.get("/Subtype") == "/Form" and _has_fonts(xobject.get("/Resources")):
+            return True
+    return False
+
+
+def inspect_pdf(file_content: bytes) -> PdfInfo:
+    """
+    Count the pages of a PDF and check whether it has any text layer, with
+    one PyPDF2 reader and without running layout analysis.
+
+    Scanned resumes (pages that are only images) have no font resources at
+    all. When the page tree cannot be read the page count is 0, and when the
+    resources cannot be inspected this errs on the side of a text layer.
+    """
+    try:
+        pages = PyPDF2.PdfReader(io.BytesIO(file_content)).pages
+        total_pages = len(pages)
+    except Exception as e:
+        logger.warning(f"Could not count PDF pages: {str(e)}")
+        return PdfInfo(page_count=0, has_text_layer=True)
+
+    try:
+        text_layer = any(_has_fonts(page.get("/Resources")) for page in pages)
+    except Exception as e:
+        logger.warning(f"Could not inspect PDF resources, assuming a text layer: {str(e)}")
+        text_layer = True
+    return PdfInfo(page_count=total_pages, has_text_layer=text_layer)
+
+
+def engine_chain(engine: Optional[str] = None) -> List[str]:
+    """Return the engines to try, primary first, followed by the fallback."""
+    primary = engine or PDF_TEXT_ENGINE
+    chain = [primary]
+    if PDF_TEXT_FALLBACK and PDF_TEXT_FALLBACK != primary:
+        chain.append(PDF_TEXT_FALLBACK)
+    for name in chain:
+        if name not in ENGINES:
+            raise ValueError(f"Unknown PDF text engine '{name}'. Available engines: {', '.join(ENGINES)}")
+    return chain
+
+
+def extract_text(file_content: bytes, engine: Optional[str] = None, info: Optional[PdfInfo] = None) -> ExtractedText:
+    """
+    Extract text from a PDF, falling back to the next engine when the
+    primary one yields too little text.
+
+    Args:
+        file_content: Bytes content of the PDF file
+        engine: Primary engine name; defaults to PDF_TEXT_ENGINE
+        info: The PDF's inspect_pdf result, when the caller already has it
+
+    Returns:
+        ExtractedText from the first engine with enough text, or the best
+        attempt if none reached the threshold
+    """
+    chain = engine_chain(engine)
+
+    if info is None:
+        info = inspect_pdf(file_content)
+    if not info.has_text_layer:
+        logger.warning("PDF has no text layer (likely scanned); skipping text extraction")
+        return ExtractedText("", None, 0, "none")
+
+    best = None
+    last_error = None
+    for name in chain:
+        try:
+            result = ENGINES[name](file_content, info.page_count)
+        except ParseLimitExceeded:
+            raise
+        except Exception as e:
+            logger.warning(f"PDF text engine {name} failed: {str(e)}")
+            last_error = e
+            continue
+
+        chars = len(result.text.strip())
+        if chars >= MIN_CHARS_PER_PAGE * max(1, result.page_count):
+            return result
+
+        logger.info(f"PDF text engine {name} yielded only {chars} characters, trying fallback")
+        if best is None or chars > len(best.text.strip()):
+            best = result
+
+    if best is None:
+        raise last_error
+    return best
@@ -0,0 +1,250 @@
+"""
+Skill vocabulary shared by the resume parser and the job description tools.
+
+Skills are grouped by category, and common alternative spellings and
+abbreviations ("JS", "Postgres", "k8s") map to one canonical name, so a
+skill can be compared between a resume and a job posting by its key.
+Soft skills are kept in a separate list; the resume parser only looks for
+the technical ones.
+"""
+import re
+from typing import Dict, Iterable, List, Set
+
+from . import parser_patterns as patterns
+
+# Known skills by category, in matching order
+SKILL_CATEGORIES: Dict[str, List[str]] = {
+    "Programming Languages": [
+        "Python", "Java", "JavaScript", "C++", "C#", "Ruby", "PHP", "Swift", "Kotlin", "Go", "Rust",
+        "TypeScript", "Scala", "Perl", "R", "MATLAB", "SQL", "HTML", "CSS", "Shell", "Bash",
+    ],
+    "Frameworks & Libraries": [
+        "React", "Angular", "Vue.js", "Django", "Flask", "Spring", "Express.js", "Node.js", "Ruby on Rails",
+        "ASP.NET", "Laravel", "TensorFlow", "PyTorch", "Keras", "Pandas", "NumPy", "Scikit-learn",
+        "jQuery", "Bootstrap", "Tailwind CSS", "Redux", "Next.js", "FastAPI",
+    ],
+    "Databases": [
+        "MySQL", "PostgreSQL", "MongoDB", "Oracle", "SQL Server", "SQLite", "Redis", "Cassandra",
+        "DynamoDB", "Firebase", "Neo4j", "MariaDB", "Elasticsearch",
+    ],
+    "Cloud & DevOps": [
+        "AWS", "Azure", "Google Cloud", "Docker", "Kubernetes", "Jenkins", "GitLab CI", "GitHub Actions",
+        "Terraform", "Ansible", "Puppet", "Chef", "Nginx", "Apache", "Serverless", "CloudFormation",
+    ],
+    "Data Science & AI": [
+        "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "Data Analysis", "Data Visualization",
+        "Big Data", "Hadoop", "Spark", "Data Mining", "Statistical Analysis", "Reinforcement Learning",
+    ],
+    "Design & UI/UX": [
+        "Figma", "Adobe XD", "Sketch", "Photoshop", "Illustrator", "InDesign", "UI Design", "UX Design",
+        "Wireframing", "Prototyping", "User Research", "A/B Testing",
+    ],
+    "Project Management & Methodologies": [
+        "Agile", "Scrum", "Kanban", "Jira", "Trello", "Confluence", "Asana", "Project Management",
+        "SDLC", "Waterfall", "Lean", "Six Sigma",
+    ],
+    "Testing & QA": [
+        "Unit Testing", "Integration Testing", "End-to-End Testing", "Test Automation", "Selenium",
+        "JUnit", "Jest", "Cypress", "Mocha", "Chai", "TestNG", "Quality Assurance",
+    ],
+    "Marketing Skills": [
+        "SEO", "SEM", "Social Media Marketing", "Content Marketing", "Email Marketing", "Google Analytics",
+        "Facebook Ads", "Google Ads", "Marketing Automation", "CRM", "Salesforce", "HubSpot",
+    ],
+    "Finance & Business": [
+        "Financial Analysis", "Budgeting", "Forecasting", "Excel", "PowerPoint", "Data Entry",
+        "Accounting", "QuickBooks", "SAP", "ERP", "Business Intelligence", "Tableau", "Power BI",
+    ],
+}
+
+# Common list of skills for matching, in category order
+COMMON_SKILLS = [skill for skills in SKILL_CATEGORIES.values() for skill in skills]
+
+# Alternative names, lowercased, mapped to the canonical skill
+SKILL_ALIASES = {
+    "js": "JavaScript",
+    "ts": "TypeScript",
+    "golang": "Go",
+    "c sharp": "C#",
+    "cpp": "C++",
+    "react.js": "React",
+    "reactjs": "React",
+    "angularjs": "Angular",
+    "vue": "Vue.js",
+    "vuejs": "Vue.js",
+    "node": "Node.js",
+    "nodejs": "Node.js",
+    "express": "Express.js",
+    "rails": "Ruby on Rails",
+    "nextjs": "Next.js",
+    "sklearn": "Scikit-learn",
+    "scikit learn": "Scikit-learn",
+    "postgres": "PostgreSQL",
+    "mongo": "MongoDB",
+    "mssql": "SQL Server",
+    "elastic search": "Elasticsearch",
+    "amazon web services": "AWS",
+    "microsoft azure": "Azure",
+    "gcp": "Google Cloud",
+    "google cloud platform": "Google Cloud",
+    "k8s": "Kubernetes",
+    "ml": "Machine Learning",
+    "natural language processing": "NLP",
+    "ux": "UX Design",
+    "ui": "UI Design",
+    "qa": "Quality Assurance",
+    "search engine optimization": "SEO",
+    "ms excel": "Excel",
+    "microsoft excel": "Excel",
+    "powerbi": "Power BI",
+}
+
+# Soft skills looked for in job descriptions
+SOFT_SKILLS = [
+    "Communication", "Teamwork", "Collaboration", "Leadership", "Problem Solving", "Critical Thinking",
+    "Analytical Thinking", "Time Management", "Prioritization", "Attention to Detail", "Adaptability",
+    "Creativity", "Mentoring", "Stakeholder Management", "Organizational Skills", "Interpersonal Skills",
+    "Presentation Skills", "Negotiation", "Customer Focus", "Ownership", "Self-Motivation",
+    "Decision Making", "Conflict Resolution",
+]
+
+# Alternative wordings of soft skills, lowercased, mapped to the canonical skill
+SOFT_SKILL_ALIASES = {
+    "communication skills": "Communication",
+    "communicator": "Communication",
+    "team player": "Teamwork",
+    "collaborative": "Collaboration",
+    "leadership skills": "Leadership",
+    "problem-solving": "Problem Solving",
+    "problem solver": "Problem Solving",
+    "analytical skills": "Analytical Thinking",
+    "analytical": "Analytical Thinking",
+    "time-management": "Time Management",
+    "prioritize": "Prioritization",
+    "detail-oriented": "Attention to Detail",
+    "detail oriented": "Attention to Detail",
+    "adaptable": "Adaptability",
+    "creative": "Creativity",
+    "mentor": "Mentoring",
+    "mentorship": "Mentoring",
+    "organized": "Organizational Skills",
+    "organizational skills": "Organizational Skills",
+    "organisational skills": "Organizational Skills",
+    "interpersonal": "Interpersonal Skills",
+    "public speaking": "Presentation Skills",
+    "customer-focused": "Customer Focus",
+    "customer focused": "Customer Focus",
+    "self-motivated": "Self-Motivation",
+    "self-starter": "Self-Motivation",
+    "decision-making": "Decision Making",
+}
+
+# Aliases that are ordinary words too; used to normalize skill lists but not searched for in text
+AMBIGUOUS_ALIASES = {"express", "node", "rails", "ts", "vue"}
+
+# Skills that are also ordinary words; matched case-sensitively in text ("Go" but not "go")
+COMMON_WORD_SKILLS = {
+    "Go", "R", "Swift", "Rust", "Shell", "Spring", "Express.js", "Oracle", "Apache", "Chef", "Puppet",
+    "Spark", "Sketch", "Lean", "Excel", "Jest", "Mocha", "Chai", "Serverless",
+}
+
+# Canonical skill by lowercased name or alias
+_CANONICAL = {skill.lower(): skill for skill in COMMON_SKILLS}
+_CANONICAL.update(SKILL_ALIASES)
+_CANONICAL.update({skill.lower(): skill for skill in SOFT_SKILLS})
+_CANONICAL.update(SOFT_SKILL_ALIASES)
+
+# Category by canonical skill
+SKILL_CATEGORY = {skill: category for category, skills in SKILL_CATEGORIES.items() for skill in skills}
+
+# Skill matchers compiled once, in COMMON_SKILLS order
+SKILL_PATTERNS = [(skill, patterns.term_pattern(skill)) for skill in COMMON_SKILLS]
+
+# Stricter matchers for free text such as job descriptions
+TEXT_SKILL_PATTERNS = [
+    (skill, re.compile(r'(?<!\w)' + re.escape(skill) + r'(?!\w)') if skill in COMMON_WORD_SKILLS else skill_pattern)
+    for skill, skill_pattern in SKILL_PATTERNS
+]
+ALIAS_PATTERNS = [
+    (skill, patterns.term_pattern(alias))
+    for alias, skill in SKILL_ALIASES.items()
+    if alias not in AMBIGUOUS_ALIASES
+]
+SOFT_SKILL_PATTERNS = [(skill, patterns.term_pattern(skill)) for skill in SOFT_SKILLS]
+SOFT_SKILL_PATTERNS += [(skill, patterns.term_pattern(alias)) for alias, skill in SOFT_SKILL_ALIASES.items()]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def canonical_skill(name: str) -> str:
+    """
+    Return the canonical spelling of a skill, or the cleaned-up name if it is not in the vocabulary.
+
+    Args:
+        name: Skill name as written, e.g. "postgres" or " React.js "
+
+    Returns:
+        Canonical skill name, e.g. "PostgreSQL" or "React"
+    """
+    cleaned = _WHITESPACE.sub(" ", name).strip().strip(",;.")
+    return _CANONICAL.get(cleaned.lower(), cleaned)
+
+
+def skill_key(name: str) -> str:
+    """Return the comparison key of a skill: its canonical name, lowercased."""
+    return canonical_skill(name).lower()
+
+
+def skill_keys(names: Iterable[str]) -> Set[str]:
+    """Return the set of comparison keys of several skills."""
+    return {skill_key(name) for name in names if isinstance(name, str) and name.strip()}
+
+
+def find_skills(text: str) -> List[str]:
+    """
+    Find vocabulary skills mentioned in free text, by name or alias.
+
+    Args:
+        text: Text to search, such as a job description
+
+    Returns:
+        Canonical names of the skills found, in vocabulary order
+    """
+    found = {skill for skill, skill_pattern in TEXT_SKILL_PATTERNS if skill_pattern.search(text)}
+    found.update(skill for skill, alias_pattern in ALIAS_PATTERNS if alias_pattern.search(text))
+    return [skill for skill in COMMON_SKILLS if skill in found]
+
+
+def skill_mentions(text: str) -> Dict[str, List[str]]:
+    """
+    Find hard and soft skills mentioned in free text, with the wording used.
+
+    Args:
+        text: Text to search, such as a job description or resume section
+
+    Returns:
+        Dictionary mapping canonical skill names, in vocabulary order (hard
+        skills first), to the matched text of each mention, e.g.
+        {"Kubernetes": ["k8s"]}
+    """
+    mentions: Dict[str, List[str]] = {}
+    for skill, skill_pattern in TEXT_SKILL_PATTERNS + ALIAS_PATTERNS + SOFT_SKILL_PATTERNS:
+        found = [match.group() for match in skill_pattern.finditer(text)]
+        if found:
+            mentions.setdefault(skill, []).extend(found)
+    order = {skill: position for position, skill in enumerate(COMMON_SKILLS + SOFT_SKILLS)}
+    return {skill: mentions[skill] for skill in sorted(mentions, key=order.__getitem__)}
+
+
+def find_soft_skills(text: str) -> List[str]:
+    """
+    Find soft skills mentioned in free text, by name or common wording.
+
+    Args:
+        text: Text to search, such as a job description
+
+    Returns:
+        Canonical names of the soft skills found, in vocabulary order
+    """
+    found = {skill for skill, skill_pattern in SOFT_SKILL_PATTERNS if skill_pattern.search(text)}
+    return [skill for skill in SOFT_SKILLS if skill in found]
@@ -0,0 +1,146 @@
+"""
+Helpers for reading uploaded files in chunks with early validation.
+"""
+import json
+import logging
+from typing import Dict, Optional
+
+from fastapi import HTTPException, UploadFile
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Size limits per upload type
+MAX_PDF_UPLOAD_SIZE = 5 * 1024 * 1024
+MAX_BULK_UPLOAD_SIZE = 200 * 1024 * 1024
+
+# Allowance for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD = 16 * 1024
+
+# File signatures checked before any parsing
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+
+# The PDF spec tolerates some leading bytes before the header
+PDF_MAGIC_SEARCH_WINDOW = 1024
+
+
+class UploadRejected(Exception):
+    """Raised when an upload fails a size or signature check."""
+
+
+def size_error_detail(max_size: int) -> str:
+    """Build the error message shown when an upload exceeds max_size."""
+    return f"File size too large. Maximum allowed size is {max_size // (1024 * 1024)}MB."
+
+
+class UploadSizeLimitMiddleware:
+    """
+    ASGI middleware enforcing body size limits on upload routes while the
+    request body is still arriving.
+
+    Requests whose Content-Length is already over the limit are rejected
+    before any body is read. Otherwise body chunks are counted as they are
+    received, and the request is aborted as soon as the limit is crossed,
+    instead of after the whole multipart body has been spooled.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        max_size = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if max_size is None:
+            await self.app(scope, receive, send)
+            return
+
+        max_body = max_size + MULTIPART_OVERHEAD
+        headers = dict(scope.get("headers") or [])
+        declared = headers.get(b"content-length", b"")
+        if declared.isdigit() and int(declared) > max_body:
+            await self._reject(send, size_error_detail(max_size))
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body:
+                    # Raised inside body parsing, so FastAPI turns it into a 400 response
+                    raise HTTPException(status_code=400, detail=size_error_detail(max_size))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    @staticmethod
+    async def _reject(send, detail: str) -> None:
+        body = json.dumps({"detail": detail}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 400,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def has_pdf_signature(head: bytes) -> bool:
+    """Check whether the first bytes of a file look like a PDF."""
+    return PDF_MAGIC in head[:PDF_MAGIC_SEARCH_WINDOW]
+
+
+def has_zip_signature(head: bytes) -> bool:
+    """Check whether the first bytes of a file look like a ZIP archive."""
+    return head.startswith(ZIP_MAGIC)
+
+
+async def read_upload(
+    file: UploadFile,
+    max_size: int,
+    signature_check=None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> bytearray:
+    """
+    Read an uploaded file chunk by chunk, enforcing the size limit as bytes
+    arrive and validating the file signature on the first chunk.
+
+    Args:
+        file: The uploaded file
+        max_size: Maximum allowed size in bytes
+        signature_check: Optional callable taking the first chunk and
+            returning whether the file type is acceptable
+        chunk_size: Bytes to read per chunk
+
+    Returns:
+        The file content, ready to hand to a parser
+
+    Raises:
+        UploadRejected: If the file is too large or has the wrong signature
+    """
+    buffer = bytearray()
+    first_chunk: Optional[bytes] = None
+
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+
+        if first_chunk is None:
+            first_chunk = chunk
+            if signature_check and not signature_check(first_chunk):
+                raise UploadRejected("File content does not match the expected file type.")
+
+        if len(buffer) + len(chunk) > max_size:
+            logger.warning(f"Rejected upload {file.filename}: exceeds {max_size} bytes")
+            raise UploadRejected(size_error_detail(max_size))
+        buffer.extend(chunk)
+
+    if first_chunk is None:
+        raise UploadRejected("Uploaded file is empty.")
+
+    return buffer
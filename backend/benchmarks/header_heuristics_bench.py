@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Accuracy check for the heuristic name and location fast path.
+
+Each case is a resume header with the name and location the heuristics
+must return confidently, or None where they must defer to spaCy NER
+(confidence below PERSONAL_INFO_MIN_CONFIDENCE). A confident wrong answer
+is worse than the NER baseline, so any failure exits non-zero.
+
+Run from the backend directory:
+
+    python -m benchmarks.header_heuristics_bench
+"""
+import sys
+import time
+from typing import List, NamedTuple, Optional
+
+from app.utils import header_heuristics
+from app.utils.pdf_parser import PERSONAL_INFO_MIN_CONFIDENCE
+
+
+class Case(NamedTuple):
+    header: str
+    name: Optional[str]  # None: must be left to NER
+    location: Optional[str]
+
+
+CASES: List[Case] = [
+    Case("Jane Doe\nSan Francisco, CA | jane.doe@example.com | (555) 123-4567", "Jane Doe", "San Francisco, CA"),
+    Case("JOHN SMITH\nAustin, TX 78701 • john@example.com", "JOHN SMITH", "Austin, TX"),
+    Case("Jordan Lee\nSenior Software Engineer\njordan@example.com | 555-123-4567", "Jordan Lee", ""),
+    Case("Maria Garcia\nLondon, United Kingdom  |  maria@example.com", "Maria Garcia", "London, United Kingdom"),
+    Case("Ana de la Cruz\nToronto, ON M5V 2T6\nana@example.com", "Ana de la Cruz", "Toronto, ON"),
+    Case("Wei Zhang\nBerlin\nwei@example.com", "Wei Zhang", "Berlin"),
+    Case("Ana Lopez\nSpringfield, Narnia\nana@example.com", "Ana Lopez", None),
+    # A six-digit postal code after an unlisted region
+    Case("Priya Sharma\nBangalore, Karnataka 560001", "Priya Sharma", "Bangalore, Karnataka"),
+    # A title first and a region that is not a name
+    Case("Software Engineer\nSan Francisco Bay Area", None, None),
+]
+
+
+def check(case: Case) -> List[str]:
+    """Return the problems with the heuristics' answer for one case."""
+    guesses = header_heuristics.guess_header_fields(case.header)
+    problems = []
+    for field, expected in (("name", case.name), ("location", case.location)):
+        guess = guesses[field]
+        confident = guess.confidence >= PERSONAL_INFO_MIN_CONFIDENCE
+        if expected is None and confident:
+            problems.append(f"{field}: {guess.value!r} at {guess.confidence}, expected NER")
+        elif expected is not None and (not confident or guess.value != expected):
+            problems.append(f"{field}: {guess.value!r} at {guess.confidence}, expected {expected!r}")
+    return problems
+
+
+def main() -> int:
+    failures = 0
+    deferred = 0
+    start = time.perf_counter()
+    for case in CASES:
+        problems = check(case)
+        deferred += case.name is None or case.location is None
+        if problems:
+            failures += 1
+            print(f"FAIL {case.header.splitlines()[0]!r}: {'; '.join(problems)}")
+    elapsed = (time.perf_counter() - start) * 1000
+    print(
+        f"{len(CASES) - failures}/{len(CASES)} headers correct, "
+        f"{deferred} expected to use NER, {elapsed / len(CASES):.2f} ms per header"
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark of PDF parse latency by page count, with and without the sandbox.
+
+Synthetic text-only resumes of each page count are written directly as PDF
+(no renderer needed) and parsed uncached through pdf_parser.parse_pdf:
+
+- direct, sequential: no sandbox, pages laid out one after another
+- direct, parallel: no sandbox, long documents split across the page pool
+  (warmed up before timing, as in a long-running worker)
+- sandboxed, sequential: in a resource-limited child, pages one after another
+- sandboxed, parallel: the upload path as deployed, long documents split
+  across helpers forked from the resource-limited child
+
+Run from the backend directory:
+
+    python -m benchmarks.page_extraction_bench --pages 4 12 30 --runs 5
+"""
+import argparse
+import random
+import statistics
+import time
+from typing import Dict, List
+
+from app.utils import parse_sandbox, pdf_parser, pdf_text
+# Imported for its fork hooks, which reset parser state in forked children as in the app
+import app.utils.parser_runtime  # noqa: F401
+
+LINES_PER_PAGE = 45
+BULLETS = [
+    "Designed and shipped a billing service handling 2M requests per day with Python and PostgreSQL.",
+    "Led a team of five engineers through a migration to Kubernetes on AWS.",
+    "Reduced report generation time by 40% by rewriting SQL queries and adding caching.",
+    "Mentored interns and ran weekly knowledge-sharing sessions on testing and code review.",
+    "Built React dashboards for operations teams and integrated them with REST APIs.",
+]
+HEADINGS = ["Experience", "Projects", "Education", "Skills"]
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def page_lines(page: int, rng: random.Random) -> List[str]:
+    """Build the lines of one resume-like page."""
+    lines = ["Jane Doe", "San Francisco, CA | jane.doe@example.com | (555) 123-4567"] if page == 0 else []
+    while len(lines) < LINES_PER_PAGE:
+        start = rng.randint(2005, 2020)
+        lines.append(rng.choice(HEADINGS))
+        lines.append(f"Acme Corp, Software Engineer, Jan {start} - Dec {start + 2}")
+        lines.extend(rng.sample(BULLETS, 3))
+    return lines[:LINES_PER_PAGE]
+
+
+def build_pdf(pages: int, seed: int = 0) -> bytes:
+    """Write a text-only PDF with the given number of pages, one Helvetica text block per page."""
+    rng = random.Random(seed)
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", "", "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        shown = " ".join(f"({_escape(line)}) '" for line in page_lines(page, rng))
+        stream = f"BT /F1 10 Tf 14 TL 40 770 Td {shown} ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{kid} 0 R' for kid in kids)}] /Count {pages} >>"
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    output += b"".join(f"{offset:010d} 00000 n \n".encode("latin-1") for offset in offsets)
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(output)
+
+
+def time_parse(content: bytes, runs: int) -> float:
+    """Return the median wall time of an uncached parse, in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        pdf_parser.parse_pdf(content, use_cache=False)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run(page_counts: List[int], runs: int) -> Dict[str, Dict[int, float]]:
+    """Time every mode for every page count."""
+    threshold = pdf_text.PARALLEL_PAGE_THRESHOLD
+    sandbox = parse_sandbox.PARSE_SANDBOX
+    documents = {pages: build_pdf(pages) for pages in page_counts}
+    modes = {
+        "direct, sequential": (False, 0),
+        "direct, parallel": (False, threshold),
+        "sandboxed, sequential": (True, 0),
+        "sandboxed, parallel": (True, threshold),
+    }
+    results: Dict[str, Dict[int, float]] = {}
+    try:
+        for mode, (sandboxed, mode_threshold) in modes.items():
+            parse_sandbox.PARSE_SANDBOX = sandboxed
+            pdf_text.PARALLEL_PAGE_THRESHOLD = mode_threshold
+            # Untimed warm-up: model loading and, where used, the page pool
+            pdf_parser.parse_pdf(documents[max(page_counts)], use_cache=False)
+            results[mode] = {pages: time_parse(content, runs) for pages, content in documents.items()}
+    finally:
+        parse_sandbox.PARSE_SANDBOX = sandbox
+        pdf_text.PARALLEL_PAGE_THRESHOLD = threshold
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[4, 12, 30], help="Page counts to benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Timed parses per mode and page count")
+    args = parser.parse_args()
+
+    print(
+        f"page workers: {pdf_text.PAGE_WORKERS}, parallel from {pdf_text.PARALLEL_PAGE_THRESHOLD} pages, "
+        f"sandbox available: {parse_sandbox.sandbox_available()}"
+    )
+    results = run(args.pages, args.runs)
+    print(f"{'mode':<22}" + "".join(f"{f'{pages} pages':>16}" for pages in args.pages))
+    for mode, timings in results.items():
+        print(f"{mode:<22}" + "".join(f"{timings[pages]:>13.1f} ms" for pages in args.pages))
+
+
+if __name__ == "__main__":
+    main()
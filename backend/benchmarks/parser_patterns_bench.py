@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for per-line regex cost in the resume parser.
+
+Compares the original approach (patterns compiled inside each per-line loop)
+with the precompiled registry in app/utils/parser_patterns.py, over a long
+synthetic resume.
+
+Run from the backend directory:
+
+    python -m benchmarks.parser_patterns_bench --lines 5000
+"""
+import argparse
+import random
+import re
+import time
+
+from app.utils import parser_patterns as patterns
+
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Stark Industries"]
+TITLES = ["Software Engineer", "Data Scientist", "Product Manager", "Designer"]
+SCHOOLS = ["State University", "Tech Institute", "City College"]
+DEGREES = ["BS Computer Science", "Master of Science", "MBA", "B.A. Economics"]
+BULLETS = [
+    "Designed and shipped a billing service handling 2M requests per day.",
+    "Led a team of five engineers through a migration to Kubernetes.",
+    "Reduced report generation time by 40% by rewriting queries.",
+    "Mentored interns and ran weekly knowledge-sharing sessions.",
+]
+
+# Legacy patterns, copied verbatim from the original per-line loops
+_LEGACY_YEAR = r'\b(19|20)\d{2}\b'
+_LEGACY_DEGREE_KEYWORD = r'\b(bachelor|master|phd|doctorate|bs|ba|ms|ma|phd|mba|b\.s\.|m\.s\.|b\.a\.|m\.a\.)\b'
+_LEGACY_JOB_DATE = r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)(\s+\d{4})?\s*(-|–|to)\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)?\s*(\d{4}|Present|Current|Now)?|\b(19|20)\d{2}\s*(-|–|to)\s*(19|20)\d{2}|Present|Current|Now\b'
+_LEGACY_EDU_DATE = r'\b(19|20)\d{2}\s*(-|–|to)\s*(19|20)\d{2}|Present|Current|Now\b|\b(19|20)\d{2}\b'
+_LEGACY_DEGREE = r'\b(Bachelor|Master|PhD|Doctorate|BS|BA|MS|MA|PhD|MBA|B\.S\.|M\.S\.|B\.A\.|M\.A\.)(\s+of|\s+in)?\s+(Science|Arts|Business|Engineering|Fine Arts|Education|Computer Science|Information Technology|Mathematics|Physics|Chemistry|Biology|Psychology|Sociology|Economics|Finance|Marketing|Management|Communications|Journalism|Law|Medicine|Nursing|Philosophy|Political Science|History|English|Literature|Languages|Architecture|Design|Music|Theater|Film|Health|Public Health|Public Administration|Social Work|Criminal Justice|Human Resources|International Relations|Liberal Arts|General Studies|Applied Science|Technology|Information Systems)?\b'
+
+
+def build_lines(count: int, seed: int = 0) -> list:
+    """Build a long, resume-like mix of header and description lines."""
+    rng = random.Random(seed)
+    lines = []
+    while len(lines) < count:
+        start = rng.randint(2005, 2020)
+        if rng.random() < 0.5:
+            lines.append(f"{rng.choice(COMPANIES)}, {rng.choice(TITLES)}, Jan {start} - Present")
+        else:
+            lines.append(f"{rng.choice(SCHOOLS)}, {rng.choice(DEGREES)}, {start} - {start + 4}")
+        lines.extend(rng.sample(BULLETS, 3))
+    return lines[:count]
+
+
+def legacy_pass(lines: list) -> int:
+    """Per-line work as originally written: compile inside the loop."""
+    hits = 0
+    for line in lines:
+        year = re.compile(_LEGACY_YEAR)
+        degree_keyword = re.compile(_LEGACY_DEGREE_KEYWORD, re.IGNORECASE)
+        if (year.search(line) or degree_keyword.search(line)) and len(line) < 100:
+            job_date = re.compile(_LEGACY_JOB_DATE, re.IGNORECASE)
+            edu_date = re.compile(_LEGACY_EDU_DATE, re.IGNORECASE)
+            degree = re.compile(_LEGACY_DEGREE, re.IGNORECASE)
+            hits += bool(job_date.search(line))
+            hits += len(edu_date.findall(line))
+            hits += bool(degree.search(line))
+    return hits
+
+
+def registry_pass(lines: list) -> int:
+    """Per-line work with the precompiled registry and unified matchers."""
+    hits = 0
+    for line in lines:
+        if (patterns.YEAR_PATTERN.search(line) or patterns.DEGREE_KEYWORD_PATTERN.search(line)) and len(line) < 100:
+            start, end, _ = patterns.find_dates(line)
+            hits += bool(start or end)
+            hits += bool(patterns.find_degree(line))
+    return hits
+
+
+def time_pass(func, lines: list, repeat: int) -> float:
+    """Return the best per-line time in microseconds over several runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(lines)
+        best = min(best, time.perf_counter() - started)
+    return best / len(lines) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=5000, help="Lines in the synthetic resume")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    lines = build_lines(args.lines)
+    results = [
+        ("legacy (compiled in loop)", time_pass(legacy_pass, lines, args.repeat)),
+        ("registry (precompiled)", time_pass(registry_pass, lines, args.repeat)),
+    ]
+
+    print(f"{args.lines} lines, best of {args.repeat} runs")
+    baseline = results[0][1]
+    for name, per_line in results:
+        print(f"  {name:<28} {per_line:8.2f} us/line  ({baseline / per_line:5.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Gunicorn configuration for the resume API.
+
+The app is preloaded in the master so the spaCy model and parser tables are
+loaded once and shared copy-on-write by all workers. Set PARSER_PRELOAD=0 to
+load everything separately in each worker instead.
+"""
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.getenv("PARSER_PRELOAD", "1") != "0"
+
+
+def on_starting(server):
+    """Load parser state in the master, after the app has been preloaded."""
+    if preload_app:
+        from app.utils import parser_runtime
+        parser_runtime.preload()
+
+
+def post_fork(server, worker):
+    """Drop state inherited from the master that must not be shared."""
+    from app.database import engine
+    from app.utils import parser_runtime
+
+    # Connections opened in the master (e.g. by create_all) must not be reused across processes
+    engine.dispose(close=False)
+    parser_runtime.after_fork()
+
+
+def post_worker_init(worker):
+    """Log how much of the worker's memory is shared with the master."""
+    from app.utils import parser_runtime
+
+    worker.log.info(f"Worker {worker.pid} memory: {parser_runtime.format_memory(parser_runtime.memory_usage())}")